@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量搜索
+
+将批量任务配置中的 岗位名称 × 城市 × 学历 × 薪资 × 经验 展开为搜索任务,
+在同一个浏览器上下文中最多同时打开 concurrency 个标签页执行, 失败的任务自动重试.
+每个任务的结果单独保存到 output_dir/<任务ID>/ 目录并写入历史岗位数据库, 任务状态记录在 output_dir/manifest.json,
+重新运行相同的配置时跳过已完成的任务, 已完成任务的结果文件不完整时重新执行.
+并发的任务共用已获取详情的岗位ID, 搜索结果重叠的岗位只获取一次详情.
+
+批量任务配置示例(JSON):
+{
+    "job_names": ["ai agent", "大模型"],
+    "cities": ["101280600", "101010100"],
+    "degrees": ["硕士"],
+    "salaries": ["30-50K", "50-100K"],
+    "experiences": ["3"],
+    "max_size": 30,
+    "concurrency": 2,
+    "retries": 2,
+    "output_dir": "data/batch"
+}
+
+运行方式(在 src 目录下):
+    python batch.py data/batch.json
+"""
+
+import time
+import asyncio
+import hashlib
+import logging
+import argparse
+import itertools
+from dataclasses import dataclass, field, asdict
+
+from config import SiteConfig, job_list_store_path, job_detail_store_path
+from local_type import JobDetailItem, JobListItem, UserInput
+from search_job import BossSpider
+from util.common import FilterSpec
+from util.fs import read_json, read_jsonl, write_json, append_jsonl, delete_file
+from util.repository import JobRepository
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchSpec:
+    job_names: list[str]
+    cities: list[str] = field(default_factory=lambda: [''])  # 空字符串表示使用页面默认的城市
+    degrees: list[str] = field(default_factory=lambda: ['本科'])
+    salaries: list[str] = field(default_factory=lambda: ['20-30K'])
+    experiences: list[str] = field(default_factory=lambda: ['3'])
+    max_size: int = 30  # 每个任务的目标岗位数量
+    concurrency: int = 2  # 同时执行的任务数量
+    retries: int = 2  # 任务失败后的重试次数
+    retry_delay: float = 30  # 第 n 次重试前等待 n * retry_delay 秒
+    output_dir: str = 'data/batch'
+
+    @classmethod
+    def load(cls, file_path: str) -> 'BatchSpec':
+        return cls(**read_json(file_path, {}))
+
+    def get_key(self) -> str:
+        """任务组合的标识, 组合变化时不能复用已完成的任务"""
+        combinations = [self.job_names, self.cities, self.degrees,
+                        self.salaries, self.experiences, self.max_size]
+        return hashlib.md5(repr(combinations).encode()).hexdigest()
+
+
+@dataclass
+class BatchTask:
+    task_id: str
+    user_input: UserInput
+
+
+def expand_tasks(spec: BatchSpec) -> list[BatchTask]:
+    """展开为 岗位名称 × 城市 × 学历 × 薪资 × 经验 的所有组合"""
+    tasks = []
+    combinations = itertools.product(
+        spec.job_names, spec.cities, spec.degrees, spec.salaries, spec.experiences)
+    for index, (job_name, city, degree, salary, experience) in enumerate(combinations, 1):
+        user_input = UserInput(
+            degree=degree,
+            salary=salary,
+            experience=experience,
+            user_job_details=False,
+            other_info='',
+            max_size=spec.max_size,
+            job_names=[job_name],
+            city=city,
+        )
+        digest = hashlib.md5(repr(sorted(user_input.items())).encode()).hexdigest()[:8]
+        tasks.append(BatchTask(task_id=f'{index:04d}-{digest}', user_input=user_input))
+    return tasks
+
+
+class BatchScheduler:
+    def __init__(self, spider: BossSpider, spec: BatchSpec):
+        self.spider = spider
+        self.spec = spec
+        self.tasks = expand_tasks(spec)
+        self.manifest_path = f'{spec.output_dir}/manifest.json'
+        # 任务ID -> 任务状态
+        self.statuses: dict[str, dict] = {}
+        # 所有任务获取到的岗位详情, 用于生成每个任务的结果
+        self.job_detail_map: dict[str, JobDetailItem] = {}
+        # 完成时缺少岗位详情的任务(详情由其他任务获取), 所有任务结束后补全
+        self.incomplete_tasks: dict[str, tuple[BatchTask, list[JobListItem]]] = {}
+
+    def load_manifest(self) -> bool:
+        """读取上次运行的任务状态, 配置相同时才能复用, 返回是否复用"""
+        manifest = read_json(self.manifest_path, {})
+        if manifest.get('key') != self.spec.get_key():
+            return False
+        self.statuses = manifest.get('tasks', {})
+        return True
+
+    def save_manifest(self):
+        write_json({
+            'key': self.spec.get_key(),
+            'spec': asdict(self.spec),
+            'tasks': self.statuses,
+        }, self.manifest_path)
+
+    def is_done(self, task: BatchTask):
+        return self.statuses.get(task.task_id, {}).get('status') == 'done'
+
+    def get_task_dir(self, task: BatchTask) -> str:
+        return f'{self.spec.output_dir}/{task.task_id}'
+
+    def add_job_details(self, job_details: list[JobDetailItem]):
+        for job_detail in job_details:
+            self.job_detail_map[job_detail.get('jobInfo', {}).get('encryptId', '')] = job_detail
+
+    def restore_done_tasks(self):
+        """
+        检查上次运行中已完成的任务
+
+        结果文件与记录的岗位数量不一致时重新执行该任务; 结果中不在历史岗位数据库中的岗位重新写入,
+        已获取的岗位详情加入共用的岗位ID集合, 本次运行的任务不再重复获取.
+        """
+        with JobRepository() as repository:
+            for task in self.tasks:
+                if not self.is_done(task):
+                    continue
+                status = self.statuses[task.task_id]
+                task_dir = self.get_task_dir(task)
+                job_list = read_jsonl(f'{task_dir}/joblist.jsonl')
+                job_details = read_jsonl(f'{task_dir}/jobdetail.jsonl')
+                if len(job_list) != status.get('job_count') or len(job_details) != status.get('job_detail_count'):
+                    logger.warning(f"任务 {task.task_id} 的结果文件不完整, 重新执行")
+                    status['status'] = 'pending'
+                    continue
+
+                stored_job_ids = {job['encryptJobId'] for job in repository.get_job_list(
+                    [job.get('encryptJobId', '') for job in job_list])}
+                stored_detail_ids = {job_detail['jobInfo']['encryptId'] for job_detail in repository.get_job_details(
+                    [job_detail.get('jobInfo', {}).get('encryptId', '') for job_detail in job_details])}
+                missing_job_list = [job for job in job_list if job.get('encryptJobId') not in stored_job_ids]
+                missing_job_details = [job_detail for job_detail in job_details
+                                       if job_detail.get('jobInfo', {}).get('encryptId') not in stored_detail_ids]
+                if missing_job_list or missing_job_details:
+                    logger.warning(f"任务 {task.task_id} 有 {len(missing_job_list)} 个岗位列表、"
+                                   f"{len(missing_job_details)} 个岗位详情不在历史岗位数据库中, 重新写入")
+                    repository.upsert_job_list(missing_job_list)
+                    repository.upsert_job_details(missing_job_details)
+                self.add_job_details(job_details)
+        self.spider.detail_job_ids.update(self.job_detail_map)
+
+    async def save_task_result(self, task: BatchTask, matched_job_list: list[JobListItem]):
+        """将任务匹配的岗位列表和岗位详情保存到任务目录, 返回 (岗位数量, 岗位详情数量)"""
+        job_details = [self.job_detail_map[job.get('encryptJobId', '')]
+                       for job in matched_job_list if job.get('encryptJobId', '') in self.job_detail_map]
+
+        task_dir = self.get_task_dir(task)
+
+        def write_partition():
+            delete_file(f'{task_dir}/joblist.jsonl')
+            delete_file(f'{task_dir}/jobdetail.jsonl')
+            append_jsonl(matched_job_list, f'{task_dir}/joblist.jsonl')
+            append_jsonl(job_details, f'{task_dir}/jobdetail.jsonl')
+
+        await self.spider.run_in_executor(write_partition)
+        return len(matched_job_list), len(job_details)
+
+    async def store_task_jobs(self, tab: BossSpider):
+        """任务完成时写入历史岗位数据库, 中断后重新运行时已完成的任务不需要重新获取"""
+        def upsert():
+            with JobRepository() as repository:
+                repository.upsert_job_list(tab.job_list)
+                repository.upsert_job_details(tab.job_details)
+
+        await self.spider.run_in_executor(upsert)
+
+    async def complete_task_results(self):
+        """补全完成时缺少岗位详情的任务结果, 这些岗位详情由同时执行的其他任务获取"""
+        for task, matched_job_list in self.incomplete_tasks.values():
+            _, job_detail_count = await self.save_task_result(task, matched_job_list)
+            self.statuses[task.task_id]['job_detail_count'] = job_detail_count
+        self.incomplete_tasks.clear()
+        self.save_manifest()
+
+    async def run_task(self, task: BatchTask, semaphore: asyncio.Semaphore):
+        """执行单个任务, 失败时重试, 重试前的等待不占用并发数量"""
+        status = self.statuses.setdefault(task.task_id, {})
+        status.update(user_input=task.user_input, status='running', attempts=0, error=None)
+
+        for attempt in range(1, self.spec.retries + 2):
+            status['attempts'] = attempt
+            async with semaphore:
+                tab = await self.spider.open_tab()
+                tab.filter_spec = FilterSpec.from_user_input(task.user_input)
+                start_time = time.perf_counter()
+                try:
+                    logger.info(f"开始任务 {task.task_id}(第 {attempt} 次): {task.user_input}")
+                    await tab.goto_search_page(self.spider.get_search_url(task.user_input))
+                    await tab.register_routes()
+                    await tab.crawl_job_name(task.user_input['job_names'][0], task.user_input['max_size'])
+                    self.add_job_details(tab.job_details)
+                    await self.store_task_jobs(tab)
+                    job_count, job_detail_count = await self.save_task_result(task, tab.matched_job_list)
+                    if job_detail_count < job_count:
+                        self.incomplete_tasks[task.task_id] = (task, tab.matched_job_list)
+                    status.update(status='done', error=None, job_count=job_count, job_detail_count=job_detail_count,
+                                  seconds=round(time.perf_counter() - start_time, 3))
+                    logger.info(f"任务 {task.task_id} 完成, {job_count} 个岗位, {job_detail_count} 个岗位详情")
+                    return
+                except Exception as e:
+                    logger.error(f"任务 {task.task_id} 第 {attempt} 次执行出错: {e}")
+                    status.update(status='failed', error=str(e))
+                finally:
+                    if tab.page and not tab.page.is_closed():
+                        await tab.page.close()
+                    self.save_manifest()
+
+            if attempt <= self.spec.retries:
+                await asyncio.sleep(self.spec.retry_delay * attempt)
+
+    async def run(self, restart: bool = False):
+        """执行所有未完成的任务, 返回 (完成数量, 失败数量)"""
+        if restart or not self.load_manifest():
+            self.statuses = {}
+            # 与 BossSpider.run 一致, 重新记录岗位数据
+            delete_file(job_list_store_path)
+            delete_file(job_detail_store_path)
+        else:
+            self.restore_done_tasks()
+
+        pending_tasks = [task for task in self.tasks if not self.is_done(task)]
+        logger.info(f"共 {len(self.tasks)} 个任务, 待执行 {len(pending_tasks)} 个")
+
+        semaphore = asyncio.Semaphore(self.spec.concurrency)
+        await asyncio.gather(*(self.run_task(task, semaphore) for task in pending_tasks))
+        await self.spider.wait_pending_tasks()
+        await self.complete_task_results()
+
+        done_count = sum(1 for task in self.tasks if self.is_done(task))
+        return done_count, len(self.tasks) - done_count
+
+
+async def run_batch(spec: BatchSpec, site_name: str, restart: bool):
+    spider = BossSpider(SiteConfig(site_name))  # type:ignore
+    try:
+        await spider.init_browser()
+        await spider.detect_login_status(need_goto=not (spider.page and spider.is_site_url(spider.page.url)))
+        if not spider.has_login():
+            logger.warning("未登录, 每个任务最多只能检索 15 个职位")
+        done_count, failed_count = await BatchScheduler(spider, spec).run(restart)
+        spider.compact_job_store()
+    finally:
+        await spider.close_browser()
+    logger.info(f"批量搜索完成, 成功 {done_count} 个任务, 失败 {failed_count} 个任务, 结果保存在 {spec.output_dir}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='批量搜索')
+    parser.add_argument('spec', help='批量任务配置文件(JSON)')
+    parser.add_argument('--site', choices=['ZHIPIN', 'MOCK'], default='ZHIPIN')
+    parser.add_argument('--restart', action='store_true', help='忽略已完成的任务, 重新执行所有任务')
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    asyncio.run(run_batch(BatchSpec.load(args.spec), args.site, args.restart))
@@ -0,0 +1,128 @@
+"""
+爬虫端到端性能测试
+
+启动本地模拟服务, 使用 SiteConfig('MOCK') 运行完整的搜索流程,
+统计耗时和吞吐量, 用于比较并发数、请求频率和详情获取方式的影响.
+
+运行方式(在 src 目录下):
+    python -m benchmark.crawl --job-names "ai agent,大模型" --max-size 30 --concurrency 2
+"""
+
+import os
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+
+from config import SiteConfig, mock_server_host, mock_server_url
+from local_type import UserInput
+from mock_server import MockOptions, start_mock_server
+from search_job import BossSpider
+from util.diagnostics import Diagnostics
+
+
+async def run_crawl(site_config: SiteConfig, user_input: UserInput, stall_threshold: float, profile_dir: str | None):
+    spider = BossSpider(site_config)
+    start_time = time.perf_counter()
+    async with Diagnostics(stall_threshold, bool(profile_dir), profile_dir or '', spider.metrics):
+        try:
+            await spider.init_browser()
+            await spider.detect_login_status(need_goto=True)
+            job_list, job_details = await spider.run(user_input=user_input)
+        finally:
+            await spider.close_browser()
+    return job_list, job_details, time.perf_counter() - start_time, spider.metrics.to_dict()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='爬虫端到端性能测试')
+    parser.add_argument('--job-names', default='ai agent,大模型', help='搜索关键词, 多个用逗号分隔')
+    parser.add_argument('--max-size', type=int, default=30, help='每个关键词的目标岗位数量')
+    parser.add_argument('--concurrency', type=int, default=1, help='同时搜索的关键词数量')
+    parser.add_argument('--detail-fetch-mode', choices=['request', 'click'], default='request')
+    parser.add_argument('--detail-fetch-concurrency', type=int, default=3)
+    parser.add_argument('--requests-per-minute', type=float, default=600)
+    parser.add_argument('--block-resource-types', default='image,media,font',
+                        help='拦截的资源类型, 多个用逗号分隔, 为空时不拦截')
+    parser.add_argument('--headed', action='store_true', help='显示浏览器界面')
+    parser.add_argument('--cdp-url', help='连接已运行的浏览器, 如 http://127.0.0.1:9222')
+    parser.add_argument('--detail-cache-ttl', type=float, default=0,
+                        help='岗位详情缓存有效期(秒), 0 表示不使用缓存')
+    parser.add_argument('--port', type=int, default=18765, help='模拟服务端口')
+    parser.add_argument('--pages', type=int, default=10, help='每个关键词的分页数量')
+    parser.add_argument('--latency', type=float, default=0.1, help='接口基础延迟(秒)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='接口返回错误的概率')
+    parser.add_argument('--fixtures', help='录制的岗位文件目录')
+    parser.add_argument('--stall-threshold', type=float, default=0,
+                        help='事件循环阻塞超过该秒数时记录调用栈, 0 表示不检测')
+    parser.add_argument('--profile-dir', help='对搜索过程采样分析, 结果保存到该目录')
+    parser.add_argument('--output', help='结果保存路径(JSON)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    fixtures_dir = os.path.abspath(args.fixtures) if args.fixtures else None
+    output_path = os.path.abspath(args.output) if args.output else None
+    profile_dir = os.path.abspath(args.profile_dir) if args.profile_dir else None
+
+    server = start_mock_server(MockOptions(
+        pages=args.pages,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        fixtures_dir=fixtures_dir,
+    ), port=args.port)
+
+    site_config = SiteConfig('MOCK')
+    mock_url = f'http://{mock_server_host}:{args.port}'
+    for key, url in vars(site_config.urls).items():
+        setattr(site_config.urls, key, url.replace(mock_server_url, mock_url))
+    site_config.concurrency = args.concurrency
+    site_config.detail_fetch_mode = args.detail_fetch_mode
+    site_config.detail_fetch_concurrency = args.detail_fetch_concurrency
+    site_config.requests_per_minute = args.requests_per_minute
+    site_config.min_requests_per_minute = args.requests_per_minute / 10
+    site_config.detail_cache_ttl = args.detail_cache_ttl
+    site_config.block_resource_types = [
+        resource_type.strip() for resource_type in args.block_resource_types.split(',') if resource_type.strip()]
+    site_config.headless = not args.headed
+    site_config.cdp_url = args.cdp_url
+
+    user_input = UserInput(
+        degree='硕士',
+        salary='30-50K',
+        experience='3',
+        user_job_details=False,
+        other_info='',
+        max_size=args.max_size,
+        job_names=[name.strip() for name in args.job_names.split(',') if name.strip()],
+    )
+
+    # 在临时目录中运行, 避免覆盖 data 目录下的真实数据
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.chdir(work_dir)
+        try:
+            job_list, job_details, elapsed, metrics = asyncio.run(run_crawl(site_config, user_input, args.stall_threshold, profile_dir))
+        finally:
+            os.chdir(cwd)
+            server.shutdown()
+
+    result = {
+        'options': vars(args),
+        'elapsed_seconds': round(elapsed, 3),
+        'job_list_count': len(job_list),
+        'job_detail_count': len(job_details),
+        'job_details_per_second': round(len(job_details) / elapsed, 3) if elapsed else 0,
+        'server_stats': server.mock.stats,
+        'metrics': metrics,
+    }
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+岗位过滤、去重和提示词生成的性能测试
+
+使用 util.synthetic 生成不同规模的岗位数据, 统计每个函数的耗时、吞吐量和内存峰值,
+结果保存为 JSON, 可以通过 --baseline 与之前的结果比较, 发现性能退化.
+
+运行方式(在 src 目录下):
+    python -m benchmark.processing --sizes 1000,10000,100000 --output bench.json
+    python -m benchmark.processing --baseline bench.json
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import importlib.util
+import argparse
+import subprocess
+import tempfile
+import tracemalloc
+from datetime import datetime
+
+from config import prompt_max_tokens, query_params_map
+from local_type import UserInput
+from template import get_prompt, write_prompts
+from util.common import filter_job_list, filter_job_details, get_unique_job_list, get_unique_job_details, get_query_params
+from util.near_duplicate import drop_near_duplicates
+from util.synthetic import make_jobs
+
+USER_INPUT = UserInput(
+    degree='硕士',
+    salary='30-50K',
+    experience='3',
+    user_job_details=False,
+    other_info='',
+    max_size=30,
+    job_names=['ai agent', '大模型'],
+)
+
+# 生成数据时只生成有限数量的不同岗位, 其余岗位复制后替换ID, 减少生成时间和内存
+UNIQUE_JOB_COUNT = 10000
+# 重复岗位的比例, 用于测试去重
+DUPLICATE_RATE = 0.1
+# 按 token 预算写入提示词文件时的输出路径
+PROMPT_BENCH_PATH = os.path.join(tempfile.gettempdir(), 'boss_analysis_bench', 'prompt.txt')
+# 生成完整提示词的测试项, 数据规模超过 --prompt-max-size 时跳过
+PROMPT_CASES = ('get_prompt', 'write_prompts')
+
+
+def make_bench_jobs(size: int):
+    """生成 size 条岗位列表和岗位详情, 其中约 DUPLICATE_RATE 的岗位ID重复"""
+    base_job_list, base_job_details = make_jobs(min(size, UNIQUE_JOB_COUNT), seed=size)
+    unique_size = max(1, int(size * (1 - DUPLICATE_RATE)))
+    job_list, job_details = [], []
+    for index in range(size):
+        job, job_detail = base_job_list[index % len(base_job_list)], base_job_details[index % len(base_job_details)]
+        encrypt_id = f'{index % unique_size:012x}'
+        job_list.append({**job, 'encryptJobId': encrypt_id})
+        job_details.append({**job_detail, 'jobInfo': {**job_detail['jobInfo'], 'encryptId': encrypt_id}})
+    return job_list, job_details
+
+
+def get_cases(job_list: list, job_details: list):
+    """返回 (名称, 函数) 列表"""
+    def run_query_params():
+        for _ in range(len(job_list)):
+            get_query_params(query_params_map, USER_INPUT)
+
+    cases = [
+        ('filter_job_list', lambda: filter_job_list(job_list, USER_INPUT)),
+        ('filter_job_details', lambda: filter_job_details(job_details, USER_INPUT)),
+        ('get_unique_job_list', lambda: get_unique_job_list(job_list)),
+        ('get_unique_job_details', lambda: get_unique_job_details(job_details)),
+        ('get_query_params', run_query_params),
+        ('drop_near_duplicates', lambda: sum(1 for _ in drop_near_duplicates(job_details))),
+        ('get_prompt', lambda: get_prompt(job_details, USER_INPUT)),
+        ('write_prompts', lambda: write_prompts(job_details, USER_INPUT, PROMPT_BENCH_PATH, prompt_max_tokens)),
+    ]
+
+    # 岗位数据表依赖 pandas(analysis 依赖), 未安装时跳过
+    if importlib.util.find_spec('pandas'):
+        from util.job_table import build_job_table, filter_job_table
+        job_table = build_job_table(job_details)
+        cases += [
+            ('build_job_table', lambda: build_job_table(job_details)),
+            ('filter_job_table', lambda: filter_job_table(job_table, USER_INPUT)),
+        ]
+    return cases
+
+
+def measure(func, trace_memory: bool):
+    """返回 (耗时秒数, 内存峰值MB), 内存峰值单独运行一次统计, 避免影响耗时"""
+    start_time = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start_time
+
+    if not trace_memory:
+        return elapsed, None
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def run_benchmarks(sizes: list[int], prompt_max_size: int, trace_memory: bool):
+    results = []
+    for size in sizes:
+        job_list, job_details = make_bench_jobs(size)
+        for name, func in get_cases(job_list, job_details):
+            if name in PROMPT_CASES and size > prompt_max_size:
+                results.append({'name': name, 'size': size, 'skipped': True})
+                continue
+
+            elapsed, peak_memory_mb = measure(func, trace_memory)
+            result = {
+                'name': name,
+                'size': size,
+                'seconds': round(elapsed, 6),
+                'records_per_second': round(size / elapsed, 1) if elapsed else None,
+                'peak_memory_mb': round(peak_memory_mb, 3) if peak_memory_mb is not None else None,
+            }
+            results.append(result)
+            print(f"{name:<24} {size:>9} {elapsed:>10.4f}s {result['records_per_second'] or 0:>14.1f}/s"
+                  f"{'' if peak_memory_mb is None else f' {peak_memory_mb:>10.2f}MB'}")
+        del job_list, job_details
+    return results
+
+
+def get_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except Exception:
+        return None
+
+
+def compare_with_baseline(results: list[dict], baseline_path: str, threshold: float):
+    """与基准结果比较, 返回耗时超过 threshold 倍的测试项"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    baseline_map = {(item['name'], item['size']): item for item in baseline['results']}
+
+    regressions = []
+    for result in results:
+        base = baseline_map.get((result['name'], result['size']))
+        if not base or result.get('skipped') or base.get('skipped') or not base['seconds']:
+            continue
+        ratio = result['seconds'] / base['seconds']
+        print(f"{result['name']:<24} {result['size']:>9} {base['seconds']:>10.4f}s -> {result['seconds']:>10.4f}s  x{ratio:.2f}")
+        if ratio > threshold:
+            regressions.append({**result, 'baseline_seconds': base['seconds'], 'ratio': round(ratio, 3)})
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='岗位过滤、去重和提示词生成的性能测试')
+    parser.add_argument('--sizes', default='1000,10000,100000,1000000', help='数据规模, 多个用逗号分隔')
+    parser.add_argument('--prompt-max-size', type=int, default=100000,
+                        help='提示词生成测试的最大规模, 超过时跳过, 避免内存不足')
+    parser.add_argument('--no-memory', action='store_true', help='不统计内存峰值')
+    parser.add_argument('--output', help='结果保存路径(JSON)')
+    parser.add_argument('--baseline', help='用于比较的基准结果(JSON)')
+    parser.add_argument('--threshold', type=float, default=1.2, help='耗时超过基准的倍数时视为性能退化')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    results = run_benchmarks(sizes, args.prompt_max_size, not args.no_memory)
+    report = {
+        'commit': get_commit(),
+        'python': platform.python_version(),
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"结果已保存到 {args.output}")
+
+    if args.baseline:
+        regressions = compare_with_baseline(results, args.baseline, args.threshold)
+        if regressions:
+            print(f"发现 {len(regressions)} 项性能退化:")
+            for item in regressions:
+                print(f"  {item['name']} ({item['size']}): x{item['ratio']}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
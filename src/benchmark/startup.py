@@ -0,0 +1,116 @@
+"""
+使用已有岗位信息时的启动耗时测试
+
+在子进程中通过 python -X importtime 导入 main 模块, 统计模块导入耗时,
+并检查是否导入了只有搜索时才需要的浏览器相关模块.
+导入了这些模块或耗时超过 --max-ms 时返回非 0 退出码, 可以用于发现启动变慢.
+
+运行方式(在 src 目录下):
+    python -m benchmark.startup --repeat 5 --max-ms 300
+"""
+
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+# 使用已有岗位信息时不应该导入的模块
+LAZY_MODULES = ('search_job', 'playwright', 'playwright_stealth', 'tqdm', 'pandas')
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """解析 -X importtime 的输出, 返回 (模块名, 自身耗时us, 累计耗时us) 列表, 模块名保留缩进"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        modules.append((name.rstrip().removeprefix(' '), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def get_child_modules(modules: list[tuple[str, int, int]], module: str) -> list[tuple[str, int, int]]:
+    """
+    获取 module 直接导入的模块
+
+    -X importtime 先输出子模块再输出父模块, module 之前到上一个顶层模块之间缩进为 2 个空格的模块即为直接导入的模块
+    """
+    index = next(i for i, (name, _, _) in enumerate(modules) if name == module)
+    children = []
+    for name, self_us, cumulative_us in reversed(modules[:index]):
+        if not name.startswith(' '):
+            break
+        if not name.startswith('   '):
+            children.append((name.strip(), self_us, cumulative_us))
+    return children
+
+
+def measure_import(module: str):
+    """在新的解释器中导入 module, 返回 (进程耗时秒数, 导入的模块列表)"""
+    start_time = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True)
+    elapsed = time.perf_counter() - start_time
+    if result.returncode != 0:
+        raise RuntimeError(f"导入 {module} 失败:\n{result.stderr[-2000:]}")
+    return elapsed, parse_importtime(result.stderr)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='使用已有岗位信息时的启动耗时测试')
+    parser.add_argument('--module', default='main', help='导入的模块')
+    parser.add_argument('--repeat', type=int, default=5, help='重复次数, 取中位数')
+    parser.add_argument('--top', type=int, default=10, help='输出耗时最多的模块数量')
+    parser.add_argument('--max-ms', type=float, help='导入耗时超过该值(毫秒)时视为失败')
+    parser.add_argument('--output', help='结果保存路径(JSON)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    runs = [measure_import(args.module) for _ in range(args.repeat)]
+    process_ms = statistics.median(elapsed for elapsed, _ in runs) * 1000
+    import_ms = statistics.median(
+        next(cumulative_us for name, _, cumulative_us in modules if name == args.module)
+        for _, modules in runs) / 1000
+
+    modules = runs[-1][1]
+    module_names = {name.strip() for name, _, _ in modules}
+    lazy_modules = sorted(name for name in module_names
+                          if name.split('.')[0] in LAZY_MODULES)
+    top_modules = sorted(get_child_modules(modules, args.module),
+                         key=lambda item: item[2], reverse=True)[:args.top]
+
+    print(f"导入 {args.module}: {import_ms:.1f}ms, 进程总耗时 {process_ms:.1f}ms, 共 {len(module_names)} 个模块")
+    for name, _, cumulative_us in top_modules:
+        print(f"  {name:<40} {cumulative_us / 1000:>8.1f}ms")
+
+    result = {
+        'module': args.module,
+        'import_ms': round(import_ms, 1),
+        'process_ms': round(process_ms, 1),
+        'module_count': len(module_names),
+        'lazy_modules_imported': lazy_modules,
+        'top_modules': [{'name': name, 'cumulative_ms': round(cumulative_us / 1000, 1)}
+                        for name, _, cumulative_us in top_modules],
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"结果已保存到 {args.output}")
+
+    failed = False
+    if lazy_modules:
+        print(f"启动时导入了只有搜索时才需要的模块: {', '.join(lazy_modules)}")
+        failed = True
+    if args.max_ms is not None and import_ms > args.max_ms:
+        print(f"导入耗时 {import_ms:.1f}ms 超过 {args.max_ms}ms")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+常驻浏览器
+
+启动带调试端口的 Chromium 并打开站点首页, 一直运行直到按 Ctrl+C.
+将站点配置中的 cdp_url 设置为 http://127.0.0.1:9222 后, 每次搜索直接连接这个浏览器,
+跳过启动浏览器和打开首页检测登录状态的时间. 用户数据保存在 browser_profile_path,
+登录状态在多次运行之间保留.
+"""
+
+import asyncio
+import logging
+import argparse
+
+from playwright.async_api import async_playwright
+
+from config import SiteConfig, browser_server_port, browser_profile_path
+from util.fs import read_json
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def serve(site_config: SiteConfig, port: int, profile_path: str, headless: bool):
+    async with async_playwright() as playwright:
+        context = await playwright.chromium.launch_persistent_context(
+            profile_path,
+            headless=headless,
+            args=[f'--remote-debugging-port={port}'],
+        )
+        # 首次启动时导入已保存的登录信息
+        cookies = read_json(site_config.auth_path, {}).get('cookies', [])
+        if cookies and not await context.cookies(site_config.urls.home_page_url):
+            await context.add_cookies(cookies)
+
+        page = context.pages[0] if context.pages else await context.new_page()
+        await page.goto(site_config.urls.home_page_url)
+        logger.info(f"浏览器已启动, CDP 地址: http://127.0.0.1:{port}, 按 Ctrl+C 退出")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await context.close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='常驻浏览器')
+    parser.add_argument('--site', choices=['ZHIPIN', 'MOCK'], default='ZHIPIN')
+    parser.add_argument('--port', type=int, default=browser_server_port, help='调试端口')
+    parser.add_argument('--profile', default=browser_profile_path, help='用户数据目录')
+    parser.add_argument('--headless', action='store_true', help='无头模式运行')
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        asyncio.run(serve(SiteConfig(args.site), args.port, args.profile, args.headless))
+    except KeyboardInterrupt:
+        logger.info("浏览器已关闭")
@@ -7,6 +7,15 @@
 from dataclasses import dataclass
 from typing import Literal
 
+# 本地模拟服务地址, 见 mock_server.py
+mock_server_host = '127.0.0.1'
+mock_server_port = 8765
+mock_server_url = f'http://{mock_server_host}:{mock_server_port}'
+
+# 常驻浏览器的调试端口和用户数据目录, 见 browser_server.py
+browser_server_port = 9222
+browser_profile_path = 'data/browser_profile'
+
 # 网站配置
 SITE_CONFIG = {
     'ZHIPIN': {
@@ -16,8 +25,53 @@ SITE_CONFIG = {
             'job_list_url': 'https://www.zhipin.com/wapi/zpgeek/search/joblist.json',
             'job_detail_url': 'https://www.zhipin.com/wapi/zpgeek/job/detail.json',
         },
-        'auth_path': 'data/auth_zhipin.json'
-    }
+        'auth_path': 'data/auth_zhipin.json',
+        # 常驻浏览器的 CDP 地址, 如 http://127.0.0.1:9222, 设置后连接已运行的浏览器, 不再每次启动浏览器
+        'cdp_url': None,
+        # 无头模式运行浏览器, 需要先在有界面的模式下登录并保存认证信息
+        'headless': False,
+        # 拦截的资源类型(image, media, font, stylesheet 等), 只需要岗位列表和详情接口的数据
+        # 登录二维码是图片, 需要登录时不要拦截 image
+        'block_resource_types': ['media', 'font'],
+        # 拦截的第三方域名(统计、监控、地图), 包含子域名
+        'block_hosts': ['hm.baidu.com', 'google-analytics.com', 'googletagmanager.com', 'api.map.baidu.com'],
+        # 同时搜索的岗位数量, 大于 1 时每个岗位在独立的标签页中搜索
+        'concurrency': 1,
+        # 岗位详情获取方式: request 直接请求详情接口, click 点击岗位卡片
+        'detail_fetch_mode': 'request',
+        # 直接请求详情接口时的最大并发数
+        'detail_fetch_concurrency': 3,
+        # 每分钟最多请求数, 接口返回错误时自动降速, 最低降到 min_requests_per_minute
+        'requests_per_minute': 30,
+        'min_requests_per_minute': 6,
+        # 岗位详情缓存有效期(秒), 有效期内重复搜索到的岗位不再请求详情, 0 表示不使用缓存
+        'detail_cache_ttl': 24 * 60 * 60,
+        # 最多缓存的岗位详情数量, 超出时淘汰最久未使用的岗位
+        'detail_cache_max_size': 50000,
+        # 断点保存的最小间隔(秒), 每个岗位搜索完成时总是保存
+        'checkpoint_interval': 10,
+    },
+    'MOCK': {
+        'urls': {
+            'home_page_url': f'{mock_server_url}/web/geek/jobs',
+            'search_page_url': f'{mock_server_url}/web/geek/jobs',
+            'job_list_url': f'{mock_server_url}/wapi/zpgeek/search/joblist.json',
+            'job_detail_url': f'{mock_server_url}/wapi/zpgeek/job/detail.json',
+        },
+        'auth_path': 'data/auth_mock.json',
+        'cdp_url': None,
+        'headless': True,
+        'block_resource_types': ['image', 'media', 'font'],
+        'block_hosts': [],
+        'concurrency': 1,
+        'detail_fetch_mode': 'request',
+        'detail_fetch_concurrency': 3,
+        'requests_per_minute': 600,
+        'min_requests_per_minute': 60,
+        'detail_cache_ttl': 0,
+        'detail_cache_max_size': 50000,
+        'checkpoint_interval': 10,
+    },
 }
 
 degree_map = {
@@ -33,6 +87,34 @@ salary_map = [
     '50-100K',
 ]
 
+# 岗位数据文件(JSONL, 每行一条记录)
+job_list_store_path = 'data/joblist.jsonl'
+job_detail_store_path = 'data/jobdetail.jsonl'
+# 历史岗位数据库(SQLite)
+job_repository_path = 'data/jobs.db'
+# 岗位详情缓存(SQLite)
+detail_cache_path = 'data/detail_cache.db'
+# 爬虫断点文件, 搜索完成后删除
+checkpoint_path = 'data/checkpoint.json'
+# 生成的提示词文件
+prompt_path = 'data/prompt.txt'
+# 每次运行的指标报告目录, metrics_prometheus 为 True 时同时输出 boss_spider.prom
+metrics_dir = 'data/metrics'
+metrics_prometheus = False
+# 诊断模式: 事件循环阻塞超过该秒数时记录调用栈, 0 表示不检测
+diagnostics_stall_threshold = 0
+# 诊断模式: 对整个搜索过程采样分析, 结果保存为 data/profile-<时间>.folded
+diagnostics_profile = False
+# 每个提示词的最大 token 数(估算值), 超出时拆分为 prompt_1.txt, prompt_2.txt ...
+prompt_max_tokens = 100000
+# 岗位描述相似度不低于该值时视为重复岗位, 生成提示词时只保留一个, 0 表示不去重
+near_duplicate_threshold = 0.8
+# 招聘市场统计报告(JSON), 统计历史岗位中符合过滤条件的岗位, 同时生成同名的 .md 文字摘要, 为空时不统计
+# 需要先安装 analysis 依赖(uv sync --extra analysis), 再设置为 'data/market_report.json' 等路径开启
+market_report_path = ''
+# 提示词中使用市场统计摘要代替岗位详情原文
+market_report_in_prompt = False
+
 # 会被忽略的职位
 job_ignore_names = [
     '产品',
@@ -131,8 +213,32 @@ class SiteConfig:
     name: str
     urls: SiteUrls
     auth_path: str
+    cdp_url: str | None
+    headless: bool
+    block_resource_types: list[str]
+    block_hosts: list[str]
+    concurrency: int
+    detail_fetch_mode: Literal['request', 'click']
+    detail_fetch_concurrency: int
+    requests_per_minute: float
+    min_requests_per_minute: float
+    detail_cache_ttl: float
+    detail_cache_max_size: int
+    checkpoint_interval: float
 
-    def __init__(self, name: Literal['ZHIPIN']):
+    def __init__(self, name: Literal['ZHIPIN', 'MOCK']):
         self.name = name
         self.urls = SiteUrls(**SITE_CONFIG[name]['urls'])
         self.auth_path = SITE_CONFIG[name]['auth_path']
+        self.cdp_url = SITE_CONFIG[name].get('cdp_url')
+        self.headless = SITE_CONFIG[name].get('headless', False)
+        self.block_resource_types = SITE_CONFIG[name].get('block_resource_types', [])
+        self.block_hosts = SITE_CONFIG[name].get('block_hosts', [])
+        self.concurrency = SITE_CONFIG[name].get('concurrency', 1)
+        self.detail_fetch_mode = SITE_CONFIG[name].get('detail_fetch_mode', 'click')
+        self.detail_fetch_concurrency = SITE_CONFIG[name].get('detail_fetch_concurrency', 1)
+        self.requests_per_minute = SITE_CONFIG[name].get('requests_per_minute', 30)
+        self.min_requests_per_minute = SITE_CONFIG[name].get('min_requests_per_minute', 6)
+        self.detail_cache_ttl = SITE_CONFIG[name].get('detail_cache_ttl', 0)
+        self.detail_cache_max_size = SITE_CONFIG[name].get('detail_cache_max_size', 50000)
+        self.checkpoint_interval = SITE_CONFIG[name].get('checkpoint_interval', 10)
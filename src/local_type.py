@@ -1,4 +1,4 @@
-from typing import TypedDict, TypeVar
+from typing import NotRequired, TypedDict, TypeVar
 
 
 class JobListQueryParams(TypedDict):
@@ -132,6 +132,8 @@ class UserInput(TypedDict):
     other_info: str
     max_size: int
     job_names: list[str]
+    city: NotRequired[str]  # 城市id(如 101280600), 为空时使用页面默认的城市
+    skills: NotRequired[list[str]]  # 生成提示词时只保留包含所有这些技能的岗位
 
 
 JobItemOrDetailItem = TypeVar(
@@ -2,40 +2,95 @@
 主函数
 """
 
+import os
 import asyncio
 import logging
+import importlib.util
+from itertools import chain
+from typing import Iterable
 
-from search_job import search
-from template import get_prompt
-from util.common import filter_job_details
-from util.fs import write_text, read_json
+from template import get_market_summary, write_prompts, write_market_prompt
+from util.fs import read_job_store, write_text
 from util.input import collect_user_input
-from local_type import UserInput, JobDetailItem
+from util.repository import JobRepository
+from util.near_duplicate import drop_near_duplicates
+from local_type import JobDetailItem, UserInput
+from config import (job_detail_store_path, prompt_path, prompt_max_tokens, near_duplicate_threshold,
+                    market_report_path, market_report_in_prompt)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-async def main(user_input: UserInput, job_details: list[JobDetailItem]):
-    if not user_input['user_job_details']:
-        _, job_details = await search(user_input)
-    else:
-        job_details = filter_job_details(job_details, user_input)
-
-    if not job_details:
+def save_prompt(job_details: Iterable[JobDetailItem], user_input: UserInput):
+    """逐个岗位生成提示词并写入文件, 超出 token 预算时拆分为多个文件"""
+    if near_duplicate_threshold:
+        job_details = drop_near_duplicates(job_details, near_duplicate_threshold)
+    job_details = iter(job_details)
+    first_job_detail = next(job_details, None)
+    if first_job_detail is None:
         logger.warning("没有找到职位信息")
         return
 
-    prompt = get_prompt(job_details, user_input)
-    write_text(prompt, 'data/prompt.txt')
-    logger.info(f'prompt saved to data/prompt.txt')
-    logger.info(prompt[:100] + '...' + prompt[-100:]
-                if len(prompt) > 100 else prompt)
+    file_paths = write_prompts(chain([first_job_detail], job_details), user_input,
+                               prompt_path, prompt_max_tokens)
+    logger.info(f'prompt saved to {", ".join(file_paths)}')
+
+
+def save_market_report(user_input: UserInput) -> str | None:
+    """统计历史岗位中符合过滤条件的岗位并保存市场统计报告, 返回文字摘要, 未开启或未安装 pandas 时返回 None"""
+    if not market_report_path:
+        return None
+    if not importlib.util.find_spec('pandas'):
+        logger.warning("未安装 pandas, 跳过市场统计, 安装方式: uv sync --extra analysis")
+        return None
+
+    # pandas 导入较慢, 只在需要统计时导入
+    from util.market_report import write_market_report
+    summary = get_market_summary(write_market_report(user_input, market_report_path))
+    write_text(summary, os.path.splitext(market_report_path)[0] + '.md')
+    logger.info(f'market report saved to {market_report_path}')
+    return summary
+
+
+def select_by_skills(job_details: list[JobDetailItem], user_input: UserInput) -> list[JobDetailItem]:
+    """只保留包含用户要求的所有技能的岗位, 通过技能倒排索引查询"""
+    skills = user_input.get('skills')
+    if not skills:
+        return job_details
+
+    with JobRepository() as repository:
+        job_ids = repository.skill_index.query(all_skills=skills)
+    selected = [job_detail for job_detail in job_details if job_detail['jobInfo']['encryptId'] in job_ids]
+    logger.info(f"包含技能 {', '.join(skills)} 的岗位: {len(selected)}/{len(job_details)}")
+    return selected
+
+
+async def main(user_input: UserInput):
+    job_details = None
+    if not user_input['user_job_details']:
+        # 只有需要搜索时才导入浏览器相关模块, 使用已有岗位信息时启动更快
+        from search_job import search
+        _, job_details = await search(user_input)
+        job_details = select_by_skills(job_details, user_input)
+
+    summary = save_market_report(user_input)
+    if market_report_in_prompt and summary:
+        file_paths = write_market_prompt(summary, user_input, prompt_path)
+        logger.info(f'prompt saved to {", ".join(file_paths)}')
+    elif job_details is not None:
+        save_prompt(job_details, user_input)
+    else:
+        with JobRepository() as repository:
+            save_prompt(repository.iter_job_details(user_input), user_input)
 
 
 if __name__ == "__main__":
-    job_details = read_json('data/jobdetail.json')
-    exist_job_details = len(job_details) > 0
+    with JobRepository() as repository:
+        # 兼容旧版本, 首次运行时导入已有的岗位详情文件
+        if repository.count_job_details() == 0:
+            repository.upsert_job_details(read_job_store(job_detail_store_path))
+        exist_job_details = repository.count_job_details() > 0
 
     user_input = collect_user_input(exist_job_details)
-    asyncio.run(main(user_input, job_details))
+    asyncio.run(main(user_input))
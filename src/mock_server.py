@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Boss直聘本地模拟服务
+
+提供搜索页、岗位列表接口(joblist.json)和岗位详情接口(detail.json),
+数据来自录制的岗位文件或随机生成, 支持配置接口延迟、分页数量和错误注入,
+配合 SiteConfig('MOCK') 可以在没有网络的环境下运行和测试爬虫.
+"""
+
+import json
+import time
+import zlib
+import random
+import logging
+import argparse
+import threading
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from config import mock_server_host, mock_server_port
+from local_type import JobDetailItem, JobListItem
+from util.fs import read_job_store
+from util.synthetic import make_job_list_item, make_job_detail_item
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SEARCH_PAGE_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>BOSS直聘(模拟)</title>
+<style>
+body { margin: 0; font-family: sans-serif; }
+.header { height: 60px; line-height: 60px; padding: 0 20px; background: #00bebd; color: #fff; }
+.search-input-box { padding: 16px 20px; }
+.search-input-box input { width: 400px; height: 32px; }
+.job-list { list-style: none; margin: 0; padding: 0 20px; width: 55%; }
+.card-area { height: 120px; padding: 12px 0; border-bottom: 1px solid #eee; box-sizing: border-box; }
+.job-detail-box { position: fixed; top: 140px; right: 20px; width: 38%; white-space: pre-wrap; }
+</style>
+</head>
+<body>
+<div class="header">BOSS直聘(模拟) __LOGIN__</div>
+<div class="search-input-box"><input type="text" placeholder="搜索职位、公司"></div>
+<ul class="job-list"></ul>
+<div class="job-detail-box"></div>
+<script>
+const PAGE_SIZE = __PAGE_SIZE__;
+const params = new URLSearchParams(location.search);
+const state = { query: params.get('query') || '', page: 0, hasMore: true, loading: false, token: 0, activeId: '' };
+
+async function loadJobs(reset) {
+  if (!reset && (state.loading || !state.hasMore)) return;
+  if (reset) {
+    state.page = 0;
+    state.hasMore = true;
+    state.activeId = '';
+    document.querySelector('.job-list').innerHTML = '';
+  }
+  const token = ++state.token;
+  state.loading = true;
+  const query = new URLSearchParams(params);
+  query.set('query', state.query);
+  query.set('page', state.page + 1);
+  query.set('pageSize', PAGE_SIZE);
+  try {
+    const response = await fetch('/wapi/zpgeek/search/joblist.json?' + query);
+    const data = await response.json();
+    if (token !== state.token || data.code !== 0) return;
+    state.page += 1;
+    state.hasMore = data.zpData.hasMore;
+    renderJobs(data.zpData.jobList);
+    // 与真实页面一致, 默认加载第一个岗位的详情
+    if (state.page === 1 && data.zpData.jobList.length) loadDetail(data.zpData.jobList[0]);
+  } catch (e) {
+    console.error(e);
+  } finally {
+    if (token === state.token) state.loading = false;
+  }
+}
+
+function renderJobs(jobList) {
+  const list = document.querySelector('.job-list');
+  for (const job of jobList) {
+    const card = document.createElement('li');
+    card.className = 'card-area';
+    const link = document.createElement('a');
+    link.className = 'job-name';
+    link.href = '/job_detail/' + job.encryptJobId + '.html';
+    link.textContent = job.jobName;
+    link.addEventListener('click', (event) => {
+      event.preventDefault();
+      loadDetail(job);
+    });
+    const info = document.createElement('div');
+    info.textContent = [job.salaryDesc, job.cityName, job.jobExperience, job.jobDegree, job.brandName].join(' | ');
+    card.append(link, info);
+    list.append(card);
+  }
+}
+
+async function loadDetail(job) {
+  if (state.activeId === job.encryptJobId) return;
+  state.activeId = job.encryptJobId;
+  const query = new URLSearchParams({ securityId: job.securityId, lid: job.lid });
+  try {
+    const response = await fetch('/wapi/zpgeek/job/detail.json?' + query);
+    const data = await response.json();
+    document.querySelector('.job-detail-box').textContent =
+      data.code === 0 ? data.zpData.jobInfo.postDescription : data.message;
+  } catch (e) {
+    console.error(e);
+  }
+}
+
+const input = document.querySelector('.search-input-box input');
+input.value = state.query;
+input.addEventListener('keydown', (event) => {
+  if (event.key !== 'Enter') return;
+  state.query = input.value.trim();
+  params.set('query', state.query);
+  history.pushState(null, '', '?' + params);
+  loadJobs(true);
+});
+window.addEventListener('scroll', () => {
+  if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 50) loadJobs(false);
+});
+loadJobs(true);
+</script>
+</body>
+</html>
+"""
+
+
+@dataclass
+class MockOptions:
+    pages: int = 10  # 每个搜索关键词的分页数量
+    page_size: int = 15  # 每页岗位数量
+    latency: float = 0.1  # 接口基础延迟(秒)
+    latency_jitter: float = 0.05  # 接口延迟的随机波动(秒)
+    error_rate: float = 0.0  # 接口返回错误的概率
+    login: bool = True  # 页面是否显示为已登录
+    seed: int = 0  # 随机数据的种子
+    fixtures_dir: str | None = None  # 录制的岗位文件目录, 包含 joblist.jsonl 和 jobdetail.jsonl
+
+
+class MockZhipin:
+    """模拟服务的数据和统计"""
+
+    def __init__(self, options: MockOptions):
+        self.options = options
+        self.rng = random.Random(options.seed)
+        self.lock = threading.Lock()
+        self.jobs: dict[str, JobListItem] = {}  # securityId -> 岗位
+        self.job_details: dict[str, JobDetailItem] = {}  # encryptId -> 岗位详情
+        self.fixture_job_list: list[JobListItem] = []
+        self.stats: dict[str, int] = {}
+        if options.fixtures_dir:
+            self.load_fixtures(options.fixtures_dir)
+
+    def load_fixtures(self, fixtures_dir: str):
+        self.fixture_job_list = read_job_store(f'{fixtures_dir}/joblist.jsonl')
+        for job_detail in read_job_store(f'{fixtures_dir}/jobdetail.jsonl'):
+            self.job_details[job_detail['jobInfo']['encryptId']] = job_detail
+        for job in self.fixture_job_list:
+            self.jobs[job['securityId']] = job
+        logger.info(
+            f"加载录制数据: {len(self.fixture_job_list)} 个岗位列表, {len(self.job_details)} 个岗位详情")
+
+    def count(self, key: str):
+        with self.lock:
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    def get_job_list_page(self, query: str, page: int, page_size: int):
+        """获取一页岗位列表, 返回 (岗位列表, 是否还有下一页)"""
+        if self.fixture_job_list:
+            start = (page - 1) * page_size
+            job_list = self.fixture_job_list[start:start + page_size]
+            return job_list, start + page_size < len(self.fixture_job_list) and page < self.options.pages
+
+        if page > self.options.pages:
+            return [], False
+
+        # 同一个关键词和分页总是返回相同的岗位
+        rng = random.Random(f'{self.options.seed}-{query}-{page}')
+        offset = zlib.crc32(query.encode()) * 10000 + (page - 1) * page_size
+        job_list = [make_job_list_item(offset + i, rng, self.options.seed)
+                    for i in range(page_size)]
+        with self.lock:
+            for job in job_list:
+                self.jobs[job['securityId']] = job
+        return job_list, page < self.options.pages
+
+    def get_job_detail(self, security_id: str) -> JobDetailItem | None:
+        job = self.jobs.get(security_id)
+        if not job:
+            return None
+
+        job_detail = self.job_details.get(job['encryptJobId'])
+        if not job_detail:
+            job_detail = make_job_detail_item(job, random.Random(job['encryptJobId']))
+            with self.lock:
+                self.job_details[job['encryptJobId']] = job_detail
+        return job_detail
+
+    def get_error(self) -> tuple[int, dict] | None:
+        """按 error_rate 注入错误, 返回 (HTTP 状态码, 响应内容)"""
+        if self.rng.random() >= self.options.error_rate:
+            return None
+
+        return self.rng.choice([
+            (429, {'code': 429, 'message': 'Too Many Requests'}),
+            (500, {'code': 500, 'message': 'Internal Server Error'}),
+            (200, {'code': 37, 'message': '您的访问行为异常.'}),
+        ])
+
+    def wait(self):
+        latency = self.options.latency + self.rng.uniform(0, self.options.latency_jitter)
+        if latency > 0:
+            time.sleep(latency)
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    server: 'MockHTTPServer'
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def send_body(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status: int, data: dict):
+        self.send_body(status, json.dumps(data, ensure_ascii=False).encode('utf-8'),
+                       'application/json;charset=UTF-8')
+
+    def do_GET(self):
+        mock = self.server.mock
+        url = urlparse(self.path)
+        qs = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        if url.path == '/web/geek/jobs':
+            mock.count('search_page')
+            login_html = '<a ka="header-username">模拟用户</a>' if mock.options.login else ''
+            html = SEARCH_PAGE_HTML.replace('__LOGIN__', login_html).replace(
+                '__PAGE_SIZE__', str(mock.options.page_size))
+            self.send_body(200, html.encode('utf-8'), 'text/html;charset=UTF-8')
+            return
+
+        if url.path.startswith('/job_detail/'):
+            mock.count('job_detail_page')
+            self.send_body(200, '<html><body>岗位详情</body></html>'.encode('utf-8'),
+                           'text/html;charset=UTF-8')
+            return
+
+        if url.path not in ('/wapi/zpgeek/search/joblist.json', '/wapi/zpgeek/job/detail.json'):
+            self.send_json(404, {'code': 404, 'message': 'Not Found'})
+            return
+
+        mock.wait()
+        error = mock.get_error()
+        if error:
+            mock.count('errors')
+            self.send_json(*error)
+            return
+
+        if url.path == '/wapi/zpgeek/search/joblist.json':
+            mock.count('job_list')
+            page = int(qs.get('page', '1'))
+            page_size = int(qs.get('pageSize', mock.options.page_size))
+            job_list, has_more = mock.get_job_list_page(qs.get('query', ''), page, page_size)
+            self.send_json(200, {'code': 0, 'message': 'Success',
+                                 'zpData': {'hasMore': has_more, 'jobList': job_list}})
+            return
+
+        mock.count('job_detail')
+        job_detail = mock.get_job_detail(qs.get('securityId', ''))
+        if not job_detail:
+            self.send_json(200, {'code': 1, 'message': '岗位不存在'})
+            return
+        self.send_json(200, {'code': 0, 'message': 'Success', 'zpData': job_detail})
+
+
+class MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], mock: MockZhipin):
+        super().__init__(address, MockRequestHandler)
+        self.mock = mock
+
+
+def start_mock_server(options: MockOptions, host: str = mock_server_host, port: int = mock_server_port) -> MockHTTPServer:
+    """在后台线程中启动模拟服务, 使用 server.shutdown() 停止"""
+    server = MockHTTPServer((host, port), MockZhipin(options))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(f"模拟服务已启动: http://{host}:{port}/web/geek/jobs")
+    return server
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Boss直聘本地模拟服务')
+    parser.add_argument('--host', default=mock_server_host)
+    parser.add_argument('--port', type=int, default=mock_server_port)
+    parser.add_argument('--pages', type=int, default=10, help='每个关键词的分页数量')
+    parser.add_argument('--page-size', type=int, default=15, help='每页岗位数量')
+    parser.add_argument('--latency', type=float, default=0.1, help='接口基础延迟(秒)')
+    parser.add_argument('--latency-jitter', type=float, default=0.05, help='接口延迟的随机波动(秒)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='接口返回错误的概率')
+    parser.add_argument('--no-login', action='store_true', help='页面显示为未登录')
+    parser.add_argument('--seed', type=int, default=0, help='随机数据的种子')
+    parser.add_argument('--fixtures', help='录制的岗位文件目录, 如 data')
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    options = MockOptions(
+        pages=args.pages,
+        page_size=args.page_size,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        login=not args.no_login,
+        seed=args.seed,
+        fixtures_dir=args.fixtures,
+    )
+    server = MockHTTPServer((args.host, args.port), MockZhipin(options))
+    logger.info(f"模拟服务已启动: http://{args.host}:{args.port}/web/geek/jobs")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
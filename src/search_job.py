@@ -5,19 +5,29 @@ Boss直聘AI Agent岗位爬虫 - Playwright版本
 logger.
 """
 
+import os
+import sys
 import json
 import asyncio
 import random
 from concurrent.futures import ThreadPoolExecutor
+from typing import Literal
 from urllib.parse import urlparse, parse_qs, urlencode
-from config import SiteConfig, query_params_map
-from local_type import JobDetailItem, JobDetailResponse, JobListItem, JobListResponse, UserInput, JobItemOrDetailItem
-from playwright.async_api import async_playwright, Page, Playwright, Browser, Route
+from config import (SiteConfig, query_params_map, job_list_store_path, job_detail_store_path, metrics_dir,
+                    metrics_prometheus, diagnostics_stall_threshold, diagnostics_profile)
+from local_type import JobDetailItem, JobDetailQueryParams, JobDetailResponse, JobListItem, JobListResponse, UserInput, JobItemOrDetailItem
+from playwright.async_api import async_playwright, Page, Playwright, Browser, Route, APIResponse, Request
 from playwright.async_api import BrowserContext as Context
 from playwright_stealth import Stealth
 import logging
-from util.fs import exists_file, write_json, delete_file, read_json
-from util.common import filter_job_list, get_unique_job_list, get_unique_job_details, get_query_params
+from util.fs import exists_file, delete_file, read_json, append_jsonl, compact_jsonl, read_job_store
+from util.common import FilterSpec, get_query_params
+from util.repository import JobRepository
+from util.rate_limit import AdaptiveRateLimiter
+from util.detail_cache import DetailCache
+from util.checkpoint import CrawlCheckpoint
+from util.metrics import RunMetrics
+from util.diagnostics import Diagnostics
 from tqdm import tqdm
 import time
 import questionary
@@ -27,22 +37,62 @@ logger = logging.getLogger(__name__)
 
 
 class BossSpider:
-    def __init__(self, site_config: SiteConfig):
+    def __init__(self, site_config: SiteConfig, parent: 'BossSpider | None' = None):
+        """
+        :param site_config: 站点配置
+        :param parent: 打开标签页的爬虫, 不为空时共用其限流器、工作线程、详情缓存、运行指标和断点, 不再单独创建
+        """
         self.playwright: Playwright | None = None
         self.browser: Browser | None = None
         self.context: Context | None = None
         self.page: Page | None = None
         self.site_config: SiteConfig = site_config
         self.is_login: bool = False
+        # 是否连接到已运行的浏览器, 关闭时保留浏览器、上下文和页面
+        self.attached: bool = False
         self.current_page: int = 1
+        self.current_job_name: str = ''
         self.job_list: list[JobListItem] = []
         self.job_details: list[JobDetailItem] = []
+        self.filter_spec: FilterSpec | None = None
+        # 符合过滤条件的岗位, 在接收岗位列表时增量更新
+        self.matched_job_list: list[JobListItem] = []
+        self.matched_job_ids: set[str] = set()
+        # 已获取或已被认领获取详情的岗位ID, 标签页与打开它的爬虫共用同一个集合
+        self.detail_job_ids: set[str] = parent.detail_job_ids if parent else set()
+        # 本爬虫认领的岗位ID, 获取失败时释放
+        self.claimed_job_ids: set[str] = set()
+        self.pending_tasks: set[asyncio.Task] = set()
+        if parent:
+            self.rate_limiter = parent.rate_limiter
+            self.executor = parent.executor
+            self.detail_cache = parent.detail_cache
+            self.metrics = parent.metrics
+            self.checkpoint = parent.checkpoint
+            return
+        # 所有请求共用的限流器, 替代固定的随机等待
+        self.rate_limiter = AdaptiveRateLimiter(
+            site_config.requests_per_minute, site_config.min_requests_per_minute)
+        # 响应解析和文件写入在单独的线程中按顺序执行, 不阻塞事件循环
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        # 岗位详情缓存, 只在工作线程中读写
+        self.detail_cache: DetailCache | None = DetailCache(
+            site_config.detail_cache_ttl, site_config.detail_cache_max_size) if site_config.detail_cache_ttl > 0 else None
+        # 各阶段耗时和计数, 所有标签页共用
+        self.metrics = RunMetrics(site_config.name)
+        # 搜索进度断点, 在 run 中创建, 所有标签页共用
+        self.checkpoint: CrawlCheckpoint | None = None
 
     async def init_browser(self):
         """初始化浏览器"""
         if self.playwright:
             return
 
+        with self.metrics.phase('browser_launch'):
+            await self.launch_browser()
+
+    async def launch_browser(self):
+        """启动或连接浏览器, 打开页面"""
         custom_languages = ('zh-CN', 'en')
         stealth = Stealth(
             navigator_languages_override=custom_languages,
@@ -50,38 +100,147 @@ class BossSpider:
         )
 
         self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=False)
-        if not self.browser:
-            raise Exception("浏览器初始化失败")
+        if not (self.site_config.cdp_url and await self.connect_browser(self.site_config.cdp_url)):
+            self.browser = await self.playwright.chromium.launch(headless=self.site_config.headless)
+            if not self.browser:
+                raise Exception("浏览器初始化失败")
 
-        self.context = await self.browser.new_context(
-            storage_state=self.site_config.auth_path if exists_file(self.site_config.auth_path) else None)
-        if not self.context:
-            raise Exception("上下文初始化失败")
+            self.context = await self.browser.new_context(
+                storage_state=self.site_config.auth_path if exists_file(self.site_config.auth_path) else None)
+            if not self.context:
+                raise Exception("上下文初始化失败")
 
         await stealth.apply_stealth_async(self.context)
+        await self.register_resource_blocking()
 
-        self.page = await self.context.new_page()
-        logger.info("浏览器初始化完成, 打开了新页面")
+        if not self.page:
+            self.page = await self.context.new_page()
+            logger.info("浏览器初始化完成, 打开了新页面")
         if not self.page:
             raise Exception("页面初始化失败")
 
+    async def connect_browser(self, cdp_url: str) -> bool:
+        """
+        通过 CDP 连接已运行的浏览器, 复用其中的上下文和已打开的站点页面
+
+        :param cdp_url: 浏览器的调试地址
+        :return: 是否连接成功, 失败时由调用方启动新的浏览器
+        """
+        if not self.playwright:
+            raise Exception("Playwright 未初始化")
+
+        try:
+            self.browser = await self.playwright.chromium.connect_over_cdp(cdp_url)
+        except Exception as e:
+            logger.warning(f"连接浏览器 {cdp_url} 失败, 启动新的浏览器: {e}")
+            return False
+
+        self.attached = True
+        if self.browser.contexts:
+            self.context = self.browser.contexts[0]
+        else:
+            self.context = await self.browser.new_context(
+                storage_state=self.site_config.auth_path if exists_file(self.site_config.auth_path) else None)
+
+        # 复用已打开的站点页面, 可以直接检测登录状态, 不需要重新打开首页
+        self.page = next((page for page in self.context.pages if self.is_site_url(page.url)), None)
+        logger.info(f"已连接浏览器 {cdp_url}, {'复用已打开的页面' if self.page else '没有已打开的站点页面'}")
+        return True
+
+    def is_site_url(self, url: str):
+        """是否是当前站点的页面"""
+        return bool(url) and urlparse(url).netloc == urlparse(self.site_config.urls.home_page_url).netloc
+
+    async def register_resource_blocking(self):
+        """在浏览器上下文中拦截不需要的资源, 对所有标签页生效"""
+        if not self.context:
+            raise Exception("上下文未初始化")
+
+        if not self.site_config.block_resource_types and not self.site_config.block_hosts:
+            return
+
+        # 页面上注册的岗位列表和详情接口拦截优先于上下文的拦截
+        await self.context.route('**/*', self.handle_resource_request)
+
+    def is_blocked_request(self, request: Request):
+        """是否是需要拦截的资源类型或第三方域名"""
+        if request.resource_type in self.site_config.block_resource_types:
+            return True
+
+        host = urlparse(request.url).hostname or ''
+        return any(host == blocked_host or host.endswith(f'.{blocked_host}')
+                   for blocked_host in self.site_config.block_hosts)
+
+    async def handle_resource_request(self, route: Route):
+        """拦截不需要的资源, 其他请求正常发送"""
+        try:
+            if self.is_blocked_request(route.request):
+                self.metrics.increment('blocked_requests')
+                await route.abort()
+            else:
+                await route.fallback()
+        except Exception as e:
+            logger.error(f"处理资源请求时出错: {e}")
+            self.metrics.increment('errors')
+
+    async def open_tab(self) -> 'BossSpider':
+        """在当前浏览器上下文中打开新的标签页, 返回拥有独立结果缓存的爬虫"""
+        if not self.context:
+            raise Exception("上下文未初始化")
+
+        spider = BossSpider(self.site_config, parent=self)
+        spider.context = self.context
+        spider.is_login = self.is_login
+        spider.filter_spec = self.filter_spec
+        spider.page = await self.context.new_page()
+        return spider
+
+    def merge_tab(self, spider: 'BossSpider'):
+        """合并标签页的搜索结果"""
+        self.job_list.extend(spider.job_list)
+        self.job_details.extend(spider.job_details)
+        for job in spider.matched_job_list:
+            encrypt_job_id = job.get('encryptJobId', '')
+            if encrypt_job_id in self.matched_job_ids:
+                continue
+            self.matched_job_ids.add(encrypt_job_id)
+            self.matched_job_list.append(job)
+
     async def close_browser(self):
-        """关闭浏览器"""
-        if self.page:
+        """关闭浏览器, 连接的已运行浏览器只断开连接, 保留页面供下次运行复用"""
+        if self.page and not self.attached:
             await self.page.close()
-            self.page = None
-        if self.context:
+        self.page = None
+        if self.context and not self.attached:
             await self.context.close()
-            self.context = None
+        self.context = None
         if self.browser:
             await self.browser.close()
             self.browser = None
         if self.playwright:
             await self.playwright.stop()
             self.playwright = None
+        self.executor.shutdown(wait=True)
+        if self.detail_cache:
+            logger.info(
+                f"岗位详情缓存命中 {self.detail_cache.hits} 个, 未命中 {self.detail_cache.misses} 个")
+            self.metrics.increment('detail_cache_hits', self.detail_cache.hits)
+            self.metrics.increment('detail_cache_misses', self.detail_cache.misses)
+            self.detail_cache.close()
+            self.detail_cache = None
+        self.write_metrics()
         logger.info("浏览器关闭完成")
 
+    def write_metrics(self):
+        """保存本次运行的指标报告"""
+        self.metrics.add_phase('rate_limit_wait', self.rate_limiter.wait_seconds)
+        self.metrics.phase_calls['rate_limit_wait'] = self.rate_limiter.acquired
+        try:
+            report_path = self.metrics.write_report(metrics_dir, metrics_prometheus)
+            logger.info(f"运行指标已保存到 {report_path}")
+        except Exception as e:
+            logger.error(f"保存运行指标时出错: {e}")
+
     async def save_auth(self):
         """保存认证信息"""
         if not self.context:
@@ -102,13 +261,15 @@ class BossSpider:
         logger.info("开始检测登录状态")
 
         try:
-            if need_goto:
-                await self.page.goto(self.site_config.urls.home_page_url)
-            user_name = await self.page.locator('[ka=header-username]').all()
+            with self.metrics.phase('login_detection'):
+                if need_goto:
+                    await self.page.goto(self.site_config.urls.home_page_url)
+                user_name = await self.page.locator('[ka=header-username]').all()
             self.is_login = len(user_name) > 0
             logger.info(f"登录状态: {self.is_login}")
         except Exception as e:
             logger.error(f"检测登录状态时出错: {e}")
+            self.metrics.increment('errors')
             self.is_login = False
 
     def has_login(self):
@@ -126,75 +287,281 @@ class BossSpider:
             self.current_page = next_page
 
         try:
-            original = await route.fetch()
-            body = await original.body()
-            json_data: JobListResponse = json.loads(body.decode('utf-8'))
-            if json_data.get('code') == 0:
-                job_list.extend(json_data.get('zpData', {}).get('jobList', []))
-                write_json(job_list, 'data/joblist.json')
-
-            body = json.dumps(json_data).encode('utf-8')
-
-            await route.fulfill(
-                status=original.status,
-                headers=original.headers,
-                body=body
-            )
+            with self.metrics.phase('route_handling'):
+                original = await route.fetch()
+                # 原样返回响应, 页面不需要等待解析完成
+                await route.fulfill(response=original)
         except Exception as e:
             logger.error(f"处理响应时出错: {e}")
+            self.metrics.increment('errors')
             # 出错时继续请求
             await route.continue_()
+            return
+
+        # 解析在后台执行, 完成前可能已经开始加载下一页或搜索下一个岗位, 按请求时的关键词和分页记录进度
+        self.track_task(self.ingest_job_list(original, job_list, self.current_job_name, next_page))
+
+    async def ingest_job_list(self, response: APIResponse, job_list: list[JobListItem], job_name: str, page: int):
+        """
+        解析并记录岗位列表响应
+
+        :param response: 岗位列表接口的响应
+        :param job_list: 岗位列表, 解析后追加到其中
+        :param job_name: 请求时搜索的岗位名称
+        :param page: 请求的分页
+        """
+        if self.checkpoint and self.checkpoint.is_restored_page(job_name, page):
+            # 该分页的岗位已在 restore_checkpoint 中从岗位数据文件恢复, 不需要重新解析和写入
+            self.rate_limiter.report(response.status)
+            self.metrics.increment('restored_pages')
+            return
 
-    async def handle_detail_response(self, route: Route, job_details: list[JobDetailItem]):
-        """处理岗位详情响应"""
         try:
-            logger.info(f"处理岗位详情响应: {route.request.url}")
-            original = await route.fetch()
-            body = await original.body()
-            json_data: JobDetailResponse = json.loads(body.decode('utf-8'))
+            body = await response.body()
+            self.metrics.increment('bytes', len(body))
+            json_data: JobListResponse = await self.parse_response(response, body)
             if json_data.get('code') == 0:
-                job_details.append(json_data.get('zpData', {}))
+                page_job_list = json_data.get('zpData', {}).get('jobList', [])
+                self.metrics.increment('pages')
+                self.metrics.increment('list_items', len(page_job_list))
+                job_list.extend(page_job_list)
+                self.match_job_list(page_job_list)
+                with self.metrics.phase('file_write'):
+                    await self.run_in_executor(append_jsonl, page_job_list, job_list_store_path)
+                if self.checkpoint and job_name:
+                    self.checkpoint.mark_page(job_name, page)
+                    await self.save_checkpoint()
+        except Exception as e:
+            logger.error(f"解析岗位列表响应时出错: {e}")
+            self.metrics.increment('errors')
 
-            body = json.dumps(json_data).encode('utf-8')
+    async def parse_response(self, response: APIResponse, body: bytes) -> dict:
+        """解析接口响应并向限流器报告结果, 响应不是 JSON(如限流时返回的错误页面)时只按 HTTP 状态码报告"""
+        try:
+            with self.metrics.phase('parse'):
+                json_data = await self.run_in_executor(json.loads, body)
+        except Exception:
+            self.rate_limiter.report(response.status)
+            raise
+        self.rate_limiter.report(response.status, json_data.get('code'))
+        return json_data
+
+    async def run_in_executor(self, func, *args):
+        """在工作线程中执行同步函数"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    def track_task(self, coro):
+        """在后台执行任务, 可以通过 wait_pending_tasks 等待完成"""
+        task = asyncio.create_task(coro)
+        self.pending_tasks.add(task)
+        task.add_done_callback(self.pending_tasks.discard)
+
+    async def wait_pending_tasks(self):
+        """等待所有后台任务完成"""
+        while self.pending_tasks:
+            await asyncio.gather(*self.pending_tasks, return_exceptions=True)
+
+    def match_job_list(self, page_job_list: list[JobListItem]):
+        """过滤新接收的岗位列表, 更新匹配的岗位"""
+        if not self.filter_spec:
+            return
+
+        for job in page_job_list:
+            if not self.filter_spec.match_job(job):
+                continue
+            encrypt_job_id = job.get('encryptJobId', '')
+            if encrypt_job_id in self.matched_job_ids:
+                continue
+            self.matched_job_ids.add(encrypt_job_id)
+            self.matched_job_list.append(job)
+
+    async def add_job_detail(self, job_detail: JobDetailItem, job_details: list[JobDetailItem]):
+        """记录岗位详情, 并写入详情缓存"""
+        job_details.append(job_detail)
+        self.detail_job_ids.add(job_detail.get('jobInfo', {}).get('encryptId', ''))
+        self.metrics.increment('job_details')
+        with self.metrics.phase('file_write'):
+            await self.run_in_executor(append_jsonl, [job_detail], job_detail_store_path)
+            if self.detail_cache:
+                await self.run_in_executor(self.detail_cache.put_many, [job_detail])
+        if self.checkpoint:
+            self.checkpoint.add_detail_ids([job_detail.get('jobInfo', {}).get('encryptId', '')])
+            await self.save_checkpoint()
+
+    async def save_checkpoint(self, force: bool = False):
+        """保存搜索进度, force 为 False 时距离上次保存超过 checkpoint_interval 秒才保存"""
+        if not self.checkpoint or not (force or self.checkpoint.is_due()):
+            return
+        try:
+            with self.metrics.phase('file_write'):
+                await self.run_in_executor(self.checkpoint.write, self.checkpoint.to_dict())
+        except Exception as e:
+            logger.error(f"保存断点时出错: {e}")
+            self.metrics.increment('errors')
 
-            await route.fulfill(
-                status=original.status,
-                headers=original.headers,
-                body=body
-            )
+    async def handle_detail_response(self, route: Route, job_details: list[JobDetailItem]):
+        """处理岗位详情响应"""
+        logger.info(f"处理岗位详情响应: {route.request.url}")
+        try:
+            with self.metrics.phase('route_handling'):
+                original = await route.fetch()
+                # 原样返回响应, 页面不需要等待解析完成
+                await route.fulfill(response=original)
         except Exception as e:
             logger.error(f"处理响应时出错: {e}")
+            self.metrics.increment('errors')
             # 出错时继续请求
             await route.continue_()
+            return
 
-    async def scroll_page(self, user_input: UserInput, job_index: int):
-        """滚动页面"""
-        logger.info(f"尝试滚动页面, 目标岗位数量: {user_input['max_size']}")
+        self.track_task(self.ingest_job_detail(original, job_details))
+
+    async def ingest_job_detail(self, response: APIResponse, job_details: list[JobDetailItem]):
+        """解析并记录岗位详情响应"""
+        try:
+            body = await response.body()
+            self.metrics.increment('bytes', len(body))
+            self.metrics.increment('detail_responses')
+            json_data: JobDetailResponse = await self.parse_response(response, body)
+            if json_data.get('code') == 0:
+                await self.add_job_detail(json_data.get('zpData', {}), job_details)
+        except Exception as e:
+            logger.error(f"解析岗位详情响应时出错: {e}")
+            self.metrics.increment('errors')
+
+    async def scroll_page(self, target_size: int):
+        """滚动页面, 直到匹配的岗位数量达到 target_size"""
+        logger.info(f"尝试滚动页面, 目标岗位数量: {target_size}")
 
         if not self.page:
             logger.error("页面未初始化")
             raise Exception("页面未初始化")
 
         last_height = 0
-        while len(filter_job_list(self.job_list, user_input)) < user_input['max_size'] * job_index:
+        while len(self.matched_job_ids) < target_size:
             current_height = await self.page.evaluate("document.body.scrollHeight")
             # 如果高度没有变化，则认为已经滚动到底部
             if current_height == last_height:
                 logger.warning("页面高度没有变化，认为已经滚动到底部")
                 break
             last_height = current_height
-            await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            await self.rate_limiter.acquire()
+            with self.metrics.phase('scroll'):
+                await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
             try:
-                await self.page.wait_for_load_state('networkidle', timeout=10000)
+                with self.metrics.phase('network_idle'):
+                    await self.page.wait_for_load_state('networkidle', timeout=10000)
             except Exception as e:
                 logger.error(f"等待网络空闲时出错: {e}")
-            await asyncio.sleep(random.uniform(1, 2))
+                self.metrics.increment('errors')
+            await self.wait_pending_tasks()
 
-        logger.info(
-            f"共检索到 {len(filter_job_list(self.job_list, user_input))} 个岗位")
+        logger.info(f"共检索到 {len(self.matched_job_ids)} 个岗位")
+
+    def get_pending_jobs(self) -> list[JobListItem]:
+        """获取匹配但还没有获取详情, 也没有被其他标签页认领的岗位"""
+        return [job for job in self.matched_job_list if job.get('encryptJobId') not in self.detail_job_ids]
+
+    async def fetch_job_details(self, jobs: list[JobListItem]) -> list[JobListItem]:
+        """
+        通过浏览器上下文的请求接口直接获取岗位详情, 不需要点击岗位卡片
+
+        :param jobs: 需要获取详情的岗位
+        :return: 获取失败的岗位
+        """
+        if not self.context:
+            raise Exception("上下文未初始化")
+
+        logger.info(f"开始获取岗位详情, 共 {len(jobs)} 个岗位")
+
+        semaphore = asyncio.Semaphore(self.site_config.detail_fetch_concurrency)
+        failed_jobs: list[JobListItem] = []
+        progress = tqdm(total=len(jobs), desc="获取岗位详情 🔎")
+
+        async def fetch(job: JobListItem):
+            async with semaphore:
+                try:
+                    if not self.context:
+                        raise Exception("上下文已关闭")
+                    params = JobDetailQueryParams(
+                        securityId=job['securityId'], lid=job['lid'])
+                    await self.rate_limiter.acquire()
+                    with self.metrics.phase('detail_request'):
+                        response = await self.context.request.get(
+                            self.site_config.urls.job_detail_url,
+                            params=dict(params),
+                            headers={'Referer': self.page.url} if self.page else None)
+                        body = await response.body()
+                    self.metrics.increment('bytes', len(body))
+                    self.metrics.increment('detail_responses')
+                    json_data: JobDetailResponse = await self.parse_response(response, body)
+                    if response.ok and json_data.get('code') == 0:
+                        await self.add_job_detail(json_data.get('zpData', {}), self.job_details)
+                    else:
+                        logger.warning(
+                            f"获取岗位详情失败: {job.get('jobName')}, status: {response.status}, code: {json_data.get('code')}")
+                        failed_jobs.append(job)
+                except Exception as e:
+                    logger.error(f"获取岗位详情时出错: {e}")
+                    self.metrics.increment('errors')
+                    failed_jobs.append(job)
+                finally:
+                    progress.update(1)
+
+        try:
+            await asyncio.gather(*(fetch(job) for job in jobs))
+        finally:
+            progress.close()
+        return failed_jobs
+
+    async def load_cached_job_details(self, jobs: list[JobListItem]) -> list[JobListItem]:
+        """
+        从详情缓存中读取岗位详情
+
+        :param jobs: 需要获取详情的岗位
+        :return: 缓存未命中的岗位
+        """
+        if not self.detail_cache:
+            return jobs
+
+        cached_job_details = await self.run_in_executor(
+            self.detail_cache.get_many, [job.get('encryptJobId', '') for job in jobs])
+        cached_job_detail_list = list(cached_job_details.values())
+        self.job_details.extend(cached_job_detail_list)
+        self.detail_job_ids.update(cached_job_details)
+        await self.run_in_executor(append_jsonl, cached_job_detail_list, job_detail_store_path)
+        if self.checkpoint:
+            self.checkpoint.add_detail_ids(cached_job_details)
+            await self.save_checkpoint()
+        logger.info(f"岗位详情缓存命中 {len(cached_job_details)} 个, 需要获取 {len(jobs) - len(cached_job_details)} 个")
+        return [job for job in jobs if job.get('encryptJobId') not in cached_job_details]
+
+    async def get_all_job_details(self):
+        """获取所有匹配岗位的详情, 优先读取详情缓存, 直接请求失败的岗位再通过点击获取"""
+        pending_jobs = self.get_pending_jobs()
+        # 先认领再获取, 并发的标签页搜索结果重叠时, 同一个岗位只由一个标签页获取
+        self.claimed_job_ids.update(job.get('encryptJobId', '') for job in pending_jobs)
+        self.detail_job_ids.update(self.claimed_job_ids)
+        pending_jobs = await self.load_cached_job_details(pending_jobs)
+        if not pending_jobs:
+            return
+
+        if self.site_config.detail_fetch_mode == 'request':
+            pending_jobs = await self.fetch_job_details(pending_jobs)
+            if not pending_jobs:
+                return
+            logger.warning(f"{len(pending_jobs)} 个岗位详情获取失败, 改为点击获取")
+
+        await self.click_all_jobs({job.get('encryptJobId', '') for job in pending_jobs})
+
+    def release_job_claims(self):
+        """释放认领但没有获取到详情的岗位, 之后的搜索或其他标签页可以重新获取"""
+        fetched_job_ids = {job_detail.get('jobInfo', {}).get('encryptId') for job_detail in self.job_details}
+        self.detail_job_ids.difference_update(self.claimed_job_ids - fetched_job_ids)
+        self.claimed_job_ids.clear()
 
-    async def click_all_jobs(self, filtered_job_list: list[JobListItem]):
-        """点击所有岗位"""
+    async def click_all_jobs(self, encrypt_job_ids: set[str]):
+        """点击指定的岗位, 由 handle_detail_response 拦截详情响应"""
         if not self.page:
             raise Exception("页面未初始化")
 
@@ -205,7 +572,6 @@ class BossSpider:
             logger.warning("没有找到岗位")
             return
 
-        encrypt_job_ids = [job['encryptJobId'] for job in filtered_job_list]
         # 页面默认会加载第一条，所以先点击第二条，再点击第一条，确保能触发详情页的请求
         new_job_list = []
         for job in job_list:
@@ -216,23 +582,27 @@ class BossSpider:
                     new_job_list.append(job)
             except Exception as e:
                 logger.error(f"获取岗位链接时出错: {e}")
+                self.metrics.increment('errors')
                 continue
 
-        if len(new_job_list) < 2:
+        if not new_job_list:
             logger.warning("没有找到岗位")
             return
 
-        new_job_list = [new_job_list[1], new_job_list[0]] + new_job_list[2:]
+        if len(new_job_list) > 1:
+            new_job_list = [new_job_list[1], new_job_list[0]] + new_job_list[2:]
         for job in tqdm(new_job_list, desc="点击岗位详情 🔎"):
             if self.page.is_closed():
                 logger.warning("页面已关闭, 退出")
                 return
             try:
-                await job.click()
-                await self.page.wait_for_load_state('load')
-                await asyncio.sleep(random.uniform(1, 3))
+                await self.rate_limiter.acquire()
+                with self.metrics.phase('click'):
+                    await job.click()
+                    await self.page.wait_for_load_state('load')
             except Exception as e:
                 logger.error(f"点击岗位时出错: {e}")
+                self.metrics.increment('errors')
                 continue
 
     async def wait_for_url_change(self, initial_url: str, timeout: int = 60):
@@ -275,9 +645,10 @@ class BossSpider:
             input_locator = self.page.locator(input_locator)
             if await input_locator.count() > 0:
                 await input_locator.fill(job_name)
-                await input_locator.press('Enter')
-                await self.page.wait_for_load_state('load')
-                await asyncio.sleep(random.uniform(2, 4))
+                await self.rate_limiter.acquire()
+                with self.metrics.phase('search'):
+                    await input_locator.press('Enter')
+                    await self.page.wait_for_load_state('load')
                 return
 
         raise Exception(f"未找到搜索框: {job_name}")
@@ -314,68 +685,171 @@ class BossSpider:
         merged_params = {k: v for k, v in merged_params.items() if v}
         return f'{self.site_config.urls.search_page_url}?{urlencode(merged_params)}'
 
+    async def goto_search_page(self, search_url: str):
+        """打开搜索页"""
+        if not self.page:
+            raise Exception("页面未初始化")
+
+        await self.rate_limiter.acquire()
+        with self.metrics.phase('navigation'):
+            await self.page.goto(search_url)
+            await self.page.wait_for_load_state('load')
+
+    async def register_routes(self):
+        """拦截岗位列表和岗位详情接口"""
+        if not self.page:
+            raise Exception("页面未初始化")
+
+        await self.page.route(f'{self.site_config.urls.job_list_url}**', lambda route: self.handle_joblist_response(route, self.job_list))
+        await self.page.route(f'{self.site_config.urls.job_detail_url}**', lambda route: self.handle_detail_response(route, self.job_details))
+
+    async def crawl_job_name(self, job_name: str, target_size: int):
+        """搜索单个岗位, 滚动获取岗位列表后点击获取岗位详情"""
+        self.current_job_name = job_name
+        # 获取职位列表
+        await self.search_job(job_name)
+        await self.scroll_page(target_size)  # 滚动页面
+        await self.wait_pending_tasks()
+        # 获取所有岗位详情
+        try:
+            await self.get_all_job_details()
+            await self.wait_pending_tasks()
+        finally:
+            self.release_job_claims()
+        if self.checkpoint:
+            self.checkpoint.complete(job_name)
+            await self.save_checkpoint(force=True)
+
+    async def crawl_in_tabs(self, user_input: UserInput, job_names: list[str], search_url: str, concurrency: int):
+        """每个岗位使用独立的标签页并发搜索, 最多同时打开 concurrency 个标签页"""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def crawl(job_name: str):
+            async with semaphore:
+                tab = await self.open_tab()
+                try:
+                    logger.info(f"在新标签页中搜索岗位: {job_name}")
+                    await tab.goto_search_page(search_url)
+                    await tab.register_routes()
+                    await tab.crawl_job_name(job_name, user_input['max_size'])
+                except Exception as e:
+                    logger.error(f"搜索岗位 {job_name} 时出错: {e}")
+                    self.metrics.increment('errors')
+                finally:
+                    if tab.page and not tab.page.is_closed():
+                        await tab.page.close()
+                return tab
+
+        tabs = await asyncio.gather(*(crawl(job_name) for job_name in job_names))
+        for tab in tabs:
+            self.merge_tab(tab)
+
     async def run(self, user_input: UserInput):
         """搜索AI Agent岗位"""
         if not self.page:
             raise Exception("页面未初始化")
 
+        self.filter_spec = FilterSpec.from_user_input(user_input)
+
+        self.checkpoint = CrawlCheckpoint(self.site_config.checkpoint_interval)
+        if self.checkpoint.load(user_input, self.site_config.name):
+            self.restore_checkpoint()
+        else:
+            # 每次运行重新记录岗位数据
+            self.checkpoint.reset(user_input, self.site_config.name)
+            delete_file(job_list_store_path)
+            delete_file(job_detail_store_path)
+
         search_url = self.get_search_url(user_input)
         logger.info(f"搜索URL: {search_url}")
-        await self.page.goto(search_url)
-        await self.page.wait_for_load_state('load')
-        await asyncio.sleep(random.uniform(2, 4))
-
-        await self.page.route(f'{self.site_config.urls.job_list_url}**', lambda route: self.handle_joblist_response(route, self.job_list))
-        await self.page.route(f'{self.site_config.urls.job_detail_url}**', lambda route: self.handle_detail_response(route, self.job_details))
+        await self.goto_search_page(search_url)
+        await self.register_routes()
 
         logger.info("请直接在打开的页面中搜索你想要的岗位信息, 然后点击搜索按钮, 如果想退出, 请直接关闭浏览器")
         await self.detect_login_status(need_goto=False)
         await self.save_auth()
 
-        for job_index, job_name in enumerate(user_input['job_names'], 1):
-            logger.info(f"开始搜索第 {job_index} 个岗位: {job_name}")
-            # 获取职位列表
-            await self.search_job(job_name)
-            await self.scroll_page(user_input, job_index)  # 滚动页面
-            await asyncio.sleep(random.uniform(2, 4))
-            # 点击所有岗位列表
-            await self.click_all_jobs(filter_job_list(self.job_list, user_input))
+        job_names = [job_name for job_name in user_input['job_names']
+                     if not self.checkpoint.is_completed(job_name)]
+        concurrency = min(self.site_config.concurrency, len(job_names))
+        if concurrency > 1:
+            await self.crawl_in_tabs(user_input, job_names, search_url, concurrency)
+        else:
+            for job_index, job_name in enumerate(user_input['job_names'], 1):
+                if self.checkpoint.is_completed(job_name):
+                    logger.info(f"第 {job_index} 个岗位已在上次运行中完成, 跳过: {job_name}")
+                    continue
+                logger.info(f"开始搜索第 {job_index} 个岗位: {job_name}")
+                await self.crawl_job_name(job_name, user_input['max_size'] * job_index)
 
         logger.info(
             f"开始过滤岗位, 过滤前: {len(self.job_list)} 个岗位列表, {len(self.job_details)} 个岗位详情")
-        filtered_jobs = get_unique_job_list(self.job_list)
-        filtered_job_details = get_unique_job_details(self.job_details)
+        # 写入历史岗位数据库, 按岗位ID去重
+        with JobRepository() as repository:
+            repository.upsert_job_list(self.job_list)
+            repository.upsert_job_details(self.job_details)
+            filtered_jobs = repository.get_job_list(
+                [job.get('encryptJobId', '') for job in self.job_list])
+            filtered_job_details = repository.get_job_details(
+                [job_detail.get('jobInfo', {}).get('encryptId', '') for job_detail in self.job_details])
+        # 搜索结果已写入数据库, 下次运行重新开始
+        self.checkpoint.delete()
 
         logger.info(
             f"过滤完成, 共找到 {len(filtered_job_details)} 个岗位详情, {len(filtered_jobs)} 个岗位列表")
         return filtered_jobs, filtered_job_details
 
-    def save_to_json(self, job_list: list[JobListItem], job_detail: list[JobDetailItem]):
-        """保存到JSON"""
-        write_json(job_list, 'data/joblist.json')
-        write_json(job_detail, 'data/jobdetail.json')
-
+    def restore_checkpoint(self):
+        """从断点和已写入的岗位数据文件中恢复搜索进度"""
+        if not self.checkpoint:
+            return
 
-async def search(user_input: UserInput):
+        self.job_list = read_job_store(job_list_store_path)
+        self.match_job_list(self.job_list)
+        self.job_details = [job_detail for job_detail in read_job_store(job_detail_store_path)
+                            if job_detail.get('jobInfo', {}).get('encryptId') in self.checkpoint.detail_ids]
+        self.detail_job_ids = {job_detail['jobInfo']['encryptId'] for job_detail in self.job_details}
+        logger.info(
+            f"从断点继续搜索, 已完成的岗位: {self.checkpoint.completed_job_names}, "
+            f"已获取 {len(self.job_list)} 个岗位列表, {len(self.job_details)} 个岗位详情")
+        for job_name, page in self.checkpoint.restored_pages.items():
+            if not self.checkpoint.is_completed(job_name):
+                # 搜索页只能通过滚动加载, 已获取的分页会重新加载, 但不会重复解析、写入和获取岗位详情
+                logger.info(f"岗位 {job_name} 上次获取到第 {page} 页, 重新加载时跳过这些分页")
+
+    def compact_job_store(self):
+        """压缩岗位数据文件, 去除重复记录"""
+        compact_jsonl(job_list_store_path,
+                      lambda job: job.get('encryptJobId', ''))
+        compact_jsonl(job_detail_store_path,
+                      lambda job_detail: job_detail.get('jobInfo', {}).get('encryptId', ''))
+
+
+async def search(user_input: UserInput, site_name: Literal['ZHIPIN', 'MOCK'] = 'ZHIPIN'):
     """主函数"""
-    site_name = 'ZHIPIN'
     site_config = SiteConfig(site_name)
     spider = BossSpider(site_config)
-    await spider.init_browser()
-    await spider.detect_login_status(need_goto=True)
-    if not spider.has_login():
-        logger.warning("未登录, 最多只能检索 15 个职位, 跳过登录继续执行")
-        confirm = await questionary.confirm("当前未登录, 是否继续搜索(请在页面完成登录，登录后按回车)?", default=True).ask_async()
-        if not confirm:
-            await spider.close_browser()
-            return [], []
-
-    job_list, job_details = await spider.run(user_input=user_input)
-    spider.save_to_json(job_list, job_details)
-    await spider.close_browser()
+    # 诊断结果保存在岗位数据文件所在的目录
+    async with Diagnostics(diagnostics_stall_threshold, diagnostics_profile,
+                           os.path.dirname(job_detail_store_path), spider.metrics):
+        await spider.init_browser()
+        # 复用常驻浏览器中已打开的站点页面时, 不需要重新打开首页
+        await spider.detect_login_status(need_goto=not (spider.page and spider.is_site_url(spider.page.url)))
+        if not spider.has_login():
+            logger.warning("未登录, 最多只能检索 15 个职位, 跳过登录继续执行")
+            confirm = await questionary.confirm("当前未登录, 是否继续搜索(请在页面完成登录，登录后按回车)?", default=True).ask_async()
+            if not confirm:
+                await spider.close_browser()
+                return [], []
+
+        job_list, job_details = await spider.run(user_input=user_input)
+        spider.compact_job_store()
+        await spider.close_browser()
     return job_list, job_details
 
 
 if __name__ == "__main__":
     user_input: UserInput = read_json('data/user_input.json')  # type:ignore
-    asyncio.run(search(user_input))
+    # 传入 MOCK 时使用本地模拟服务, 如: python search_job.py MOCK
+    site_name = sys.argv[1] if len(sys.argv) > 1 else 'ZHIPIN'
+    asyncio.run(search(user_input, site_name))  # type:ignore
@@ -1,7 +1,16 @@
+import os
+import glob
+import logging
+from typing import Iterable, Iterator
+
 from jinja2 import Template
-from util.fs import read_json
+from util.fs import read_job_store, delete_file
+from util.tokens import estimate_tokens
 
 from local_type import JobDetailItem, UserInput
+from config import job_detail_store_path
+
+logger = logging.getLogger(__name__)
 
 single_job_template = Template("""\
 岗位名称: {{ jobInfo.jobName }}
@@ -17,17 +26,79 @@ single_job_template = Template("""\
 {{ jobInfo.postDescription }}
 """)
 
-prompt_template = Template("""
-我是一名面试者，请根据我的职位搜索关键词和岗位描述，帮我分析当前招聘市场情况，并给出面试建议。
+user_info = """\
 职位搜索关键词: {{ user_input.job_names | join(', ') }}
 学历: {{ user_input.degree }}
 工作经验: {{ user_input.experience }}
 期望薪资: {{ user_input.salary }}
 {% if user_input.other_info %}其他补充信息: {{ user_input.other_info }}{% endif %}
+{% if user_input.skills %}技能要求: {{ user_input.skills | join(', ') }}
+{% endif %}\
+"""
+
+prompt_header = """
+我是一名面试者，请根据我的职位搜索关键词和岗位描述，帮我分析当前招聘市场情况，并给出面试建议。
+""" + user_info + """\
 详细岗位列表描述如下:
+"""
+
+prompt_header_template = Template(prompt_header, keep_trailing_newline=True)
+
+prompt_template = Template(prompt_header + """\
 {{ job_description }}
 """)
 
+# 与 prompt_template 的输出一致, 逐个岗位输出, 配合 Template.generate 逐块写入文件
+prompt_stream_template = Template(prompt_header + """\
+{% for job_str in job_strs %}{% if not loop.first %}
+
+{% endif %}<岗位{{ loop.index }}>
+{{ job_str }}
+</岗位{{ loop.index }}>{% endfor %}
+""")
+
+
+market_summary_template = Template("""\
+{% macro salary_table(title, items) %}{% if items %}
+{{ title }}:
+{% for item in items %}- {{ item.group }}: {{ item.p25 }}K / {{ item.p50 }}K / {{ item.p75 }}K ({{ item.count }} 个岗位)
+{% endfor %}{% endif %}{% endmacro %}\
+{% macro distribution(title, items) %}{% if items %}
+{{ title }}: {% for item in items %}{{ item.name }} {{ item.count }}({{ '%.0f' % (item.ratio * 100) }}%){% if not loop.last %}, {% endif %}{% endfor %}
+{% endif %}{% endmacro %}\
+共统计 {{ job_count }} 个岗位, 月薪为薪资范围的中间值, 依次为 25% / 50% / 75% 分位数
+{{ salary_table('整体月薪', salary.all) }}\
+{{ salary_table('岗位名称包含', salary.name_contains) }}\
+{{ salary_table('按城市', salary.city) }}\
+{{ salary_table('按学历', salary.degree) }}\
+{{ salary_table('按公司规模', salary.scale) }}\
+{{ distribution('薪数', salary_months) }}\
+{{ distribution('常见技能', top_skills) }}\
+{{ distribution('融资阶段', stages) }}\
+{{ distribution('招聘者活跃情况', boss_active) }}\
+""")
+
+# 使用市场统计摘要代替岗位详情的提示词
+market_prompt_template = Template("""
+我是一名面试者，请根据我的职位搜索关键词和招聘市场统计数据，帮我分析当前招聘市场情况，并给出面试建议。
+""" + user_info + """\
+招聘市场统计数据如下:
+{{ summary }}""")
+
+
+def get_market_summary(report: dict) -> str:
+    """将 util.market_report 生成的统计报告转换为文字摘要"""
+    return market_summary_template.render(report)
+
+
+def write_market_prompt(summary: str, user_input: UserInput, file_path: str) -> list[str]:
+    """生成使用市场统计摘要的提示词, 同时删除上次生成的分批提示词, 返回提示词文件路径"""
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    delete_prompt_parts(file_path)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(market_prompt_template.render(summary=summary, user_input=user_input))
+    return [file_path]
+
 
 def get_single_job_str(job_detail: JobDetailItem) -> str:
     return single_job_template.render(job_detail)
@@ -47,7 +118,86 @@ def get_prompt(job_details: list[JobDetailItem], user_input: UserInput) -> str:
     return prompt_template.render(job_description=job_description, user_input=user_input)
 
 
+def iter_prompt(job_strs: Iterable[str], user_input: UserInput) -> Iterator[str]:
+    """
+    逐块生成提示词, 内容与 get_prompt 一致, 不会在内存中拼接完整的提示词
+
+    :param job_strs: 单个岗位的描述(get_single_job_str 的结果), 可以是生成器, 生成到哪个岗位提示词就到哪个岗位结束
+    :param user_input: 用户输入
+    """
+    return prompt_stream_template.generate(job_strs=job_strs, user_input=user_input)
+
+
+def get_prompt_part_path(file_path: str, part: int) -> str:
+    """分批提示词的文件路径, 如 data/prompt.txt 的第 2 部分为 data/prompt_2.txt"""
+    root, ext = os.path.splitext(file_path)
+    return f'{root}_{part}{ext}'
+
+
+def delete_prompt_parts(file_path: str):
+    """删除上次生成的分批提示词"""
+    root, ext = os.path.splitext(file_path)
+    for part_path in glob.glob(f'{glob.escape(root)}_*{glob.escape(ext)}'):
+        if part_path[len(root) + 1:len(part_path) - len(ext)].isdigit():
+            delete_file(part_path)
+
+
+def write_prompts(job_details: Iterable[JobDetailItem], user_input: UserInput, file_path: str,
+                  max_tokens: int) -> list[str]:
+    """
+    按 token 预算生成提示词, 超出预算时拆分为多个提示词文件
+
+    每个提示词文件都包含完整的用户信息, 岗位从 1 开始重新编号.
+    所有岗位都能放入一个提示词时只生成 file_path, 内容与 get_prompt 一致;
+    否则生成 data/prompt_1.txt, data/prompt_2.txt ... 单个岗位超出预算时单独放入一个文件.
+    每个文件通过 iter_prompt 逐块写入, 内存中只保留当前岗位.
+
+    :param job_details: 岗位详情, 可以是生成器
+    :param user_input: 用户输入
+    :param file_path: 提示词文件路径
+    :param max_tokens: 每个提示词的最大 token 数
+    :return: 生成的提示词文件路径
+    """
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    delete_prompt_parts(file_path)
+
+    header_tokens = estimate_tokens(prompt_header_template.render(user_input=user_input))
+    jobs = ((job_detail, get_single_job_str(job_detail)) for job_detail in job_details)
+    # 下一个还没有写入的岗位, 当前提示词放不下时留给下一个提示词
+    pending = next(jobs, None)
+
+    def take_part() -> Iterator[str]:
+        """生成当前提示词能放下的岗位, 第一个岗位总是放入"""
+        nonlocal pending
+        tokens, index = header_tokens, 0
+        while pending is not None:
+            job_detail, job_str = pending
+            index += 1
+            job_tokens = estimate_tokens(job_str) + estimate_tokens(f'\n\n<岗位{index}>\n\n</岗位{index}>')
+            if index > 1 and tokens + job_tokens > max_tokens:
+                return
+            tokens += job_tokens
+            if index == 1 and tokens > max_tokens:
+                logger.warning(f"单个岗位超出 token 预算: {job_detail['jobInfo']['jobName']}, 约 {tokens} tokens")
+            yield job_str
+            pending = next(jobs, None)
+
+    file_paths: list[str] = []
+    while not file_paths or pending is not None:
+        file_paths.append(get_prompt_part_path(file_path, len(file_paths) + 1))
+        with open(file_paths[-1], 'w', encoding='utf-8') as f:
+            for chunk in iter_prompt(take_part(), user_input):
+                f.write(chunk)
+
+    if len(file_paths) == 1:
+        os.replace(file_paths[0], file_path)
+        return [file_path]
+
+    delete_file(file_path)
+    return file_paths
+
+
 if __name__ == "__main__":
-    job_details = read_json('./data/jobdetail.json', [])
+    job_details = read_job_store(job_detail_store_path)
     # print(get_single_job_str(job_detail[0]))
     print(get_multi_job_str(job_details[0:2]))
@@ -0,0 +1,119 @@
+"""
+爬虫断点记录
+
+记录已完成的搜索关键词、每个关键词最后获取的分页和已获取详情的岗位ID,
+浏览器崩溃或页面关闭后重新运行相同的搜索条件时, 从断点继续搜索.
+岗位数据本身已经实时追加写入 JSONL 文件, 断点只记录进度.
+搜索页只能通过滚动加载, 继续搜索时已获取的分页仍会重新请求, 但不会再解析和写入, 岗位从 JSONL 文件中恢复.
+"""
+
+import os
+import json
+import time
+import logging
+
+from config import checkpoint_path
+from local_type import UserInput
+from util.fs import delete_file, read_json
+
+logger = logging.getLogger(__name__)
+
+# 影响搜索结果的用户输入, 任意一项变化时不能从断点继续
+CHECKPOINT_KEYS = ('degree', 'salary', 'experience', 'max_size', 'job_names', 'city')
+
+
+def get_checkpoint_key(user_input: UserInput, site_name: str) -> str:
+    return json.dumps([site_name] + [user_input.get(key) for key in CHECKPOINT_KEYS], ensure_ascii=False)
+
+
+class CrawlCheckpoint:
+    def __init__(self, interval: float, file_path: str = checkpoint_path):
+        """
+        :param interval: 两次保存的最小间隔(秒), 关键词完成时总是保存
+        :param file_path: 断点文件路径
+        """
+        self.interval = interval
+        self.file_path = file_path
+        self.key = ''
+        self.completed_job_names: list[str] = []
+        # 岗位名称 -> 从第 1 页开始连续写入的最后一页
+        self.pages: dict[str, int] = {}
+        # 读取断点时的 pages, 这些分页的岗位已在上次运行中写入
+        self.restored_pages: dict[str, int] = {}
+        self.detail_ids: set[str] = set()
+        # 上次保存的 time.monotonic(), 未保存时为 None, monotonic 从系统启动开始计时, 不能用 0 表示未保存
+        self.saved_at: float | None = None
+
+    def load(self, user_input: UserInput, site_name: str) -> bool:
+        """读取断点, 只有搜索条件相同时才能继续, 返回是否读取成功"""
+        key = get_checkpoint_key(user_input, site_name)
+        try:
+            data = read_json(self.file_path, {})
+        except json.JSONDecodeError:
+            logger.warning(f"断点文件已损坏, 重新开始搜索: {self.file_path}")
+            return False
+
+        if not data or data.get('key') != key:
+            return False
+
+        self.key = key
+        self.completed_job_names = data.get('completed_job_names', [])
+        self.pages = data.get('pages', {})
+        self.restored_pages = dict(self.pages)
+        self.detail_ids = set(data.get('detail_ids', []))
+        return True
+
+    def reset(self, user_input: UserInput, site_name: str):
+        """开始新的搜索, 清空进度"""
+        self.key = get_checkpoint_key(user_input, site_name)
+        self.completed_job_names = []
+        self.pages = {}
+        self.restored_pages = {}
+        self.detail_ids = set()
+        self.saved_at = None
+
+    def is_completed(self, job_name: str) -> bool:
+        return job_name in self.completed_job_names
+
+    def complete(self, job_name: str):
+        if job_name not in self.completed_job_names:
+            self.completed_job_names.append(job_name)
+
+    def mark_page(self, job_name: str, page: int):
+        """记录已写入的分页, 只在与已记录的分页连续时前进, 中间的分页写入失败时后面的分页不会视为已写入"""
+        if page == self.pages.get(job_name, 0) + 1:
+            self.pages[job_name] = page
+
+    def is_restored_page(self, job_name: str, page: int) -> bool:
+        """该分页的岗位是否已在上次运行中写入"""
+        return page <= self.restored_pages.get(job_name, 0)
+
+    def add_detail_ids(self, encrypt_ids):
+        self.detail_ids.update(encrypt_ids)
+
+    def is_due(self) -> bool:
+        """距离上次保存是否超过 interval 秒"""
+        return self.saved_at is None or time.monotonic() - self.saved_at >= self.interval
+
+    def to_dict(self) -> dict:
+        """生成断点数据的快照, 可以在其他线程中写入文件"""
+        self.saved_at = time.monotonic()
+        return {
+            'key': self.key,
+            'completed_job_names': list(self.completed_job_names),
+            'pages': dict(self.pages),
+            'detail_ids': sorted(self.detail_ids),
+            'updated_at': time.time(),
+        }
+
+    def write(self, data: dict):
+        """先写入临时文件再替换, 避免写入过程中断导致断点文件损坏"""
+        if os.path.dirname(self.file_path):
+            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        tmp_file_path = f'{self.file_path}.tmp'
+        with open(tmp_file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_file_path, self.file_path)
+
+    def delete(self):
+        delete_file(self.file_path)
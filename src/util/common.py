@@ -1,4 +1,6 @@
 import re
+from dataclasses import dataclass
+from functools import lru_cache
 
 from local_type import JobDetailItem, JobListItem, UserInput
 from config import degree_map, job_ignore_names, salary_map
@@ -33,6 +35,32 @@ def get_digit_by_pattern(s: str):
     return 0
 
 
+@lru_cache(maxsize=4096)
+def parse_salary_range(salary_desc_str: str) -> tuple[int, int] | None:
+    """解析薪资范围, 如 40-70K·16薪 解析为 (40, 70), 无法解析时返回 None"""
+    salary_range = salary_desc_str.split('-')
+    if len(salary_range) != 2:
+        return None
+
+    try:
+        return get_digit_from_str(salary_range[0]), get_digit_by_pattern(salary_range[1])
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def parse_experience_min(experience_name: str) -> int | None:
+    """解析最低经验要求, 如 3-5年 解析为 3, 无法解析时返回 None"""
+    experience_range = experience_name.split('-')
+    if len(experience_range) != 2:
+        return None
+
+    try:
+        return get_digit_from_str(experience_range[0])
+    except ValueError:
+        return None
+
+
 def does_salary_match(salary_desc_str: str, user_salary: str):
     if not salary_desc_str:
         return True
@@ -80,6 +108,87 @@ def does_job_name_match(job_name: str, ignore_words: list[str]):
     return True
 
 
+@dataclass(frozen=True)
+class FilterSpec:
+    """
+    根据用户输入预先解析的过滤条件
+
+    用户的学历、薪资、经验只解析一次, 岗位的薪资和经验描述通过缓存解析,
+    过滤规则与 does_*_match 系列函数一致
+    """
+    degrees: frozenset[str]
+    salary_min: int | None
+    experience: str
+    experience_min: int | None
+    ignore_words: tuple[str, ...]
+    ignore_pattern: re.Pattern | None
+
+    @classmethod
+    def from_user_input(cls, user_input: UserInput, ignore_words: list[str] = job_ignore_names):
+        try:
+            salary_min = get_digit_from_str(user_input['salary'].split('-')[0])
+        except ValueError:
+            salary_min = None
+
+        experience = user_input['experience']
+        try:
+            experience_min = get_digit_from_str(experience.split('-')[0])
+        except ValueError:
+            experience_min = None
+
+        ignore_pattern = re.compile(
+            '|'.join(map(re.escape, ignore_words))) if ignore_words else None
+
+        return cls(
+            degrees=frozenset(degree_map[user_input['degree']]),
+            salary_min=salary_min,
+            experience=experience,
+            experience_min=experience_min,
+            ignore_words=tuple(ignore_words),
+            ignore_pattern=ignore_pattern,
+        )
+
+    def match_degree(self, degree_name: str):
+        return not degree_name or degree_name in self.degrees
+
+    def match_salary(self, salary_desc: str):
+        if not salary_desc:
+            return True
+        if '天' in salary_desc:
+            return False
+
+        salary_range = parse_salary_range(salary_desc)
+        if not salary_range or self.salary_min is None:
+            return True
+        return salary_range[0] <= self.salary_min <= salary_range[1]
+
+    def match_experience(self, experience_name: str):
+        if not experience_name or experience_name == self.experience:
+            return True
+
+        min_experience = parse_experience_min(experience_name)
+        if min_experience is None or self.experience_min is None:
+            return False
+        return min_experience <= self.experience_min
+
+    def match_job_name(self, job_name: str):
+        return not job_name or not self.ignore_pattern or not self.ignore_pattern.search(job_name)
+
+    def match(self, degree_name: str, salary_desc: str, experience_name: str, job_name: str):
+        return (self.match_degree(degree_name)
+                and self.match_salary(salary_desc)
+                and self.match_experience(experience_name)
+                and self.match_job_name(job_name))
+
+    def match_job(self, job: JobListItem):
+        return self.match(job['jobDegree'], job['salaryDesc'], job['jobExperience'], job['jobName'])
+
+    def match_job_detail(self, job_detail: JobDetailItem):
+        job_info = job_detail['jobInfo']
+        return self.match(job_info['degreeName'], job_info['salaryDesc'],
+                          job_info['experienceName'], job_info['jobName'])
+
+
 def filter_job_list(job_list: list[JobListItem], user_input: UserInput):
     if not job_list:
         return []
@@ -87,26 +196,8 @@ def filter_job_list(job_list: list[JobListItem], user_input: UserInput):
     if not user_input:
         return job_list
 
-    filtered_job_list = []
-    degree, salary, experience = user_input['degree'], user_input['salary'], user_input['experience']
-    for job in job_list:
-        degree_name = job['jobDegree']
-        salary_desc = job['salaryDesc']
-        experience_name = job['jobExperience']
-        job_name = job['jobName']
-
-        if not does_degree_match(degree_name, degree):
-            continue
-        if not does_salary_match(salary_desc, salary):
-            continue
-        if not does_experience_match(experience_name, experience):
-            continue
-        if not does_job_name_match(job_name, job_ignore_names):
-            continue
-
-        filtered_job_list.append(job)
-
-    return filtered_job_list
+    filter_spec = FilterSpec.from_user_input(user_input)
+    return [job for job in job_list if filter_spec.match_job(job)]
 
 
 def filter_job_details(job_details: list[JobDetailItem], user_input: UserInput):
@@ -116,27 +207,8 @@ def filter_job_details(job_details: list[JobDetailItem], user_input: UserInput):
     if not user_input:
         return job_details
 
-    filtered_job_details = []
-    degree, salary, experience = user_input['degree'], user_input['salary'], user_input['experience']
-    for job_detail in job_details:
-        job_info = job_detail['jobInfo']
-        degree_name = job_info['degreeName']
-        salary_desc = job_info['salaryDesc']
-        experience_name = job_info['experienceName']
-        job_name = job_info['jobName']
-
-        if not does_degree_match(degree_name, degree):
-            continue
-        if not does_salary_match(salary_desc, salary):
-            continue
-        if not does_experience_match(experience_name, experience):
-            continue
-        if not does_job_name_match(job_name, job_ignore_names):
-            continue
-
-        filtered_job_details.append(job_detail)
-
-    return filtered_job_details
+    filter_spec = FilterSpec.from_user_input(user_input)
+    return [job_detail for job_detail in job_details if filter_spec.match_job_detail(job_detail)]
 
 
 def get_unique_job_list(job_list: list[JobListItem]):
@@ -180,6 +252,7 @@ def get_query_params(query_params_map: dict, user_input: UserInput) -> dict:
         'salary': list[int],
         'experience': list[int],
         'degree': list[int],
+        'city': str,
     }
     :param query_params_map: 查询参数映射
     :param user_input: 用户输入
@@ -224,6 +297,7 @@ def get_query_params(query_params_map: dict, user_input: UserInput) -> dict:
         ('salary', salary_ids),
         ('experience', experience_ids),
         ('degree', degree_ids),
+        ('city', [user_input['city']] if user_input.get('city') else []),
     ]
 
     return {
@@ -0,0 +1,139 @@
+"""
+岗位详情缓存(SQLite)
+
+按岗位ID缓存已获取的岗位详情, 超过 ttl 秒的记录视为过期,
+记录数超过 max_size 时淘汰最久未使用的记录.
+过期记录在打开缓存时统一删除, 查询时也不会返回; 写入时只在超出容量时删除超出的记录, 不扫描整个表.
+重复运行相同关键词时, 缓存命中的岗位不需要重新请求详情.
+"""
+
+import os
+import json
+import time
+import sqlite3
+
+from config import detail_cache_path
+from local_type import JobDetailItem
+
+# SQLite 单条语句的参数数量有限, 按批次查询
+QUERY_BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS detail_cache (
+    encrypt_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_detail_cache_fetched_at ON detail_cache (fetched_at);
+CREATE INDEX IF NOT EXISTS idx_detail_cache_accessed_at ON detail_cache (accessed_at);
+"""
+
+
+class DetailCache:
+    def __init__(self, ttl: float, max_size: int, db_path: str = detail_cache_path):
+        """
+        :param ttl: 缓存有效期(秒)
+        :param max_size: 最多缓存的岗位详情数量
+        :param db_path: 缓存文件路径
+        """
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.ttl = ttl
+        self.max_size = max_size
+        self.db_path = db_path
+        # 缓存只在爬虫的工作线程中读写, 但连接在主线程中创建
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        self.hits = 0
+        self.misses = 0
+        # 当前记录数, 写入时增量更新, 避免每次写入都统计整个表
+        self.size = 0
+        self.evict()
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def get_many(self, encrypt_ids: list[str]) -> dict[str, JobDetailItem]:
+        """
+        查询未过期的岗位详情, 并更新访问时间
+
+        :param encrypt_ids: 岗位ID
+        :return: 岗位ID -> 岗位详情, 只包含命中的岗位
+        """
+        now = time.time()
+        data_map: dict[str, str] = {}
+        for start in range(0, len(encrypt_ids), QUERY_BATCH_SIZE):
+            batch_ids = encrypt_ids[start:start + QUERY_BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch_ids))
+            rows = self.connection.execute(
+                f'SELECT encrypt_id, data FROM detail_cache WHERE encrypt_id IN ({placeholders}) AND fetched_at >= ?',
+                [*batch_ids, now - self.ttl])
+            data_map.update(rows)
+
+        if data_map:
+            with self.connection:
+                self.connection.executemany(
+                    'UPDATE detail_cache SET accessed_at = ? WHERE encrypt_id = ?',
+                    [(now, encrypt_id) for encrypt_id in data_map])
+
+        self.hits += len(data_map)
+        self.misses += len(set(encrypt_ids)) - len(data_map)
+        return {encrypt_id: json.loads(data) for encrypt_id, data in data_map.items()}
+
+    def put_many(self, job_details: list[JobDetailItem]):
+        """写入岗位详情, 已存在的岗位更新为最新数据, 超出容量时淘汰最久未使用的数据"""
+        now = time.time()
+        # 重复的岗位以最后一个为准
+        rows = list({job_detail['jobInfo']['encryptId']: (
+            job_detail['jobInfo']['encryptId'], json.dumps(job_detail, ensure_ascii=False), now, now)
+            for job_detail in job_details if job_detail.get('jobInfo', {}).get('encryptId')}.values())
+        if not rows:
+            return
+
+        with self.connection:
+            existing = 0
+            for start in range(0, len(rows), QUERY_BATCH_SIZE):
+                batch_ids = [row[0] for row in rows[start:start + QUERY_BATCH_SIZE]]
+                existing += self.connection.execute(
+                    f"SELECT COUNT(*) FROM detail_cache WHERE encrypt_id IN ({','.join('?' * len(batch_ids))})",
+                    batch_ids).fetchone()[0]
+            self.connection.executemany("""
+                INSERT INTO detail_cache (encrypt_id, data, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (encrypt_id) DO UPDATE SET
+                    data = excluded.data,
+                    fetched_at = excluded.fetched_at,
+                    accessed_at = excluded.accessed_at
+            """, rows)
+        self.size += len(rows) - existing
+        self.evict_least_recent()
+
+    def evict(self):
+        """删除过期的记录, 记录数超过 max_size 时删除最久未使用的记录, 在打开缓存时执行一次"""
+        with self.connection:
+            self.connection.execute(
+                'DELETE FROM detail_cache WHERE fetched_at < ?', (time.time() - self.ttl,))
+        self.size = self.count()
+        self.evict_least_recent()
+
+    def evict_least_recent(self):
+        """记录数超过 max_size 时删除最久未使用的记录, 按访问时间索引只读取需要删除的记录"""
+        if self.size <= self.max_size:
+            return
+        with self.connection:
+            self.connection.execute("""
+                DELETE FROM detail_cache WHERE encrypt_id IN (
+                    SELECT encrypt_id FROM detail_cache ORDER BY accessed_at LIMIT ?
+                )
+            """, (self.size - self.max_size,))
+        self.size = self.max_size
+
+    def count(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM detail_cache').fetchone()[0]
@@ -0,0 +1,170 @@
+"""
+事件循环诊断
+
+爬虫在事件循环中执行拦截回调、过滤岗位等同步代码, 页面卡顿时需要区分是网站慢还是回调阻塞了事件循环.
+- LoopStallDetector: 事件循环中的任务定时更新心跳, 后台线程发现心跳超过 threshold 秒未更新时,
+  记录事件循环线程当前的调用栈; 同时开启 asyncio 调试模式, 记录执行时间超过 threshold 的回调
+- SamplingProfiler: 后台线程定时采样事件循环线程的调用栈, 输出 collapsed stack 格式,
+  可以用 speedscope 或 flamegraph.pl 生成火焰图
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from collections import Counter
+from datetime import datetime
+
+from util.metrics import RunMetrics
+
+logger = logging.getLogger(__name__)
+
+
+class LoopStallDetector:
+    def __init__(self, threshold: float, thread_id: int, metrics: RunMetrics | None = None):
+        """
+        :param threshold: 事件循环阻塞超过该秒数时记录调用栈
+        :param thread_id: 事件循环所在线程的 ID
+        :param metrics: 记录阻塞次数和最大延迟的运行指标
+        """
+        self.threshold = threshold
+        self.interval = threshold / 4
+        self.thread_id = thread_id
+        self.metrics = metrics
+        self.heartbeat = time.monotonic()
+        self.reported_heartbeat = 0.0
+        self.stalls = 0
+        self.max_lag = 0.0
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.watch, name='loop-stall-detector', daemon=True)
+
+    async def beat(self):
+        """在事件循环中定时更新心跳, 并统计实际唤醒时间与预期的差值"""
+        while True:
+            self.heartbeat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = time.monotonic() - self.heartbeat - self.interval
+            self.max_lag = max(self.max_lag, lag)
+
+    def watch(self):
+        """后台线程, 心跳超时时记录事件循环线程的调用栈, 每次阻塞只记录一次"""
+        while not self.stop_event.wait(self.interval):
+            heartbeat = self.heartbeat
+            lag = time.monotonic() - heartbeat
+            if lag < self.threshold or heartbeat == self.reported_heartbeat:
+                continue
+
+            self.reported_heartbeat = heartbeat
+            self.stalls += 1
+            if self.metrics:
+                self.metrics.increment('event_loop_stalls')
+            frame = sys._current_frames().get(self.thread_id)
+            stack = ''.join(traceback.format_stack(frame)) if frame else ''
+            logger.warning(f"事件循环已阻塞 {lag * 1000:.0f}ms, 当前调用栈:\n{stack}")
+
+
+class SamplingProfiler:
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        """
+        :param thread_id: 采样的线程 ID
+        :param interval: 采样间隔(秒)
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.sample, name='sampling-profiler', daemon=True)
+
+    def sample(self):
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def get_top_functions(self, count: int = 10) -> list[tuple[str, int]]:
+        """按采样次数(函数自身, 不包含调用的函数)排序的函数"""
+        functions: Counter[str] = Counter()
+        for stack, samples in self.samples.items():
+            functions[stack.rsplit(';', 1)[-1]] += samples
+        return functions.most_common(count)
+
+    def write(self, file_path: str):
+        """按 collapsed stack 格式写入采样结果, 每行为 调用栈 次数"""
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.writelines(f'{stack} {samples}\n' for stack, samples in self.samples.most_common())
+
+
+class Diagnostics:
+    """
+    在 async with 代码块中开启诊断, 退出时输出结果
+
+        async with Diagnostics(stall_threshold=0.1, profile=True, output_dir='data'):
+            await spider.run(user_input)
+    """
+
+    def __init__(self, stall_threshold: float = 0, profile: bool = False, output_dir: str = 'data',
+                 metrics: RunMetrics | None = None):
+        """
+        :param stall_threshold: 事件循环阻塞检测的阈值(秒), 0 表示不检测
+        :param profile: 是否开启采样分析
+        :param output_dir: 采样结果目录
+        :param metrics: 记录阻塞次数的运行指标
+        """
+        self.stall_threshold = stall_threshold
+        self.profile = profile
+        self.output_dir = output_dir
+        self.metrics = metrics
+        self.detector: LoopStallDetector | None = None
+        self.profiler: SamplingProfiler | None = None
+        self.beat_task: asyncio.Task | None = None
+        self.loop_debug = False
+        self.slow_callback_duration = 0.1
+
+    async def __aenter__(self):
+        loop = asyncio.get_running_loop()
+        thread_id = threading.get_ident()
+
+        if self.stall_threshold > 0:
+            self.loop_debug = loop.get_debug()
+            self.slow_callback_duration = loop.slow_callback_duration
+            loop.set_debug(True)
+            loop.slow_callback_duration = self.stall_threshold
+            self.detector = LoopStallDetector(self.stall_threshold, thread_id, self.metrics)
+            self.detector.thread.start()
+            self.beat_task = asyncio.create_task(self.detector.beat())
+            logger.info(f"已开启事件循环阻塞检测, 阈值 {self.stall_threshold * 1000:.0f}ms")
+
+        if self.profile:
+            self.profiler = SamplingProfiler(thread_id)
+            self.profiler.thread.start()
+            logger.info("已开启采样分析")
+        return self
+
+    async def __aexit__(self, *args):
+        if self.detector and self.beat_task:
+            self.beat_task.cancel()
+            self.detector.stop_event.set()
+            self.detector.thread.join()
+            loop = asyncio.get_running_loop()
+            loop.set_debug(self.loop_debug)
+            loop.slow_callback_duration = self.slow_callback_duration
+            logger.info(
+                f"事件循环阻塞 {self.detector.stalls} 次, 最大延迟 {self.detector.max_lag * 1000:.0f}ms")
+
+        if self.profiler:
+            self.profiler.stop_event.set()
+            self.profiler.thread.join()
+            file_path = os.path.join(
+                self.output_dir, f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}.folded")
+            self.profiler.write(file_path)
+            top_functions = '\n'.join(f'  {samples:>6} {name}' for name, samples in self.profiler.get_top_functions())
+            logger.info(f"采样结果已保存到 {file_path}, 采样最多的函数:\n{top_functions}")
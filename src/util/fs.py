@@ -16,6 +16,77 @@ def read_json(file_path: str, default_value=None):
         return json.load(f)
 
 
+def append_jsonl(records: list, file_path: str):
+    """追加写入 JSONL, 每条记录占一行, 只写入本次新增的数据"""
+    if not records:
+        return
+
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    lines = [json.dumps(record, ensure_ascii=False) + '\n' for record in records]
+    with open(file_path, 'a', encoding='utf-8') as f:
+        f.writelines(lines)
+
+
+def read_jsonl(file_path: str) -> list:
+    """读取 JSONL, 忽略空行和写入中断产生的残缺行"""
+    if not exists_file(file_path):
+        return []
+
+    records = []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def compact_jsonl(file_path: str, get_key) -> list:
+    """
+    压缩 JSONL, 按 get_key 去重, 保留第一次出现的记录
+
+    先写入临时文件再替换, 避免压缩过程中断导致数据丢失
+    :param file_path: JSONL 文件路径
+    :param get_key: 根据记录获取去重键的函数
+    :return: 去重后的记录
+    """
+    records = []
+    keys = set()
+    for record in read_jsonl(file_path):
+        key = get_key(record)
+        if key in keys:
+            continue
+        keys.add(key)
+        records.append(record)
+
+    if not exists_file(file_path):
+        return records
+
+    tmp_file_path = f'{file_path}.tmp'
+    with open(tmp_file_path, 'w', encoding='utf-8') as f:
+        f.writelines(json.dumps(record, ensure_ascii=False) +
+                     '\n' for record in records)
+    os.replace(tmp_file_path, file_path)
+    return records
+
+
+def read_job_store(file_path: str) -> list:
+    """
+    读取岗位数据, 优先读取 JSONL, 不存在时兼容读取同名的 JSON 文件
+
+    :param file_path: JSONL 文件路径, 如 data/jobdetail.jsonl
+    """
+    if exists_file(file_path):
+        return read_jsonl(file_path)
+
+    json_file_path = os.path.splitext(file_path)[0] + '.json'
+    return read_json(json_file_path, [])
+
+
 def write_text(text: str, file_path: str):
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
     with open(file_path, 'w', encoding='utf-8') as f:
@@ -0,0 +1,167 @@
+"""
+岗位全文索引(SQLite FTS5)
+
+对岗位名称、岗位描述(postDescription)和公司介绍(brandComInfo.introduce)建立全文索引, 查询结果按 BM25 排序.
+FTS5 自带的分词器不能切分中文, 写入前先分词: 连续的中文按相邻两个字切分(如 大模型 -> 大模 模型),
+英文和数字按单词切分(保留 C++、C#、Node.js 等写法), 再以空格连接后交给 FTS5 索引.
+查询时按同样的规则分词, 中文关键词作为短语查询, 即要求这些两字词在岗位中连续出现.
+
+索引的 rowid 与 job_detail 表的 rowid 一致, 与历史岗位数据库保存在同一个文件中,
+由 JobRepository 在写入岗位详情时同步更新. 索引不保存分词后的文本(contentless), 数据库体积更小,
+但删除旧索引时需要提供原来的内容: 更新 job_detail 前先按旧的岗位详情重新分词并删除索引.
+
+运行方式(在 src 目录下):
+    python -m util.full_text "大模型 RAG" --limit 20
+"""
+
+import re
+import json
+import sqlite3
+import unicodedata
+from typing import Iterable
+
+from local_type import JobDetailItem
+
+# SQLite 单条语句的参数数量有限, 按批次查询
+QUERY_BATCH_SIZE = 500
+
+# 分词后的文本只包含空格分隔的词, 这些符号作为词的一部分
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS job_fts USING fts5(
+    job_name, description, introduce,
+    content = '',
+    tokenize = "unicode61 tokenchars '+#.-'"
+);
+"""
+
+# 排序权重, 依次为 岗位名称、岗位描述、公司介绍
+RANK_WEIGHTS = (5.0, 1.0, 0.5)
+
+# 英文和数字单词(如 c++、node.js、gpt-4), 或连续的中文
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+(?:[.\-][a-z0-9]+)*[+#]*|[\u3400-\u9fff\uf900-\ufaff]+')
+# 中文字符的起始编码, 用于区分中文和英文单词
+CJK_START = '\u3400'
+
+
+def tokenize(text: str) -> list[str]:
+    """分词, 英文统一为小写, 连续的中文按相邻两个字切分, 单个中文字保留为一个词"""
+    tokens = []
+    for word in TOKEN_PATTERN.findall(unicodedata.normalize('NFKC', text or '').lower()):
+        if word[0] < CJK_START or len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def get_match_query(query: str, match_all: bool = True) -> str:
+    """
+    将查询关键词转换为 FTS5 查询语句
+
+    :param query: 空格分隔的关键词, 如 大模型 RAG
+    :param match_all: True 时岗位需要包含所有关键词, 否则包含任意一个即可
+    :return: FTS5 查询语句, 没有有效关键词时为空字符串
+    """
+    phrases = []
+    for keyword in query.split():
+        tokens = tokenize(keyword)
+        if not tokens:
+            continue
+        phrase = '"' + ' '.join(token.replace('"', '""') for token in tokens) + '"'
+        # 单个中文字没有对应的两字词, 按前缀匹配以该字开头的词
+        if len(tokens) == 1 and len(tokens[0]) == 1 and tokens[0] >= CJK_START:
+            phrase += '*'
+        phrases.append(phrase)
+    return f" {'AND' if match_all else 'OR'} ".join(phrases)
+
+
+def get_job_text(job_detail: JobDetailItem) -> tuple[str, str, str]:
+    """分词后的 岗位名称、岗位描述、公司介绍"""
+    job_info = job_detail.get('jobInfo') or {}
+    brand_com_info = job_detail.get('brandComInfo') or {}
+    return (
+        ' '.join(tokenize(job_info.get('jobName'))),
+        ' '.join(tokenize(job_info.get('postDescription'))),
+        ' '.join(tokenize(brand_com_info.get('introduce'))),
+    )
+
+
+class FullTextIndex:
+    def __init__(self, connection: sqlite3.Connection):
+        """
+        :param connection: 历史岗位数据库的连接, 写入操作在调用方的事务中执行
+        """
+        self.connection = connection
+        self.connection.executescript(SCHEMA)
+        # 保存到索引配置中, ORDER BY rank 时按权重计算 BM25
+        with self.connection:
+            self.connection.execute("INSERT INTO job_fts (job_fts, rank) VALUES ('rank', ?)",
+                                    (f'bm25({", ".join(map(str, RANK_WEIGHTS))})',))
+
+    def get_job_detail_rows(self, job_details: Iterable[JobDetailItem]) -> list[tuple[int, str, str]]:
+        """查询岗位详情在 job_detail 表中的 (rowid, 岗位ID, 数据)"""
+        encrypt_ids = list(dict.fromkeys(job_detail['jobInfo']['encryptId'] for job_detail in job_details
+                                         if job_detail.get('jobInfo', {}).get('encryptId')))
+        rows = []
+        for start in range(0, len(encrypt_ids), QUERY_BATCH_SIZE):
+            batch_ids = encrypt_ids[start:start + QUERY_BATCH_SIZE]
+            rows += self.connection.execute(
+                f"SELECT rowid, encrypt_id, data FROM job_detail WHERE encrypt_id IN ({','.join('?' * len(batch_ids))})",
+                batch_ids).fetchall()
+        return rows
+
+    def remove_job_details(self, job_details: Iterable[JobDetailItem]):
+        """删除岗位的索引, 需要在更新 job_detail 表之前调用, 按表中原来的岗位详情分词"""
+        self.connection.executemany(
+            "INSERT INTO job_fts (job_fts, rowid, job_name, description, introduce) VALUES ('delete', ?, ?, ?, ?)",
+            [(rowid, *get_job_text(json.loads(data))) for rowid, _, data in self.get_job_detail_rows(job_details)])
+
+    def add_job_details(self, job_details: Iterable[JobDetailItem]):
+        """写入岗位的索引, 需要在写入 job_detail 表之后调用, 岗位的旧索引需要先通过 remove_job_details 删除"""
+        # 与 job_detail 表一致, 重复的岗位以最后一个为准
+        job_detail_map = {job_detail['jobInfo']['encryptId']: job_detail
+                          for job_detail in job_details if job_detail.get('jobInfo', {}).get('encryptId')}
+        self.connection.executemany(
+            'INSERT INTO job_fts (rowid, job_name, description, introduce) VALUES (?, ?, ?, ?)',
+            [(rowid, *get_job_text(job_detail_map[encrypt_id]))
+             for rowid, encrypt_id, _ in self.get_job_detail_rows(job_detail_map.values())])
+
+    def clear(self):
+        self.connection.execute("INSERT INTO job_fts (job_fts) VALUES ('delete-all')")
+
+    def search(self, query: str, limit: int = 20, match_all: bool = True) -> list[tuple[JobDetailItem, float]]:
+        """
+        按关键词查询岗位详情
+
+        :param query: 空格分隔的关键词, 如 大模型 RAG
+        :param limit: 最多返回的岗位数量
+        :param match_all: True 时岗位需要包含所有关键词, 否则包含任意一个即可
+        :return: [(岗位详情, BM25 得分)], 按相关度从高到低排列, 得分越小越相关
+        """
+        match_query = get_match_query(query, match_all)
+        if not match_query:
+            return []
+
+        rows = self.connection.execute("""
+            SELECT job_detail.data, job_fts.rank FROM job_fts
+            JOIN job_detail ON job_detail.rowid = job_fts.rowid
+            WHERE job_fts MATCH ? ORDER BY job_fts.rank LIMIT ?
+        """, (match_query, limit))
+        return [(json.loads(data), score) for data, score in rows]
+
+
+if __name__ == "__main__":
+    import argparse
+    from util.repository import JobRepository
+
+    parser = argparse.ArgumentParser(description='全文搜索历史岗位')
+    parser.add_argument('query', help='空格分隔的关键词, 如 "大模型 RAG"')
+    parser.add_argument('--limit', type=int, default=20, help='最多返回的岗位数量')
+    parser.add_argument('--any', action='store_true', help='包含任意一个关键词即可')
+    args = parser.parse_args()
+
+    with JobRepository() as repository:
+        for index, job_detail in enumerate(repository.search_job_details(args.query, args.limit, not args.any), 1):
+            job_info, brand_com_info = job_detail['jobInfo'], job_detail.get('brandComInfo') or {}
+            print(f"{index:>3}. {job_info['jobName']} | {brand_com_info.get('brandName', '')} | "
+                  f"{job_info.get('salaryDesc', '')} | {job_info.get('locationName', '')}")
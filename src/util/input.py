@@ -48,6 +48,11 @@ def collect_user_input(exist_job_details: bool):
         default=last_user_input.get('other_info', ""),
     ).ask()
 
+    skills = questionary.text(
+        "岗位必须包含的技能(多个技能用逗号分隔, 如：LangChain,RAG, 不限制请留空)",
+        default=','.join(last_user_input.get('skills', [])),
+    ).ask()
+
     max_size = questionary.text(
         "想要检索的最大岗位数量(如：30):",
         default=str(last_user_input.get('max_size', 30))
@@ -70,6 +75,7 @@ def collect_user_input(exist_job_details: bool):
         max_size=int(max_size),
         job_names=[name.strip()
                    for name in job_name.split(',') if name.strip()],
+        skills=[skill.strip() for skill in skills.split(',') if skill.strip()],
     )
     write_json(current_user_input, 'data/user_input.json')
     return current_user_input
@@ -0,0 +1,179 @@
+"""
+岗位数据表(列式存储)
+
+将嵌套的岗位详情(jobInfo / bossInfo / brandComInfo)转换为 pandas DataFrame, 每个字段为一列:
+薪资解析为 salary_min / salary_max(K/月) 和 salary_months(薪数), 经验解析为 experience_min / experience_max(年),
+学历转换为可以比较大小的 degree_code, 城市、行业、规模等重复较多的文本转换为 category 类型,
+之后的过滤和统计都可以对整列向量化计算, 不需要逐条遍历字典.
+
+薪资、经验等字符串的取值很少, 只解析去重后的取值, 再按 category 的编码映射回每一行.
+需要安装 analysis 依赖: uv sync --extra analysis
+"""
+
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from config import job_detail_store_path, job_repository_path
+from local_type import JobDetailItem, UserInput
+from util.common import FilterSpec
+from util.fs import read_job_store
+from util.repository import JobRepository
+
+# 学历编码, 数值越大学历越高, 学历不限和未知学历为 -1
+DEGREE_CODES = {
+    '初中及以下': 0,
+    '中专/中技': 1,
+    '高中': 2,
+    '大专': 3,
+    '本科': 4,
+    '学士': 4,
+    '硕士': 5,
+    '研究生': 5,
+    '博士': 6,
+    '博士后': 7,
+}
+
+# 如 40-70K·16薪、150-200元/天、8000-12000元/月
+SALARY_PATTERN = r'^(?P<min>\d+(?:\.\d+)?)-(?P<max>\d+(?:\.\d+)?)(?P<unit>K|元/天|元/月|元/时)(?:·(?P<months>\d+)薪)?'
+
+# 岗位详情中的字段 -> 列名, 这些列转换为 category 类型(不同公司的岗位名称也大多重复)
+CATEGORY_COLUMNS = {
+    'jobInfo.jobName': 'job_name',
+    'jobInfo.positionName': 'position_name',
+    'jobInfo.locationName': 'city',
+    'jobInfo.degreeName': 'degree',
+    'jobInfo.experienceName': 'experience',
+    'jobInfo.salaryDesc': 'salary_desc',
+    'brandComInfo.industryName': 'industry',
+    'brandComInfo.scaleName': 'scale',
+    'brandComInfo.stageName': 'stage',
+    'bossInfo.activeTimeDesc': 'boss_active',
+}
+
+
+def parse_salary(salary_descs: pd.Series) -> pd.DataFrame:
+    """
+    解析薪资描述
+
+    :param salary_descs: 薪资描述, 如 40-70K·16薪
+    :return: salary_min / salary_max(K/月, 按天或按小时计薪时为空),
+             salary_months(薪数, 按月计薪且没有注明时为 12, 按天或按小时计薪以及无法解析(如 面议)时为空),
+             salary_daily(是否按天计薪)
+    """
+    matches = salary_descs.str.extract(SALARY_PATTERN)
+    salary_min = matches['min'].astype('float32').to_numpy(copy=True)
+    salary_max = matches['max'].astype('float32').to_numpy(copy=True)
+    unit = matches['unit']
+    # 按月计薪时统一为 K/月, 按天或按小时计薪的岗位无法与月薪比较
+    monthly_yuan = (unit == '元/月').to_numpy()
+    salary_min[monthly_yuan] /= 1000
+    salary_max[monthly_yuan] /= 1000
+    monthly = unit.isin(['K', '元/月']).to_numpy()
+    salary_min[~monthly] = np.nan
+    salary_max[~monthly] = np.nan
+    salary_months = matches['months'].astype('float32').to_numpy(copy=True)
+    salary_months[monthly & np.isnan(salary_months)] = 12
+    salary_months[~monthly] = np.nan
+    return pd.DataFrame({
+        'salary_min': salary_min,
+        'salary_max': salary_max,
+        'salary_months': salary_months,
+        'salary_daily': (unit == '元/天').to_numpy(),
+    }, index=salary_descs.index)
+
+
+def parse_experience(experience_names: pd.Series) -> pd.DataFrame:
+    """
+    解析经验要求
+
+    :param experience_names: 经验要求, 如 3-5年、10年以上、应届生、经验不限
+    :return: experience_min / experience_max(年), 经验不限或无法解析时为空, 10年以上 的上限为空
+    """
+    matches = experience_names.str.extract(r'^(?P<min>\d+)-(?P<max>\d+)年')
+    experience_min = matches['min'].astype('float32').to_numpy(copy=True)
+    experience_max = matches['max'].astype('float32').to_numpy(copy=True)
+
+    above = experience_names.str.extract(r'^(\d+)年以上')[0].astype('float32').to_numpy(copy=True)
+    experience_min[~np.isnan(above)] = above[~np.isnan(above)]
+
+    within = experience_names.str.extract(r'^(\d+)年以内')[0].astype('float32').to_numpy(copy=True)
+    experience_min[~np.isnan(within)] = 0
+    experience_max[~np.isnan(within)] = within[~np.isnan(within)]
+
+    graduate = experience_names.str.contains('应届|在校').to_numpy(bool)
+    experience_min[graduate] = 0
+    experience_max[graduate] = 0
+    return pd.DataFrame({'experience_min': experience_min, 'experience_max': experience_max},
+                        index=experience_names.index)
+
+
+def map_categories(column: pd.Series, parse) -> pd.DataFrame:
+    """只解析 category 列中去重后的取值, 再按编码映射回每一行"""
+    categories = pd.Series(column.cat.categories, dtype=str)
+    parsed = parse(categories)
+    codes = column.cat.codes.to_numpy()
+    # 空值的编码为 -1, 映射到最后追加的一行默认值
+    defaults = parse(pd.Series([''], dtype=str))
+    parsed = pd.concat([parsed, defaults], ignore_index=True)
+    return parsed.iloc[codes].reset_index(drop=True)
+
+
+def build_job_table(job_details: Iterable[JobDetailItem]) -> pd.DataFrame:
+    """
+    将岗位详情转换为岗位数据表, 每个岗位一行
+
+    :param job_details: 岗位详情
+    :return: 包含 encrypt_id, show_skills, category 列, 以及解析后的薪资、经验和学历编码列
+    """
+    encrypt_ids, show_skills = [], []
+    values: dict[str, list] = {name: [] for name in CATEGORY_COLUMNS.values()}
+    fields = [(key.split('.'), name) for key, name in CATEGORY_COLUMNS.items()]
+    for job_detail in job_details:
+        job_info = job_detail.get('jobInfo') or {}
+        encrypt_ids.append(job_info.get('encryptId') or '')
+        show_skills.append(job_info.get('showSkills') or [])
+        for (group, key), name in fields:
+            values[name].append((job_detail.get(group) or {}).get(key) or '')
+
+    table = pd.DataFrame({
+        'encrypt_id': pd.Series(encrypt_ids, dtype=str),
+        **{name: pd.Categorical(column) for name, column in values.items()},
+        'show_skills': pd.Series(show_skills, dtype=object),
+    })
+
+    salary = map_categories(table['salary_desc'], parse_salary)
+    experience = map_categories(table['experience'], parse_experience)
+    # 与 map_categories 一致, 最后追加空值对应的编码
+    degree_codes = np.array([DEGREE_CODES.get(name, -1) for name in table['degree'].cat.categories] + [-1],
+                            dtype='int8')
+    table['degree_code'] = degree_codes[table['degree'].cat.codes.to_numpy()]
+    return pd.concat([table, salary, experience], axis=1)
+
+
+def match_categories(column: pd.Series, match) -> np.ndarray:
+    """对 category 列中去重后的取值执行 match, 返回每一行是否匹配, 空值视为匹配"""
+    matched = np.array([bool(match(name)) for name in column.cat.categories] + [True])
+    return matched[column.cat.codes.to_numpy()]
+
+
+def filter_job_table(table: pd.DataFrame, user_input: UserInput) -> pd.DataFrame:
+    """按用户输入过滤岗位数据表, 与 util.common.filter_job_details 的过滤规则一致"""
+    filter_spec = FilterSpec.from_user_input(user_input)
+    mask = (match_categories(table['degree'], filter_spec.match_degree)
+            & match_categories(table['salary_desc'], filter_spec.match_salary)
+            & match_categories(table['experience'], filter_spec.match_experience)
+            & match_categories(table['job_name'], filter_spec.match_job_name))
+    return table[mask]
+
+
+def read_job_table(file_path: str = job_detail_store_path) -> pd.DataFrame:
+    """读取岗位数据文件(data/jobdetail.jsonl, 兼容 data/jobdetail.json)并转换为岗位数据表"""
+    return build_job_table(read_job_store(file_path))
+
+
+def load_job_table(db_path: str = job_repository_path) -> pd.DataFrame:
+    """读取历史岗位数据库中的所有岗位详情并转换为岗位数据表"""
+    with JobRepository(db_path) as repository:
+        return build_job_table(repository.iter_all_job_details())
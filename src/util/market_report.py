@@ -0,0 +1,117 @@
+"""
+招聘市场统计报告
+
+基于岗位数据表(util.job_table), 对历史岗位中符合用户过滤条件(学历、薪资、经验、屏蔽的岗位名称)的岗位做分组统计:
+- 按岗位名称包含的搜索关键词、城市、学历、公司规模分组的月薪分位数(K/月, 取薪资范围的中间值, 不含按天计薪的岗位)
+- 按月计薪岗位的薪数分布
+- 出现次数最多的技能标签(showSkills)
+- 融资阶段(stageName)分布
+- 招聘者活跃情况(bossInfo.activeTimeDesc)分布
+
+统计结果保存为 JSON, 可以直接放入提示词的文字摘要由 template.get_market_summary 生成.
+需要安装 analysis 依赖: uv sync --extra analysis
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from config import job_repository_path
+from local_type import UserInput
+from util.fs import write_json
+from util.job_table import filter_job_table, load_job_table, match_categories
+
+SALARY_QUANTILES = (0.25, 0.5, 0.75)
+# 每种分组最多保留的组数, 按岗位数量从多到少排列
+MAX_GROUPS = 10
+TOP_SKILLS = 20
+
+
+def get_salary_stats(salary: pd.Series, groups: pd.Series | None = None) -> list[dict]:
+    """
+    计算月薪分位数
+
+    :param salary: 月薪中间值, 空值不参与统计
+    :param groups: 分组, 为空时所有岗位作为一组, 组名为 全部
+    :return: [{'group', 'count', 'p25', 'p50', 'p75'}], 按岗位数量从多到少排列
+    """
+    valid = salary.notna().to_numpy(copy=True)
+    if groups is None:
+        groups = pd.Series(np.full(len(salary), '全部'), index=salary.index)
+    else:
+        valid &= (groups != '').to_numpy()
+    grouped = salary[valid].groupby(groups[valid], observed=True)
+    stats = grouped.quantile(list(SALARY_QUANTILES)).unstack()
+    stats['count'] = grouped.size()
+    stats = stats.sort_values('count', ascending=False).head(MAX_GROUPS)
+    return [{
+        'group': group,
+        'count': int(row['count']),
+        **{f'p{round(q * 100)}': round(float(row[q]), 1) for q in SALARY_QUANTILES},
+    } for group, row in stats.iterrows()]
+
+
+def get_distribution(column: pd.Series, count: int | None = None) -> list[dict]:
+    """统计各取值的岗位数量和占比, 不含空值"""
+    counts = column[column != ''].value_counts()
+    total = counts.sum()
+    counts = counts[counts > 0].head(count)
+    return [{'name': name, 'count': int(value), 'ratio': round(float(value / total), 3)}
+            for name, value in counts.items()]
+
+
+def build_market_report(table: pd.DataFrame, keywords: list[str]) -> dict:
+    """
+    统计岗位数据表
+
+    :param table: 岗位数据表
+    :param keywords: 搜索关键词, 岗位名称包含关键词(不区分大小写)的岗位计入该关键词的分组.
+                     历史岗位数据库没有记录岗位由哪个关键词搜索得到, 只能按岗位名称近似:
+                     名称不包含任何关键词的岗位不计入这些分组, 名称包含多个关键词的岗位计入每个分组
+    """
+    salary = (table['salary_min'] + table['salary_max']) / 2
+
+    salary_by_name_keyword = []
+    for keyword in keywords:
+        mask = match_categories(table['job_name'], lambda name: keyword.lower() in name.lower())
+        stats = get_salary_stats(salary[mask])
+        salary_by_name_keyword += [{**item, 'group': keyword} for item in stats]
+
+    # 按学历从高到低排列
+    degree_order = table.groupby('degree', observed=True)['degree_code'].first().sort_values(ascending=False)
+    salary_by_degree = sorted(get_salary_stats(salary, table['degree']),
+                              key=lambda item: -degree_order.get(item['group'], -1))
+
+    skills = table['show_skills'].explode().dropna()
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'job_count': len(table),
+        'salary': {
+            'all': get_salary_stats(salary),
+            'name_contains': salary_by_name_keyword,
+            'city': get_salary_stats(salary, table['city']),
+            'degree': salary_by_degree,
+            'scale': get_salary_stats(salary, table['scale']),
+        },
+        # 按天、按小时计薪和面议的岗位没有薪数, 不参与统计
+        'salary_months': get_distribution(table['salary_months'].dropna().astype(int).astype(str) + '薪'),
+        'top_skills': get_distribution(skills.astype(str), TOP_SKILLS),
+        'stages': get_distribution(table['stage']),
+        'boss_active': get_distribution(table['boss_active']),
+    }
+
+
+def write_market_report(user_input: UserInput, file_path: str, db_path: str = job_repository_path) -> dict:
+    """
+    统计历史岗位数据库中符合用户过滤条件的岗位, 保存 JSON 报告
+
+    :param user_input: 用户输入, 按其中的过滤条件筛选岗位, 按搜索关键词分组
+    :param file_path: 报告路径, 如 data/market_report.json
+    :param db_path: 历史岗位数据库路径
+    :return: 统计报告
+    """
+    table = filter_job_table(load_job_table(db_path), user_input)
+    report = build_market_report(table, user_input['job_names'])
+    write_json(report, file_path)
+    return report
@@ -0,0 +1,104 @@
+"""
+爬虫运行指标
+
+统计每个阶段(启动浏览器、检测登录、搜索、滚动、等待网络空闲、获取详情、写入文件等)的耗时和次数,
+以及页面、岗位、响应、错误和字节数等计数, 每次运行结束后保存为 JSON 报告,
+可选同时输出 Prometheus 文本格式, 供 node_exporter 的 textfile collector 采集.
+"""
+
+import os
+import re
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class RunMetrics:
+    def __init__(self, site_name: str):
+        self.site_name = site_name
+        self.started_at = time.time()
+        self.start_time = time.perf_counter()
+        # 阶段 -> 累计耗时(秒), 并发的标签页各自计时, 累计耗时可能超过总耗时
+        self.phase_seconds: dict[str, float] = {}
+        self.phase_calls: dict[str, int] = {}
+        self.counters: dict[str, int] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        """统计代码块的耗时, 可以包含 await"""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, time.perf_counter() - start_time)
+
+    def add_phase(self, name: str, seconds: float):
+        self.phase_seconds[name] = self.phase_seconds.get(name, 0) + seconds
+        self.phase_calls[name] = self.phase_calls.get(name, 0) + 1
+
+    def increment(self, name: str, value: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_dict(self) -> dict:
+        elapsed = time.perf_counter() - self.start_time
+        return {
+            'site': self.site_name,
+            'started_at': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+            'elapsed_seconds': round(elapsed, 3),
+            'phases': {
+                name: {'seconds': round(seconds, 3), 'calls': self.phase_calls[name]}
+                for name, seconds in sorted(self.phase_seconds.items(), key=lambda item: -item[1])
+            },
+            'counters': dict(sorted(self.counters.items())),
+            'job_details_per_minute': round(self.counters.get('job_details', 0) / elapsed * 60, 3) if elapsed else 0,
+        }
+
+    def to_prometheus(self) -> str:
+        """生成 Prometheus 文本格式, 指标为最近一次运行的值"""
+        report = self.to_dict()
+        labels = f'site="{self.site_name}"'
+        lines = [
+            '# HELP boss_spider_run_seconds Wall time of the last crawl run.',
+            '# TYPE boss_spider_run_seconds gauge',
+            f'boss_spider_run_seconds{{{labels}}} {report["elapsed_seconds"]}',
+            '# HELP boss_spider_run_timestamp_seconds Start time of the last crawl run.',
+            '# TYPE boss_spider_run_timestamp_seconds gauge',
+            f'boss_spider_run_timestamp_seconds{{{labels}}} {self.started_at:.3f}',
+            '# HELP boss_spider_phase_seconds Time spent in each phase of the last crawl run.',
+            '# TYPE boss_spider_phase_seconds gauge',
+        ]
+        lines += [f'boss_spider_phase_seconds{{{labels},phase="{name}"}} {phase["seconds"]}'
+                  for name, phase in report['phases'].items()]
+        lines += [
+            '# HELP boss_spider_phase_calls Number of times each phase ran in the last crawl run.',
+            '# TYPE boss_spider_phase_calls gauge',
+        ]
+        lines += [f'boss_spider_phase_calls{{{labels},phase="{name}"}} {phase["calls"]}'
+                  for name, phase in report['phases'].items()]
+        for name, value in report['counters'].items():
+            metric_name = 'boss_spider_' + re.sub(r'\W', '_', name)
+            lines += [f'# TYPE {metric_name} gauge', f'{metric_name}{{{labels}}} {value}']
+        return '\n'.join(lines) + '\n'
+
+    def write_report(self, metrics_dir: str, prometheus: bool = False) -> str:
+        """
+        保存本次运行的 JSON 报告
+
+        :param metrics_dir: 报告目录, 文件名为 run-<开始时间>.json
+        :param prometheus: 是否同时写入 <metrics_dir>/boss_spider.prom
+        :return: JSON 报告路径
+        """
+        os.makedirs(metrics_dir, exist_ok=True)
+        report_path = os.path.join(
+            metrics_dir, f"run-{datetime.fromtimestamp(self.started_at).strftime('%Y%m%d-%H%M%S')}.json")
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+        if prometheus:
+            # 先写入临时文件再替换, 避免采集到写入一半的文件
+            prometheus_path = os.path.join(metrics_dir, 'boss_spider.prom')
+            with open(f'{prometheus_path}.tmp', 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+            os.replace(f'{prometheus_path}.tmp', prometheus_path)
+        return report_path
@@ -0,0 +1,193 @@
+"""
+岗位描述近似去重(MinHash + LSH)
+
+同一个岗位经常被多个招聘者或代招机构(proxyJob)重复发布, 岗位ID不同但描述几乎一致.
+岗位描述去掉空白和标点后按字符切分为 n-gram, 计算 MinHash 签名,
+再按 LSH 分段放入哈希桶, 只和同一个桶中的岗位比较, 时间复杂度接近线性.
+分段数根据相似度阈值选择, 使相似度达到阈值的岗位几乎总能落入同一个桶, 最终由签名相似度判断是否重复.
+"""
+
+import re
+import logging
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from local_type import JobDetailItem
+
+logger = logging.getLogger(__name__)
+
+# 每个 n-gram 的字符数
+SHINGLE_SIZE = 5
+# MinHash 签名长度, 按相似度阈值拆分为 LSH 的 分段数 * 每段行数, 签名估算相似度的标准差约为 0.04
+NUM_PERM = 128
+# 相似度等于阈值的两个岗位至少以该概率落入同一个桶
+CANDIDATE_PROBABILITY = 0.99
+# 去掉空白和标点, 只比较文字内容
+IGNORE_PATTERN = re.compile(r'[\s\W_]+')
+
+# 哈希函数 (a * x + b) mod p 的模数, 梅森素数取模只需要移位和按位与
+MERSENNE_PRIME = (1 << 61) - 1
+_MERSENNE_PRIME = np.uint64(MERSENNE_PRIME)
+
+_rng = np.random.default_rng(20250801)
+_HASH_A = _rng.integers(1, MERSENNE_PRIME, NUM_PERM, dtype=np.uint64)
+_HASH_B = _rng.integers(0, MERSENNE_PRIME, NUM_PERM, dtype=np.uint64)
+# a 按高低 32 位拆分, 与 32 位的 x 相乘时不会超出 uint64
+_HASH_A_HIGH = (_HASH_A >> np.uint64(32))[:, np.newaxis]
+_HASH_A_LOW = (_HASH_A & np.uint64(0xFFFFFFFF))[:, np.newaxis]
+# 计算 n-gram 多项式哈希的系数
+_SHINGLE_BASE = np.uint64(1000003) ** np.arange(SHINGLE_SIZE - 1, -1, -1, dtype=np.uint64)
+
+
+def get_lsh_params(threshold: float) -> tuple[int, int]:
+    """
+    根据相似度阈值选择 LSH 的分段数和每段行数
+
+    每段行数越多, 相似度低的岗位越不容易落入同一个桶, 需要比较的岗位越少, 但相似度达到阈值的岗位也更容易漏掉.
+    选择相似度等于阈值时落入同一个桶的概率 1 - (1 - threshold ** rows) ** bands 不低于 CANDIDATE_PROBABILITY 的最大行数,
+    分段数为 NUM_PERM // rows, 签名末尾不足一段的部分只用于计算相似度.
+    :return: (分段数, 每段行数)
+    """
+    for rows in range(NUM_PERM, 0, -1):
+        bands = NUM_PERM // rows
+        if 1 - (1 - threshold ** rows) ** bands >= CANDIDATE_PROBABILITY:
+            return bands, rows
+    return NUM_PERM, 1
+
+
+def reduce_mersenne(values: np.ndarray, buffer: np.ndarray):
+    """原地计算 values 除以 2^61 - 1 的余数的同余值, 结果小于 2^61 + 8, buffer 为同样形状的临时数组"""
+    np.right_shift(values, np.uint64(61), out=buffer)
+    values &= _MERSENNE_PRIME
+    values += buffer
+
+
+def hash_shingles(shingles: np.ndarray) -> np.ndarray:
+    """
+    计算 NUM_PERM 个哈希函数 (a * x + b) mod (2^61 - 1)
+
+    :param shingles: 32 位的 n-gram 哈希
+    :return: 形状为 (NUM_PERM, len(shingles)) 的哈希值
+    """
+    shingles = shingles[np.newaxis, :]
+    # a_low * x < 2^64
+    values = _HASH_A_LOW * shingles
+    buffer = np.empty_like(values)
+    reduce_mersenne(values, buffer)
+    # a_high * x < 2^61, 乘以 2^32 对 2^61 - 1 取模等价于 61 位内的循环移位
+    high = _HASH_A_HIGH * shingles
+    np.right_shift(high, np.uint64(29), out=buffer)
+    high &= np.uint64((1 << 29) - 1)
+    high <<= np.uint64(32)
+    values += high
+    values += buffer
+    values += _HASH_B[:, np.newaxis]
+    reduce_mersenne(values, buffer)
+    # 大于等于 p 时减去 p, 小于 p 时减法下溢为很大的数, 取较小值即为余数
+    np.subtract(values, _MERSENNE_PRIME, out=buffer)
+    return np.minimum(values, buffer, out=values)
+
+
+def get_shingle_hashes(text: str) -> np.ndarray:
+    """将文本切分为 n-gram 并计算 32 位哈希, 返回去重后的哈希数组"""
+    text = IGNORE_PATTERN.sub('', text.lower())
+    if not text:
+        return np.empty(0, dtype=np.uint64)
+
+    code_points = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    if len(code_points) < SHINGLE_SIZE:
+        windows = code_points[np.newaxis, :]
+        base = _SHINGLE_BASE[-len(code_points):]
+    else:
+        windows = np.lib.stride_tricks.sliding_window_view(code_points, SHINGLE_SIZE)
+        base = _SHINGLE_BASE
+    # 多项式哈希的低位分布较差, 高 32 位异或到低 32 位
+    hashes = windows @ base
+    return np.unique((hashes >> np.uint64(32)) ^ (hashes & np.uint64(0xFFFFFFFF)))
+
+
+def get_minhash(text: str) -> np.ndarray | None:
+    """计算文本的 MinHash 签名, 文本为空时返回 None"""
+    shingles = get_shingle_hashes(text)
+    if not len(shingles):
+        return None
+
+    return hash_shingles(shingles).min(axis=1)
+
+
+class NearDuplicateDetector:
+    def __init__(self, threshold: float = 0.8):
+        """
+        :param threshold: 签名估算的 Jaccard 相似度不低于该值时视为重复
+        """
+        self.threshold = threshold
+        self.bands, self.rows = get_lsh_params(threshold)
+        # 每个桶中保存已保留岗位的序号
+        self.buckets: list[dict[bytes, list[int]]] = [{} for _ in range(self.bands)]
+        # 已保留岗位的ID和签名, 签名矩阵按需扩容, 前 len(self.kept_ids) 行有效
+        self.kept_ids: list[str] = []
+        self.signatures = np.empty((1024, NUM_PERM), dtype=np.uint64)
+        # 保留的岗位ID -> 被去掉的重复岗位ID
+        self.clusters: dict[str, list[str]] = {}
+
+    def get_band_keys(self, signature: np.ndarray) -> list[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def find(self, signature: np.ndarray) -> str | None:
+        """查找与签名最相似且相似度不低于阈值的已保留岗位"""
+        candidates = {index for buckets, key in zip(self.buckets, self.get_band_keys(signature))
+                      for index in buckets.get(key, ())}
+        if not candidates:
+            return None
+
+        indexes = np.fromiter(candidates, dtype=np.intp, count=len(candidates))
+        similarities = np.count_nonzero(self.signatures[indexes] == signature, axis=1) / NUM_PERM
+        best = int(np.argmax(similarities))
+        return self.kept_ids[indexes[best]] if similarities[best] >= self.threshold else None
+
+    def add(self, job_detail: JobDetailItem) -> str | None:
+        """
+        记录岗位详情
+
+        :return: 与之重复的已保留岗位ID, 不重复时返回 None 并保留该岗位
+        """
+        job_info = job_detail.get('jobInfo', {})
+        encrypt_id = job_info.get('encryptId', '')
+        signature = get_minhash(job_info.get('postDescription') or '')
+        if signature is None:
+            return None
+
+        representative = self.find(signature)
+        if representative:
+            self.clusters[representative].append(encrypt_id)
+            return representative
+
+        index = len(self.kept_ids)
+        if index == len(self.signatures):
+            self.signatures = np.concatenate([self.signatures, np.empty_like(self.signatures)])
+        self.signatures[index] = signature
+        self.kept_ids.append(encrypt_id)
+        self.clusters[encrypt_id] = []
+        for buckets, key in zip(self.buckets, self.get_band_keys(signature)):
+            buckets.setdefault(key, []).append(index)
+        return None
+
+    def get_duplicate_count(self) -> int:
+        return sum(len(duplicate_ids) for duplicate_ids in self.clusters.values())
+
+
+def drop_near_duplicates(job_details: Iterable[JobDetailItem], threshold: float = 0.8) -> Iterator[JobDetailItem]:
+    """
+    逐条去掉描述近似重复的岗位, 每组重复岗位只保留第一个
+
+    :param job_details: 岗位详情, 可以是生成器
+    :param threshold: 视为重复的相似度
+    """
+    detector = NearDuplicateDetector(threshold)
+    for job_detail in job_details:
+        if detector.add(job_detail) is None:
+            yield job_detail
+
+    if detector.get_duplicate_count():
+        logger.info(f"去掉 {detector.get_duplicate_count()} 个描述近似重复的岗位")
@@ -0,0 +1,81 @@
+"""
+自适应令牌桶限流
+
+按每分钟请求数发放令牌, 服务端返回错误(HTTP 429/5xx 或业务 code 非 0)时降低速率,
+请求正常时逐步恢复到配置的速率.
+"""
+
+import time
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveRateLimiter:
+    def __init__(self, requests_per_minute: float, min_requests_per_minute: float | None = None,
+                 burst: int = 1, backoff: float = 0.5, recover: float = 1.1):
+        """
+        :param requests_per_minute: 正常情况下每分钟最多请求数
+        :param min_requests_per_minute: 降速后的最低每分钟请求数, 默认为正常速率的 1/10
+        :param burst: 令牌桶容量, 允许的瞬时并发请求数
+        :param backoff: 出错时速率乘以该系数
+        :param recover: 正常响应时速率乘以该系数, 直到恢复到正常速率
+        """
+        self.max_rate = requests_per_minute / 60
+        self.min_rate = (min_requests_per_minute or requests_per_minute / 10) / 60
+        self.rate = self.max_rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.backoff = backoff
+        self.recover = recover
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+        # 获取令牌的次数和累计等待时间(秒), 包括排队等待锁的时间
+        self.acquired = 0
+        self.wait_seconds = 0.0
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens +
+                          (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        """等待直到获取到一个令牌"""
+        start_time = time.monotonic()
+        async with self.lock:
+            while True:
+                self.refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.acquired += 1
+                    self.wait_seconds += time.monotonic() - start_time
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def slow_down(self):
+        """降低请求速率, 并清空已积累的令牌"""
+        rate = max(self.min_rate, self.rate * self.backoff)
+        if rate < self.rate:
+            logger.warning(f"请求异常, 降低请求速率到每分钟 {rate * 60:.1f} 次")
+        self.refill()
+        self.rate = rate
+        self.tokens = min(self.tokens, 0)
+
+    def speed_up(self):
+        """逐步恢复请求速率"""
+        self.refill()
+        self.rate = min(self.max_rate, self.rate * self.recover)
+
+    def report(self, status: int, code: int | None = None):
+        """
+        根据响应结果调整请求速率
+
+        :param status: HTTP 状态码
+        :param code: 接口返回的业务 code, 0 表示正常
+        """
+        if status == 429 or status >= 500 or code not in (None, 0):
+            self.slow_down()
+        else:
+            self.speed_up()
@@ -0,0 +1,260 @@
+"""
+历史岗位数据库(SQLite)
+
+岗位列表按 encryptJobId 去重, 岗位详情按 jobInfo.encryptId 去重,
+重复写入时更新为最新数据, 过滤条件直接在 SQL 中完成.
+写入岗位时同步更新同一个数据库中的技能倒排索引(util.skill_index)和全文索引(util.full_text).
+"""
+
+import os
+import json
+import time
+import logging
+import sqlite3
+from typing import Iterator
+
+from config import job_repository_path
+from local_type import JobDetailItem, JobListItem, UserInput
+from util.common import FilterSpec, parse_salary_range, parse_experience_min
+from util.skill_index import SkillIndex, normalize_skill
+from util.full_text import FullTextIndex
+
+logger = logging.getLogger(__name__)
+
+# SQLite 单条语句的参数数量有限, 按批次查询
+QUERY_BATCH_SIZE = 500
+# 技能索引和全文索引的版本, 新增索引或提取规则变化时增加版本号, 打开数据库时按已有岗位重建索引
+INDEX_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS job_list (
+    encrypt_job_id TEXT PRIMARY KEY,
+    job_name TEXT NOT NULL DEFAULT '',
+    salary_desc TEXT NOT NULL DEFAULT '',
+    degree_name TEXT NOT NULL DEFAULT '',
+    experience_name TEXT NOT NULL DEFAULT '',
+    city_name TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_job_list_salary ON job_list (salary_desc);
+CREATE INDEX IF NOT EXISTS idx_job_list_degree ON job_list (degree_name);
+CREATE INDEX IF NOT EXISTS idx_job_list_experience ON job_list (experience_name);
+CREATE INDEX IF NOT EXISTS idx_job_list_city ON job_list (city_name);
+
+CREATE TABLE IF NOT EXISTS job_detail (
+    encrypt_id TEXT PRIMARY KEY,
+    job_name TEXT NOT NULL DEFAULT '',
+    salary_desc TEXT NOT NULL DEFAULT '',
+    salary_daily INTEGER NOT NULL DEFAULT 0,
+    salary_min INTEGER,
+    salary_max INTEGER,
+    degree_name TEXT NOT NULL DEFAULT '',
+    experience_name TEXT NOT NULL DEFAULT '',
+    experience_min INTEGER,
+    city_name TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_job_detail_salary ON job_detail (salary_min, salary_max);
+CREATE INDEX IF NOT EXISTS idx_job_detail_degree ON job_detail (degree_name);
+CREATE INDEX IF NOT EXISTS idx_job_detail_experience ON job_detail (experience_min);
+CREATE INDEX IF NOT EXISTS idx_job_detail_city ON job_detail (city_name);
+"""
+
+
+def get_job_list_row(job: JobListItem, updated_at: float):
+    return (
+        job.get('encryptJobId', ''),
+        job.get('jobName') or '',
+        job.get('salaryDesc') or '',
+        job.get('jobDegree') or '',
+        job.get('jobExperience') or '',
+        job.get('cityName') or '',
+        json.dumps(job, ensure_ascii=False),
+        updated_at,
+    )
+
+
+def get_job_detail_row(job_detail: JobDetailItem, updated_at: float):
+    job_info = job_detail.get('jobInfo', {})
+    salary_desc = job_info.get('salaryDesc') or ''
+    salary_range = parse_salary_range(salary_desc)
+    experience_name = job_info.get('experienceName') or ''
+    return (
+        job_info.get('encryptId', ''),
+        job_info.get('jobName') or '',
+        salary_desc,
+        int('天' in salary_desc),
+        salary_range[0] if salary_range else None,
+        salary_range[1] if salary_range else None,
+        job_info.get('degreeName') or '',
+        experience_name,
+        parse_experience_min(experience_name),
+        job_info.get('locationName') or '',
+        json.dumps(job_detail, ensure_ascii=False),
+        updated_at,
+    )
+
+
+class JobRepository:
+    def __init__(self, db_path: str = job_repository_path):
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.executescript(SCHEMA)
+        self.skill_index = SkillIndex(self.connection)
+        self.full_text_index = FullTextIndex(self.connection)
+        if self.connection.execute('PRAGMA user_version').fetchone()[0] < INDEX_VERSION:
+            self.rebuild_indexes()
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def upsert_job_list(self, job_list: list[JobListItem]):
+        """写入岗位列表, 已存在的岗位更新为最新数据"""
+        updated_at = time.time()
+        rows = [get_job_list_row(job, updated_at)
+                for job in job_list if job.get('encryptJobId')]
+        with self.connection:
+            self.connection.executemany("""
+                INSERT INTO job_list (encrypt_job_id, job_name, salary_desc, degree_name,
+                                      experience_name, city_name, data, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (encrypt_job_id) DO UPDATE SET
+                    job_name = excluded.job_name,
+                    salary_desc = excluded.salary_desc,
+                    degree_name = excluded.degree_name,
+                    experience_name = excluded.experience_name,
+                    city_name = excluded.city_name,
+                    data = excluded.data,
+                    updated_at = excluded.updated_at
+            """, rows)
+            self.skill_index.add_job_list(job_list)
+
+    def upsert_job_details(self, job_details: list[JobDetailItem]):
+        """写入岗位详情, 已存在的岗位更新为最新数据"""
+        updated_at = time.time()
+        rows = [get_job_detail_row(job_detail, updated_at)
+                for job_detail in job_details if job_detail.get('jobInfo', {}).get('encryptId')]
+        with self.connection:
+            self.full_text_index.remove_job_details(job_details)
+            self.connection.executemany("""
+                INSERT INTO job_detail (encrypt_id, job_name, salary_desc, salary_daily, salary_min,
+                                        salary_max, degree_name, experience_name, experience_min,
+                                        city_name, data, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (encrypt_id) DO UPDATE SET
+                    job_name = excluded.job_name,
+                    salary_desc = excluded.salary_desc,
+                    salary_daily = excluded.salary_daily,
+                    salary_min = excluded.salary_min,
+                    salary_max = excluded.salary_max,
+                    degree_name = excluded.degree_name,
+                    experience_name = excluded.experience_name,
+                    experience_min = excluded.experience_min,
+                    city_name = excluded.city_name,
+                    data = excluded.data,
+                    updated_at = excluded.updated_at
+            """, rows)
+            self.skill_index.add_job_details(job_details)
+            self.full_text_index.add_job_details(job_details)
+
+    def rebuild_indexes(self):
+        """按已有的岗位列表和岗位详情重建技能索引和全文索引"""
+        with self.connection:
+            self.skill_index.clear()
+            self.full_text_index.clear()
+            for table, adds in (('job_list', [self.skill_index.add_job_list]),
+                                ('job_detail', [self.skill_index.add_job_details,
+                                                self.full_text_index.add_job_details])):
+                rows = self.connection.execute(f'SELECT data FROM {table} ORDER BY rowid').fetchall()
+                for start in range(0, len(rows), QUERY_BATCH_SIZE):
+                    records = [json.loads(data) for data, in rows[start:start + QUERY_BATCH_SIZE]]
+                    for add in adds:
+                        add(records)
+            self.connection.execute(f'PRAGMA user_version = {INDEX_VERSION}')
+        top_skills = ', '.join(f'{name} {count}' for name, count in self.skill_index.count(10))
+        logger.info(f"技能索引和全文索引已重建, 岗位最多的技能: {top_skills or '无'}")
+
+    def get_by_ids(self, table: str, id_column: str, ids: list[str]) -> list:
+        """按 id 查询记录, 结果顺序与 ids 一致"""
+        data_map = {}
+        for start in range(0, len(ids), QUERY_BATCH_SIZE):
+            batch_ids = ids[start:start + QUERY_BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch_ids))
+            rows = self.connection.execute(
+                f'SELECT {id_column}, data FROM {table} WHERE {id_column} IN ({placeholders})', batch_ids)
+            data_map.update(rows)
+        return [json.loads(data_map[id]) for id in dict.fromkeys(ids) if id in data_map]
+
+    def get_job_list(self, encrypt_job_ids: list[str]) -> list[JobListItem]:
+        return self.get_by_ids('job_list', 'encrypt_job_id', encrypt_job_ids)
+
+    def get_job_details(self, encrypt_ids: list[str]) -> list[JobDetailItem]:
+        return self.get_by_ids('job_detail', 'encrypt_id', encrypt_ids)
+
+    def search_job_details(self, query: str, limit: int = 20, match_all: bool = True) -> list[JobDetailItem]:
+        """按关键词全文搜索岗位名称、岗位描述和公司介绍, 按相关度从高到低排列"""
+        return [job_detail for job_detail, _ in self.full_text_index.search(query, limit, match_all)]
+
+    def count_job_details(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM job_detail').fetchone()[0]
+
+    def filter_job_details(self, user_input: UserInput) -> list[JobDetailItem]:
+        """
+        按用户输入过滤岗位详情, 与 util.common.filter_job_details 的过滤规则一致
+
+        :param user_input: 用户输入
+        :return: 过滤后的岗位详情, 按首次写入顺序排列
+        """
+        return list(self.iter_job_details(user_input))
+
+    def iter_all_job_details(self) -> Iterator[JobDetailItem]:
+        """逐条返回所有岗位详情, 按首次写入顺序排列"""
+        for data, in self.connection.execute('SELECT data FROM job_detail ORDER BY rowid'):
+            yield json.loads(data)
+
+    def iter_job_details(self, user_input: UserInput) -> Iterator[JobDetailItem]:
+        """逐条返回过滤后的岗位详情, 与 filter_job_details 一致, 不会一次读取所有岗位"""
+        filter_spec = FilterSpec.from_user_input(user_input)
+        conditions, params = [], []
+
+        degrees = sorted(filter_spec.degrees)
+        conditions.append(
+            f"(degree_name = '' OR degree_name IN ({','.join('?' * len(degrees))}))")
+        params.extend(degrees)
+
+        salary_condition = 'salary_daily = 0'
+        if filter_spec.salary_min is not None:
+            salary_condition += ' AND (salary_min IS NULL OR (salary_min <= ? AND ? <= salary_max))'
+            params.extend([filter_spec.salary_min, filter_spec.salary_min])
+        conditions.append(f"(salary_desc = '' OR ({salary_condition}))")
+
+        conditions.append("""(experience_name = '' OR experience_name = ? OR (
+            experience_min IS NOT NULL AND experience_min <= ?))""")
+        params.extend([filter_spec.experience, filter_spec.experience_min])
+
+        for word in filter_spec.ignore_words:
+            conditions.append('instr(job_name, ?) = 0')
+            params.append(word)
+
+        # 必须包含所有技能, 通过技能倒排索引查询
+        skills = sorted({normalize_skill(skill) for skill in user_input.get('skills') or []})
+        if skills:
+            conditions.append(f"""encrypt_id IN (
+                SELECT job_id FROM skill_index WHERE skill IN ({','.join('?' * len(skills))})
+                GROUP BY job_id HAVING COUNT(DISTINCT skill) = ?)""")
+            params.extend([*skills, len(skills)])
+
+        rows = self.connection.execute(
+            f"SELECT data FROM job_detail WHERE {' AND '.join(conditions)} ORDER BY rowid", params)
+        for data, in rows:
+            yield json.loads(data)
@@ -0,0 +1,191 @@
+"""
+技能倒排索引(SQLite)
+
+记录 技能 -> 岗位ID, 技能来自岗位列表的 skills、岗位详情的 showSkills,
+以及岗位描述(postDescription)中的英文技术名词(如 LangChain、RAG、C++、Node.js).
+技能统一转换为小写并合并常见别名(如 k8s -> kubernetes), 查询时的技能按同样的规则转换.
+
+索引与历史岗位数据库保存在同一个文件中, 由 JobRepository 在写入岗位时同步更新.
+查询时按技能读取岗位ID集合并缓存, 之后相同技能的 与/或 查询只需要集合运算.
+"""
+
+import re
+import sqlite3
+import unicodedata
+from typing import Iterable
+from functools import lru_cache
+
+from local_type import JobDetailItem, JobListItem
+
+# SQLite 单条语句的参数数量有限, 按批次查询
+QUERY_BATCH_SIZE = 500
+
+# 技能来源
+SOURCE_SKILLS = 1  # JobListItem.skills
+SOURCE_SHOW_SKILLS = 2  # jobInfo.showSkills
+SOURCE_DESCRIPTION = 3  # jobInfo.postDescription
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS skill_index (
+    skill TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    source INTEGER NOT NULL,
+    PRIMARY KEY (skill, job_id, source)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_skill_index_job_id ON skill_index (job_id);
+
+CREATE TABLE IF NOT EXISTS skill_name (
+    skill TEXT PRIMARY KEY,
+    name TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+# 常见别名, 统一为同一个技能
+SKILL_ALIASES = {
+    'k8s': 'kubernetes',
+    'golang': 'go',
+    'js': 'javascript',
+    'ts': 'typescript',
+    'postgres': 'postgresql',
+    'large language model': 'llm',
+    'llms': 'llm',
+}
+
+# 岗位描述中的英文单词, 支持 C++、C#、Node.js、scikit-learn、GPT-4 等形式
+DESCRIPTION_TERM_PATTERN = re.compile(r'[A-Za-z][A-Za-z0-9]*(?:[+#]+|(?:[.\-][A-Za-z0-9]+)+)?')
+
+# 岗位描述中不是技能的常见英文单词
+DESCRIPTION_STOP_WORDS = frozenset({
+    'a', 'an', 'and', 'or', 'the', 'to', 'of', 'in', 'on', 'for', 'with', 'is', 'are', 'be', 'as', 'at', 'by',
+    'etc', 'we', 'you', 'our', 'your', 'it', 'this', 'that', 'team', 'job', 'work', 'year', 'years',
+    'good', 'strong', 'skills', 'experience', 'knowledge', 'ability', 'plus', 'base', 'hr', 'boss', 'ok',
+})
+
+
+@lru_cache(maxsize=16384)
+def normalize_skill(skill: str) -> str:
+    """技能统一为小写, 合并全角字符、多余空格和常见别名"""
+    skill = ' '.join(unicodedata.normalize('NFKC', skill).lower().split())
+    return SKILL_ALIASES.get(skill, skill)
+
+
+def extract_description_terms(description: str) -> set[str]:
+    """提取岗位描述中的英文技术名词, 返回原始写法"""
+    terms = set()
+    for term in DESCRIPTION_TERM_PATTERN.findall(description or ''):
+        if len(term) >= 2 and term.lower() not in DESCRIPTION_STOP_WORDS:
+            terms.add(term)
+    return terms
+
+
+def get_job_list_skills(job: JobListItem) -> list[tuple[str, int]]:
+    return [(skill, SOURCE_SKILLS) for skill in job.get('skills') or []]
+
+
+def get_job_detail_skills(job_detail: JobDetailItem) -> list[tuple[str, int]]:
+    job_info = job_detail.get('jobInfo') or {}
+    skills = [(skill, SOURCE_SHOW_SKILLS) for skill in job_info.get('showSkills') or []]
+    skills += [(term, SOURCE_DESCRIPTION) for term in extract_description_terms(job_info.get('postDescription'))]
+    return skills
+
+
+class SkillIndex:
+    def __init__(self, connection: sqlite3.Connection):
+        """
+        :param connection: 历史岗位数据库的连接, 写入操作在调用方的事务中执行
+        """
+        self.connection = connection
+        self.connection.executescript(SCHEMA)
+        # 技能 -> 岗位ID集合, 写入后清空
+        self.postings: dict[str, frozenset[str]] = {}
+
+    def replace_skills(self, job_skills: list[tuple[str, list[tuple[str, int]]]], sources: tuple[int, ...]):
+        """
+        替换岗位在 sources 中的技能, 重复写入同一个岗位时不会留下旧的技能
+
+        只写入与已有索引不同的记录, 重复写入未变化的岗位时几乎没有写入
+        :param job_skills: [(岗位ID, [(技能原始写法, 来源)])]
+        :param sources: 本次写入的技能来源
+        """
+        rows, names = set(), {}
+        for job_id, skills in job_skills:
+            for name, source in skills:
+                skill = normalize_skill(name)
+                if skill:
+                    rows.add((skill, job_id, source))
+                    names.setdefault(skill, name.strip())
+
+        existing_rows = set()
+        job_ids = list(dict.fromkeys(job_id for job_id, _ in job_skills))
+        for start in range(0, len(job_ids), QUERY_BATCH_SIZE):
+            batch_ids = job_ids[start:start + QUERY_BATCH_SIZE]
+            existing_rows.update(self.connection.execute(f"""
+                SELECT skill, job_id, source FROM skill_index
+                WHERE job_id IN ({','.join('?' * len(batch_ids))}) AND source IN ({','.join('?' * len(sources))})
+            """, [*batch_ids, *sources]))
+
+        self.connection.executemany(
+            'DELETE FROM skill_index WHERE skill = ? AND job_id = ? AND source = ?', existing_rows - rows)
+        # 按主键顺序写入, 减少 B 树页的随机写入
+        self.connection.executemany(
+            'INSERT INTO skill_index (skill, job_id, source) VALUES (?, ?, ?)', sorted(rows - existing_rows))
+        self.connection.executemany(
+            'INSERT OR IGNORE INTO skill_name (skill, name) VALUES (?, ?)', names.items())
+        self.postings.clear()
+
+    def add_job_list(self, job_list: Iterable[JobListItem]):
+        """写入岗位列表的技能标签"""
+        self.replace_skills([(job['encryptJobId'], get_job_list_skills(job))
+                             for job in job_list if job.get('encryptJobId')], (SOURCE_SKILLS,))
+
+    def add_job_details(self, job_details: Iterable[JobDetailItem]):
+        """写入岗位详情的技能标签和岗位描述中的技术名词"""
+        self.replace_skills([(job_detail['jobInfo']['encryptId'], get_job_detail_skills(job_detail))
+                             for job_detail in job_details if job_detail.get('jobInfo', {}).get('encryptId')],
+                            (SOURCE_SHOW_SKILLS, SOURCE_DESCRIPTION))
+
+    def clear(self):
+        self.connection.execute('DELETE FROM skill_index')
+        self.connection.execute('DELETE FROM skill_name')
+        self.postings.clear()
+
+    def get_job_ids(self, skill: str) -> frozenset[str]:
+        """包含该技能的岗位ID"""
+        skill = normalize_skill(skill)
+        if skill not in self.postings:
+            rows = self.connection.execute('SELECT DISTINCT job_id FROM skill_index WHERE skill = ?', (skill,))
+            self.postings[skill] = frozenset(job_id for job_id, in rows)
+        return self.postings[skill]
+
+    def query(self, all_skills: Iterable[str] = (), any_skills: Iterable[str] = ()) -> set[str]:
+        """
+        按技能查询岗位ID
+
+        :param all_skills: 必须包含所有技能(与)
+        :param any_skills: 至少包含其中一个技能(或)
+        :return: 岗位ID, 两个参数都为空时返回空集合
+        """
+        job_id_sets = sorted((self.get_job_ids(skill) for skill in all_skills), key=len)
+        if any_skills:
+            job_id_sets.append(frozenset().union(*(self.get_job_ids(skill) for skill in any_skills)))
+        if not job_id_sets:
+            return set()
+        return set(job_id_sets[0]).intersection(*job_id_sets[1:])
+
+    def count(self, limit: int = 20, sources: tuple[int, ...] = ()) -> list[tuple[str, int]]:
+        """
+        统计包含每个技能的岗位数量
+
+        :param limit: 返回的技能数量, 按岗位数量从多到少排列
+        :param sources: 只统计这些来源的技能, 为空时统计所有来源
+        :return: [(技能名称, 岗位数量)], 技能名称为第一次出现时的写法
+        """
+        condition = f"WHERE source IN ({','.join('?' * len(sources))})" if sources else ''
+        rows = self.connection.execute(f"""
+            SELECT skill_name.name, counts.job_count FROM (
+                SELECT skill, COUNT(DISTINCT job_id) AS job_count FROM skill_index {condition}
+                GROUP BY skill ORDER BY job_count DESC, skill LIMIT ?
+            ) AS counts JOIN skill_name USING (skill)
+            ORDER BY counts.job_count DESC, counts.skill
+        """, [*sources, limit])
+        return rows.fetchall()
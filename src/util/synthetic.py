@@ -0,0 +1,169 @@
+"""
+生成模拟的岗位列表和岗位详情数据, 用于本地模拟服务和性能测试
+"""
+
+import random
+import hashlib
+
+from local_type import JobDetailItem, JobListItem
+
+SALARY_DESCS = [
+    '10-15K', '15-25K', '20-30K', '20-30K·13薪', '25-40K·14薪', '30-50K',
+    '30-60K·15薪', '40-70K·16薪', '50-80K·15薪', '150-200元/天', '面议',
+]
+EXPERIENCE_NAMES = ['经验不限', '在校/应届', '1年以内',
+                    '1-3年', '3-5年', '5-10年', '10年以上']
+DEGREE_NAMES = ['学历不限', '大专', '本科', '硕士', '博士']
+CITIES = [
+    (101280600, '深圳'), (101010100, '北京'), (101020100, '上海'),
+    (101210100, '杭州'), (101280100, '广州'), (101270100, '成都'),
+]
+INDUSTRIES = ['互联网', '电子商务', '人工智能', '计算机软件', '金融', '游戏']
+SCALES = ['0-20人', '20-99人', '100-499人', '500-999人', '1000-9999人', '10000人以上']
+STAGES = ['未融资', '天使轮', 'A轮', 'B轮', 'C轮', 'D轮及以上', '已上市', '不需要融资']
+JOB_TITLES = [
+    'AI Agent 开发工程师', '大模型算法工程师', '前端开发工程师', 'Python 后端开发',
+    'Java 开发工程师', '数据分析师', '产品经理', '测试工程师', '运维开发工程师', 'NLP 算法工程师',
+]
+SKILLS = [
+    'Python', 'LangChain', 'RAG', 'PyTorch', 'Java', 'Go', 'React', 'TypeScript', 'Vue',
+    'MySQL', 'Redis', 'Kafka', 'Docker', 'Kubernetes', 'LLM', 'Prompt', 'Transformer', 'NLP',
+]
+DESCRIPTION_LINES = [
+    '负责大模型应用的整体架构设计与核心模块开发',
+    '参与 AI Agent 平台的规划, 推动多智能体协作能力落地',
+    '基于 LangChain、LlamaIndex 等框架搭建 RAG 检索增强系统',
+    '负责业务数据的清洗、标注与评测集建设, 持续优化模型效果',
+    '与产品、算法团队紧密合作, 快速迭代线上功能',
+    '熟悉 Python 或 Java, 具备扎实的数据结构和算法基础',
+    '熟悉 MySQL、Redis、Kafka 等常用中间件, 有高并发系统经验优先',
+    '了解 Transformer 结构, 有模型微调、Prompt 工程经验者优先',
+    '具备良好的沟通能力和团队协作精神, 能独立解决复杂问题',
+    '有前端工程化经验, 熟悉 React 或 Vue 技术栈',
+    '负责服务的容器化部署与监控, 熟悉 Docker、Kubernetes',
+    '本科及以上学历, 计算机、数学、统计等相关专业',
+    '对新技术保持好奇心, 有开源项目贡献者优先',
+    '参与技术方案评审和代码评审, 保障交付质量',
+]
+BOSS_ACTIVE_TIME_DESCS = ['刚刚活跃', '今日活跃', '3日内活跃', '本周活跃', '本月活跃', '半年前活跃']
+
+
+def get_encrypt_id(prefix: str, key: int | str, seed: int):
+    return hashlib.md5(f'{prefix}-{seed}-{key}'.encode()).hexdigest()[:22] + '1XQ~~'
+
+
+def make_job_list_item(index: int, rng: random.Random, seed: int = 0) -> JobListItem:
+    """生成一条岗位列表数据"""
+    city, city_name = rng.choice(CITIES)
+    experience, degree = rng.choice(EXPERIENCE_NAMES), rng.choice(DEGREE_NAMES)
+    encrypt_job_id = get_encrypt_id('job', index, seed)
+    return JobListItem(
+        brandIndustry=rng.choice(INDUSTRIES),
+        brandLogo='https://img.bosszhipin.com/beijin/mcs/banner/logo.png',
+        brandName=f'模拟科技{index % 997}',
+        brandScaleName=rng.choice(SCALES),
+        brandStageName=rng.choice(STAGES),
+        city=city,
+        cityName=city_name,
+        jobDegree=degree,
+        jobExperience=experience,
+        jobLabels=[experience, degree],
+        jobName=rng.choice(JOB_TITLES),
+        lid=f'{encrypt_job_id}.search.{index}',
+        salaryDesc=rng.choice(SALARY_DESCS),
+        securityId=f'sec-{encrypt_job_id}',
+        skills=rng.sample(SKILLS, rng.randint(2, 5)),
+        welfareList=['五险一金', '带薪年假', '定期体检'][:rng.randint(0, 3)],
+        encryptJobId=encrypt_job_id,
+    )
+
+
+def make_job_detail_item(job: JobListItem, rng: random.Random, description_lines: int | None = None) -> JobDetailItem:
+    """根据岗位列表数据生成对应的岗位详情"""
+    line_count = description_lines or rng.randint(8, 20)
+    description = '\n'.join(f'{i}、{rng.choice(DESCRIPTION_LINES)}'
+                            for i in range(1, line_count + 1))
+    return {
+        'pageType': 0,
+        'selfAccess': False,
+        'securityId': job['securityId'],
+        'sessionId': None,
+        'lid': job['lid'],
+        'jobInfo': {
+            'encryptId': job['encryptJobId'],
+            'encryptUserId': get_encrypt_id('boss', job['encryptJobId'], 0),
+            'invalidStatus': False,
+            'jobName': job['jobName'],
+            'position': 100101,
+            'positionName': job['jobName'],
+            'location': job['city'],
+            'locationName': job['cityName'],
+            'experienceName': job['jobExperience'],
+            'degreeName': job['jobDegree'],
+            'jobType': 0,
+            'proxyJob': int(rng.random() < 0.1),
+            'proxyType': 0,
+            'salaryDesc': job['salaryDesc'],
+            'payTypeDesc': None,
+            'postDescription': description,
+            'encryptAddressId': '',
+            'address': f"{job['cityName']}市模拟区科技园",
+            'longitude': 113.94,
+            'latitude': 22.54,
+            'staticMapUrl': 'https://img.bosszhipin.com/map/static.png',
+            'pcStaticMapUrl': 'https://img.bosszhipin.com/map/pc_static.png',
+            'baiduStaticMapUrl': 'https://api.map.baidu.com/staticimage',
+            'baiduPcStaticMapUrl': 'https://api.map.baidu.com/staticimage',
+            'overseasAddressList': [],
+            'overseasInfo': None,
+            'showSkills': job['skills'],
+            'anonymous': 0,
+            'jobStatusDesc': '最新',
+        },
+        'bossInfo': {
+            'name': '模拟招聘者',
+            'title': '招聘经理',
+            'tiny': '',
+            'large': '',
+            'activeTimeDesc': rng.choice(BOSS_ACTIVE_TIME_DESCS),
+            'bossOnline': rng.random() < 0.3,
+            'brandName': job['brandName'],
+            'bossSource': 0,
+            'certificated': True,
+            'tagIconUrl': None,
+            'avatarStickerUrl': None,
+        },
+        'brandComInfo': {
+            'encryptBrandId': get_encrypt_id('brand', job['brandName'], 0),
+            'brandName': job['brandName'],
+            'logo': job['brandLogo'],
+            'stage': 0,
+            'stageName': job['brandStageName'],
+            'scale': 0,
+            'scaleName': job['brandScaleName'],
+            'industry': 0,
+            'industryName': job['brandIndustry'],
+            'introduce': f"{job['brandName']}专注于{job['brandIndustry']}领域的技术创新。",
+            'labels': [],
+            'activeTime': 0,
+            'visibleBrandInfo': True,
+            'focusBrand': False,
+            'customerBrandName': job['brandName'],
+            'customerBrandStageName': job['brandStageName'],
+        },
+    }
+
+
+def make_jobs(count: int, seed: int = 0, description_lines: int | None = None):
+    """
+    生成 count 条岗位列表和对应的岗位详情
+
+    :param count: 岗位数量
+    :param seed: 随机种子, 相同的种子生成相同的数据
+    :param description_lines: 岗位描述行数, 默认随机 8-20 行
+    :return: (岗位列表, 岗位详情)
+    """
+    rng = random.Random(seed)
+    job_list = [make_job_list_item(index, rng, seed) for index in range(count)]
+    job_details = [make_job_detail_item(job, rng, description_lines) for job in job_list]
+    return job_list, job_details
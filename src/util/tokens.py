@@ -0,0 +1,31 @@
+"""
+提示词 token 数量估算
+
+不依赖具体模型的分词器, 按字符类型近似估算:
+中日韩字符每个字符约 1 个 token, ASCII 字符约 4 个字符 1 个 token.
+"""
+
+import math
+
+# 每个中日韩字符的 token 数
+CJK_TOKENS_PER_CHAR = 1.0
+# 每个 token 的 ASCII 字符数
+ASCII_CHARS_PER_TOKEN = 4.0
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    估算文本的 token 数量
+
+    中日韩字符的 UTF-8 编码为 3 个字节, ASCII 字符为 1 个字节,
+    通过编码后的字节数和字符数之差得到非 ASCII 字符数, 不需要逐个字符判断,
+    可以在很短的时间内估算大量岗位描述
+    """
+    if not text:
+        return 0
+
+    char_count = len(text)
+    byte_count = len(text.encode('utf-8'))
+    cjk_count = min(char_count, (byte_count - char_count) // 2)
+    ascii_count = char_count - cjk_count
+    return math.ceil(cjk_count * CJK_TOKENS_PER_CHAR + ascii_count / ASCII_CHARS_PER_TOKEN)
@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from batch import BatchScheduler, BatchSpec, expand_tasks
+from util.fs import read_json, read_jsonl
+from util.repository import JobRepository
+from util.synthetic import make_jobs
+
+
+class FakeTab:
+    """代替 BossSpider 的标签页, 按岗位名称返回预先设置的搜索结果"""
+
+    def __init__(self, spider: 'FakeSpider'):
+        self.spider = spider
+        self.page = None
+        self.filter_spec = None
+        self.job_list, self.matched_job_list, self.job_details = [], [], []
+
+    async def goto_search_page(self, url):
+        pass
+
+    async def register_routes(self):
+        pass
+
+    async def crawl_job_name(self, job_name, max_size):
+        self.spider.events.append(job_name)
+        result = self.spider.results[job_name].pop(0)
+        if isinstance(result, Exception):
+            raise result
+        await asyncio.sleep(0.01)
+        self.job_list, self.job_details = result
+        self.matched_job_list = self.job_list
+
+
+class FakeSpider:
+    def __init__(self, results: dict):
+        self.results = results
+        self.events: list[str] = []
+        self.detail_job_ids: set[str] = set()
+
+    async def open_tab(self):
+        return FakeTab(self)
+
+    def get_search_url(self, user_input):
+        return ''
+
+    async def run_in_executor(self, func, *args):
+        return func(*args)
+
+    async def wait_pending_tasks(self):
+        pass
+
+
+@pytest.fixture
+def jobs(tmp_path, monkeypatch):
+    # 历史岗位数据库和岗位数据文件使用 data/ 下的相对路径
+    monkeypatch.chdir(tmp_path)
+    return make_jobs(6, seed=4)
+
+
+def get_spec(tmp_path, **kwargs):
+    return BatchSpec(**{'job_names': ['a', 'b'], 'retries': 1, 'retry_delay': 0.05,
+                        'concurrency': 1, 'output_dir': str(tmp_path / 'batch'), **kwargs})
+
+
+def get_task_files(scheduler: BatchScheduler, index: int):
+    task_dir = scheduler.get_task_dir(scheduler.tasks[index])
+    return read_jsonl(f'{task_dir}/joblist.jsonl'), read_jsonl(f'{task_dir}/jobdetail.jsonl')
+
+
+def test_expand_tasks_covers_all_combinations():
+    spec = BatchSpec(job_names=['a', 'b'], cities=['1', '2'], degrees=['本科'],
+                     salaries=['20-30K', '30-50K'], experiences=['3'])
+    tasks = expand_tasks(spec)
+
+    assert len(tasks) == 8
+    assert len({task.task_id for task in tasks}) == 8
+    assert [task.task_id for task in expand_tasks(spec)] == [task.task_id for task in tasks]
+    assert {(task.user_input['job_names'][0], task.user_input['city'], task.user_input['salary'])
+            for task in tasks} == {(name, city, salary) for name in 'ab' for city in '12'
+                                   for salary in ('20-30K', '30-50K')}
+
+
+def test_retry_backoff_releases_concurrency_slot(tmp_path, jobs):
+    job_list, job_details = jobs
+    spider = FakeSpider({
+        'a': [RuntimeError('页面关闭'), (job_list[:3], job_details[:3])],
+        'b': [(job_list[3:], job_details[3:])],
+    })
+    scheduler = BatchScheduler(spider, get_spec(tmp_path))
+
+    assert asyncio.run(scheduler.run()) == (2, 0)
+    # a 第一次失败后等待重试时, b 可以使用唯一的并发数量
+    assert spider.events == ['a', 'b', 'a']
+    status = scheduler.statuses[scheduler.tasks[0].task_id]
+    assert (status['status'], status['attempts'], status['job_count']) == ('done', 2, 3)
+    assert get_task_files(scheduler, 0) == (job_list[:3], job_details[:3])
+    assert read_json(scheduler.manifest_path)['tasks'] == scheduler.statuses
+    with JobRepository() as repository:
+        assert repository.count_job_details() == 6
+
+
+def test_details_fetched_by_other_tasks_are_completed(tmp_path, jobs):
+    job_list, job_details = jobs
+    # 两个任务都搜索到第 3 个岗位, 详情只由 b 获取
+    spider = FakeSpider({
+        'a': [(job_list[:3], job_details[:2])],
+        'b': [(job_list[2:], job_details[2:])],
+    })
+    scheduler = BatchScheduler(spider, get_spec(tmp_path))
+
+    asyncio.run(scheduler.run())
+
+    assert get_task_files(scheduler, 0) == (job_list[:3], job_details[:3])
+    assert scheduler.statuses[scheduler.tasks[0].task_id]['job_detail_count'] == 3
+
+
+def test_resume_verifies_done_tasks(tmp_path, jobs):
+    job_list, job_details = jobs
+    spec = get_spec(tmp_path)
+    asyncio.run(BatchScheduler(FakeSpider({
+        'a': [(job_list[:3], job_details[:3])],
+        'b': [(job_list[3:], job_details[3:])],
+    }), spec).run())
+
+    # b 的结果文件被截断, a 的岗位不在历史岗位数据库中
+    task_dir = f'{spec.output_dir}/{expand_tasks(spec)[1].task_id}'
+    with open(f'{task_dir}/jobdetail.jsonl', 'r+', encoding='utf-8') as f:
+        f.truncate(len(f.readline()))
+    with JobRepository() as repository:
+        repository.connection.execute('DELETE FROM job_detail')
+        repository.connection.commit()
+
+    spider = FakeSpider({'b': [(job_list[3:], job_details[3:])]})
+    scheduler = BatchScheduler(spider, spec)
+    assert asyncio.run(scheduler.run()) == (2, 0)
+
+    assert spider.events == ['b']
+    assert {job_detail['jobInfo']['encryptId'] for job_detail in job_details[:3]} <= spider.detail_job_ids
+    assert get_task_files(scheduler, 1) == (job_list[3:], job_details[3:])
+    with JobRepository() as repository:
+        assert repository.count_job_details() == 6
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from util.checkpoint import CrawlCheckpoint, get_checkpoint_key
+
+USER_INPUT = {
+    'degree': '本科', 'salary': '30-50K', 'experience': '3', 'max_size': 100,
+    'job_names': ['ai agent', '大模型'], 'other_info': '', 'user_job_details': False,
+}
+
+
+def save(checkpoint: CrawlCheckpoint):
+    checkpoint.write(checkpoint.to_dict())
+
+
+def test_key_depends_on_search_conditions_only():
+    key = get_checkpoint_key(USER_INPUT, 'ZHIPIN')
+
+    assert get_checkpoint_key({**USER_INPUT, 'other_info': '熟悉 Python'}, 'ZHIPIN') == key
+    assert get_checkpoint_key({**USER_INPUT, 'salary': '20-30K'}, 'ZHIPIN') != key
+    assert get_checkpoint_key({**USER_INPUT, 'city': '101280600'}, 'ZHIPIN') != key
+    assert get_checkpoint_key(USER_INPUT, 'MOCK') != key
+
+
+def test_load_restores_progress_for_same_search(tmp_path):
+    file_path = str(tmp_path / 'checkpoint.json')
+    checkpoint = CrawlCheckpoint(10, file_path)
+    checkpoint.reset(USER_INPUT, 'ZHIPIN')
+    checkpoint.complete('ai agent')
+    checkpoint.mark_page('大模型', 1)
+    checkpoint.mark_page('大模型', 2)
+    checkpoint.add_detail_ids(['a', 'b'])
+    save(checkpoint)
+
+    restored = CrawlCheckpoint(10, file_path)
+    assert restored.load(USER_INPUT, 'ZHIPIN')
+    assert restored.is_completed('ai agent') and not restored.is_completed('大模型')
+    assert restored.detail_ids == {'a', 'b'}
+    assert restored.is_restored_page('大模型', 2) and not restored.is_restored_page('大模型', 3)
+    assert not restored.is_restored_page('ai agent', 1)
+
+    assert not CrawlCheckpoint(10, file_path).load({**USER_INPUT, 'degree': '硕士'}, 'ZHIPIN')
+
+
+def test_pages_only_advance_when_contiguous(tmp_path):
+    checkpoint = CrawlCheckpoint(10, str(tmp_path / 'checkpoint.json'))
+    checkpoint.reset(USER_INPUT, 'ZHIPIN')
+    checkpoint.mark_page('大模型', 1)
+    # 第 2 页写入失败时, 后面的分页不能视为已写入
+    checkpoint.mark_page('大模型', 3)
+    assert checkpoint.pages == {'大模型': 1}
+
+    checkpoint.mark_page('大模型', 2)
+    checkpoint.mark_page('大模型', 3)
+    assert checkpoint.pages == {'大模型': 3}
+    # 新写入的分页在本次运行中不是恢复的分页
+    assert not checkpoint.is_restored_page('大模型', 1)
+
+
+def test_failed_write_keeps_previous_checkpoint(tmp_path):
+    file_path = tmp_path / 'checkpoint.json'
+    checkpoint = CrawlCheckpoint(10, str(file_path))
+    checkpoint.reset(USER_INPUT, 'ZHIPIN')
+    checkpoint.complete('ai agent')
+    save(checkpoint)
+
+    data = checkpoint.to_dict()
+    data['detail_ids'] = [object()]
+    with pytest.raises(TypeError):
+        checkpoint.write(data)
+
+    assert json.loads(file_path.read_text(encoding='utf-8'))['completed_job_names'] == ['ai agent']
+    assert CrawlCheckpoint(10, str(file_path)).load(USER_INPUT, 'ZHIPIN')
+
+
+def test_corrupted_checkpoint_is_ignored(tmp_path):
+    file_path = tmp_path / 'checkpoint.json'
+    file_path.write_text('{"key": ', encoding='utf-8')
+
+    assert not CrawlCheckpoint(10, str(file_path)).load(USER_INPUT, 'ZHIPIN')
+
+
+def test_is_due_after_interval(tmp_path):
+    checkpoint = CrawlCheckpoint(3600, str(tmp_path / 'checkpoint.json'))
+    checkpoint.reset(USER_INPUT, 'ZHIPIN')
+
+    assert checkpoint.is_due()
+    save(checkpoint)
+    assert not checkpoint.is_due()
@@ -0,0 +1,78 @@
+import types
+
+import pytest
+
+import util.detail_cache
+from util.detail_cache import DetailCache
+from util.synthetic import make_jobs
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """可以手动调整的时间, 代替 detail_cache 模块中的 time"""
+    clock = types.SimpleNamespace(now=1_000_000.0)
+    clock.time = lambda: clock.now
+    monkeypatch.setattr(util.detail_cache, 'time', clock)
+    return clock
+
+
+@pytest.fixture(scope='module')
+def job_details():
+    _, job_details = make_jobs(10, seed=3)
+    return job_details
+
+
+def get_id(job_detail):
+    return job_detail['jobInfo']['encryptId']
+
+
+def test_get_many_returns_cached_details(tmp_path, clock, job_details):
+    with DetailCache(60, 100, str(tmp_path / 'cache.db')) as cache:
+        cache.put_many(job_details[:3])
+        ids = [get_id(job_detail) for job_detail in job_details[:5]]
+
+        assert cache.get_many(ids) == {get_id(job_detail): job_detail for job_detail in job_details[:3]}
+        assert (cache.hits, cache.misses) == (3, 2)
+
+
+def test_expired_details_are_not_returned_and_removed_on_open(tmp_path, clock, job_details):
+    db_path = str(tmp_path / 'cache.db')
+    with DetailCache(60, 100, db_path) as cache:
+        cache.put_many(job_details[:2])
+        clock.now += 30
+        cache.put_many(job_details[2:3])
+        clock.now += 40
+
+        assert list(cache.get_many([get_id(job_detail) for job_detail in job_details[:3]])) == [
+            get_id(job_details[2])]
+
+    with DetailCache(60, 100, db_path) as cache:
+        assert cache.size == cache.count() == 1
+
+
+def test_least_recently_used_details_are_evicted(tmp_path, clock, job_details):
+    with DetailCache(3600, 3, str(tmp_path / 'cache.db')) as cache:
+        for job_detail in job_details[:3]:
+            cache.put_many([job_detail])
+            clock.now += 1
+        # 访问第一个岗位后, 最久未使用的是第二个岗位
+        cache.get_many([get_id(job_details[0])])
+        clock.now += 1
+        cache.put_many(job_details[3:5])
+
+        assert cache.size == cache.count() == 3
+        cached = cache.get_many([get_id(job_detail) for job_detail in job_details[:5]])
+        assert set(cached) == {get_id(job_details[0]), get_id(job_details[3]), get_id(job_details[4])}
+
+
+def test_size_tracks_updates_and_duplicates(tmp_path, clock, job_details):
+    db_path = str(tmp_path / 'cache.db')
+    with DetailCache(3600, 100, db_path) as cache:
+        cache.put_many(job_details[:4])
+        cache.put_many([*job_details[2:6], job_details[5]])
+
+        assert cache.size == cache.count() == 6
+
+    # 重新打开时容量变小, 淘汰到 max_size 条记录
+    with DetailCache(3600, 2, db_path) as cache:
+        assert cache.size == cache.count() == 2
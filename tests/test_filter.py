@@ -0,0 +1,88 @@
+import pytest
+
+from config import degree_map, job_ignore_names
+from util.common import (FilterSpec, filter_job_details, does_degree_match, does_salary_match,
+                         does_experience_match, does_job_name_match)
+from util.repository import JobRepository
+from util.synthetic import make_jobs
+
+SALARIES = ['20-30K', '30-50K', '50-100K', '40-50K']
+EXPERIENCES = ['1', '3', '3-5年', '10']
+# 旧的 does_experience_match 无法解析不含数字的经验, FilterSpec 和 SQL 过滤需要保持一致
+ALL_EXPERIENCES = EXPERIENCES + ['经验不限', '在校/应届']
+
+
+def get_user_input(degree: str, salary: str, experience: str):
+    return {'degree': degree, 'salary': salary, 'experience': experience, 'job_names': []}
+
+
+def get_ids(job_details):
+    return [job_detail['jobInfo']['encryptId'] for job_detail in job_details]
+
+
+@pytest.fixture(scope='module')
+def job_details():
+    _, job_details = make_jobs(500, seed=1)
+    # 补充空字段和无法解析的描述, 与接口偶尔返回的数据一致
+    job_details[0]['jobInfo'].update(salaryDesc='', degreeName='', experienceName='')
+    job_details[1]['jobInfo'].update(salaryDesc='薪资面议', experienceName='经验不限')
+    job_details[2]['jobInfo'].update(jobName='')
+    return job_details
+
+
+@pytest.fixture(scope='module')
+def repository(job_details, tmp_path_factory):
+    repository = JobRepository(str(tmp_path_factory.mktemp('db') / 'jobs.db'))
+    repository.upsert_job_details(job_details)
+    yield repository
+    repository.close()
+
+
+@pytest.mark.parametrize('degree', list(degree_map))
+@pytest.mark.parametrize('salary', SALARIES)
+@pytest.mark.parametrize('experience', EXPERIENCES)
+def test_filter_spec_matches_legacy_filters(job_details, degree, salary, experience):
+    user_input = get_user_input(degree, salary, experience)
+    expected = [
+        job_detail for job_detail in job_details
+        if does_degree_match(job_detail['jobInfo']['degreeName'], degree)
+        and does_salary_match(job_detail['jobInfo']['salaryDesc'], salary)
+        and does_experience_match(job_detail['jobInfo']['experienceName'], experience)
+        and does_job_name_match(job_detail['jobInfo']['jobName'], job_ignore_names)
+    ]
+
+    assert get_ids(filter_job_details(job_details, user_input)) == get_ids(expected)
+
+
+@pytest.mark.parametrize('degree', list(degree_map))
+@pytest.mark.parametrize('salary', SALARIES)
+@pytest.mark.parametrize('experience', ALL_EXPERIENCES)
+def test_repository_filter_matches_filter_spec(repository, job_details, degree, salary, experience):
+    user_input = get_user_input(degree, salary, experience)
+    expected = get_ids(filter_job_details(job_details, user_input))
+
+    assert get_ids(repository.filter_job_details(user_input)) == expected
+    assert get_ids(repository.iter_job_details(user_input)) == expected
+
+
+def test_filter_spec_parses_user_input_once():
+    filter_spec = FilterSpec.from_user_input(get_user_input('硕士', '30-50K', '3-5年'), ['销售'])
+
+    assert filter_spec.degrees == frozenset(degree_map['硕士'])
+    assert (filter_spec.salary_min, filter_spec.experience_min) == (30, 3)
+    assert filter_spec.match('本科', '25-40K·14薪', '1-3年', 'Python 开发')
+    assert not filter_spec.match('本科', '150-200元/天', '1-3年', 'Python 开发')
+    assert not filter_spec.match('本科', '25-40K', '5-10年', 'Python 开发')
+    assert not filter_spec.match('本科', '25-40K', '1-3年', '销售经理')
+    assert filter_spec.match('', '', '', '')
+
+
+def test_repository_upsert_keeps_latest_data(tmp_path, job_details):
+    with JobRepository(str(tmp_path / 'jobs.db')) as repository:
+        repository.upsert_job_details(job_details[:10])
+        updated = {**job_details[3], 'jobInfo': {**job_details[3]['jobInfo'], 'salaryDesc': '30-60K'}}
+        repository.upsert_job_details([updated])
+
+        assert repository.count_job_details() == 10
+        assert get_ids(repository.iter_all_job_details()) == get_ids(job_details[:10])
+        assert repository.get_job_details([updated['jobInfo']['encryptId']]) == [updated]
@@ -0,0 +1,92 @@
+import pytest
+
+from util.full_text import get_match_query, tokenize
+from util.repository import JobRepository
+
+
+def make_job_detail(encrypt_id: str, job_name: str, description: str, introduce: str = ''):
+    return {
+        'jobInfo': {'encryptId': encrypt_id, 'jobName': job_name, 'postDescription': description,
+                    'salaryDesc': '', 'degreeName': '', 'experienceName': ''},
+        'brandComInfo': {'introduce': introduce},
+    }
+
+
+def search_ids(repository: JobRepository, query: str, match_all: bool = True):
+    return [job_detail['jobInfo']['encryptId'] for job_detail in repository.search_job_details(query, 20, match_all)]
+
+
+def check_integrity(repository: JobRepository):
+    repository.connection.execute("INSERT INTO job_fts (job_fts, rank) VALUES ('integrity-check', 0)")
+
+
+@pytest.fixture
+def repository(tmp_path):
+    with JobRepository(str(tmp_path / 'jobs.db')) as repository:
+        yield repository
+
+
+def test_tokenize_splits_cjk_into_bigrams():
+    assert tokenize('大模型 RAG 应用, 熟悉Node.js和C++、C#') == [
+        '大模', '模型', 'rag', '应用', '熟悉', 'node.js', '和', 'c++', 'c#']
+    assert tokenize('ＧＰＴ-4 云') == ['gpt-4', '云']
+    assert tokenize(None) == []
+
+
+def test_get_match_query():
+    assert get_match_query('大模型 RAG') == '"大模 模型" AND "rag"'
+    assert get_match_query('大模型 RAG', match_all=False) == '"大模 模型" OR "rag"'
+    assert get_match_query('云 ，') == '"云"*'
+    assert get_match_query(' 、 ') == ''
+
+
+def test_search_matches_cjk_phrases(repository):
+    repository.upsert_job_details([
+        make_job_detail('a', 'AI 应用工程师', '负责大模型应用开发, 搭建 RAG 系统'),
+        make_job_detail('b', '后端开发', '负责大模块和模型服务'),
+        make_job_detail('c', '数据工程师', '熟悉 Kafka', '专注云计算'),
+    ])
+
+    assert search_ids(repository, '大模型') == ['a']
+    assert search_ids(repository, '大模型 rag') == ['a']
+    assert search_ids(repository, '大模型 kafka') == []
+    assert sorted(search_ids(repository, '大模型 kafka', match_all=False)) == ['a', 'c']
+    assert search_ids(repository, '云') == ['c']
+    assert search_ids(repository, '，') == []
+
+
+def test_job_name_ranks_above_description(repository):
+    repository.upsert_job_details([
+        make_job_detail('a', '后端开发', '与数据分析师合作'),
+        make_job_detail('b', '数据分析师', '负责报表开发'),
+    ])
+
+    assert search_ids(repository, '数据分析') == ['b', 'a']
+
+
+def test_upsert_replaces_previous_index(repository):
+    repository.upsert_job_details([make_job_detail('a', '算法工程师', '熟悉 RAG')])
+    repository.upsert_job_details([make_job_detail('a', '算法工程师', '熟悉 Kafka'),
+                                   make_job_detail('b', '测试工程师', '熟悉 RAG')])
+    # 同一批次中重复的岗位以最后一个为准
+    repository.upsert_job_details([make_job_detail('b', '测试工程师', '熟悉 Redis'),
+                                   make_job_detail('b', '测试工程师', '熟悉 Go')])
+
+    assert search_ids(repository, 'rag') == []
+    assert search_ids(repository, 'kafka') == ['a']
+    assert search_ids(repository, 'redis') == []
+    assert search_ids(repository, 'go') == ['b']
+    assert sorted(search_ids(repository, '工程师')) == ['a', 'b']
+    check_integrity(repository)
+
+
+def test_index_is_rebuilt_when_version_changes(tmp_path):
+    db_path = str(tmp_path / 'jobs.db')
+    with JobRepository(db_path) as repository:
+        repository.upsert_job_details([make_job_detail('a', '算法工程师', '熟悉 Kafka')])
+        repository.connection.execute('PRAGMA user_version = 0')
+
+    with JobRepository(db_path) as repository:
+        assert search_ids(repository, 'kafka') == ['a']
+        assert repository.skill_index.query(all_skills=['kafka']) == {'a'}
+        check_integrity(repository)
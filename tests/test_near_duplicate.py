@@ -0,0 +1,111 @@
+import random
+
+import numpy as np
+import pytest
+
+from util.near_duplicate import (NUM_PERM, CANDIDATE_PROBABILITY, SHINGLE_SIZE, MERSENNE_PRIME, IGNORE_PATTERN,
+                                 NearDuplicateDetector, drop_near_duplicates, get_lsh_params, get_minhash,
+                                 get_shingle_hashes, hash_shingles, _HASH_A, _HASH_B)
+
+
+def make_text(rng: random.Random, length: int = 400) -> str:
+    return ''.join(chr(0x4e00 + rng.randrange(3000)) for _ in range(length))
+
+
+def edit_text(text: str, rng: random.Random, count: int) -> str:
+    """替换 count 个分散的字符"""
+    chars = list(text)
+    for index in rng.sample(range(len(chars)), count):
+        chars[index] = chr(0x9000 + rng.randrange(1000))
+    return ''.join(chars)
+
+
+def get_jaccard(text1: str, text2: str) -> float:
+    shingles1, shingles2 = ({text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+                            for text in (text1, text2))
+    return len(shingles1 & shingles2) / len(shingles1 | shingles2)
+
+
+def make_job_detail(encrypt_id: str, description: str):
+    return {'jobInfo': {'encryptId': encrypt_id, 'postDescription': description}}
+
+
+def test_hash_shingles_matches_big_int_arithmetic():
+    shingles = np.array([0, 1, 12345, 0x7FFFFFFF, 0xFFFFFFFF,
+                         *np.random.default_rng(0).integers(0, 1 << 32, 100)], dtype=np.uint64)
+    hashes = hash_shingles(shingles)
+
+    for index in range(NUM_PERM):
+        a, b = int(_HASH_A[index]), int(_HASH_B[index])
+        assert hashes[index].tolist() == [(a * int(x) + b) % MERSENNE_PRIME for x in shingles]
+
+
+@pytest.mark.parametrize('threshold', [0.5, 0.6, 0.7, 0.8, 0.9])
+def test_lsh_params_reach_candidate_probability(threshold):
+    bands, rows = get_lsh_params(threshold)
+
+    def probability(bands, rows):
+        return 1 - (1 - threshold ** rows) ** bands
+
+    assert bands * rows <= NUM_PERM
+    assert probability(bands, rows) >= CANDIDATE_PROBABILITY
+    # 行数再多一行就达不到概率要求
+    assert probability(NUM_PERM // (rows + 1), rows + 1) < CANDIDATE_PROBABILITY
+
+
+def test_shingles_ignore_case_whitespace_and_punctuation():
+    assert np.array_equal(get_shingle_hashes('熟悉 Python, LangChain!'), get_shingle_hashes('熟悉python\nlangchain'))
+    assert len(get_shingle_hashes('RAG')) == 1
+    assert len(get_shingle_hashes(' ，。\n')) == 0
+    assert get_minhash('') is None
+    assert IGNORE_PATTERN.sub('', '1、负责_开发') == '1负责开发'
+
+
+def test_signature_similarity_estimates_jaccard():
+    rng = random.Random(0)
+    for count in (2, 8, 20, 60):
+        text = make_text(rng)
+        edited = edit_text(text, rng, count)
+        similarity = np.count_nonzero(get_minhash(text) == get_minhash(edited)) / NUM_PERM
+
+        assert abs(similarity - get_jaccard(text, edited)) < 0.15
+
+
+def test_detector_keeps_first_of_each_duplicate_group():
+    rng = random.Random(1)
+    text, other = make_text(rng), make_text(rng)
+    near = edit_text(text, rng, 3)
+    assert get_jaccard(text, near) > 0.9
+    job_details = [
+        make_job_detail('a', text),
+        make_job_detail('b', other),
+        make_job_detail('c', near),
+        make_job_detail('d', text.replace(text[100:110], text[100:110] + '，\n')),
+        make_job_detail('e', ''),
+    ]
+
+    detector = NearDuplicateDetector(0.8)
+    assert [detector.add(job_detail) for job_detail in job_details] == [None, None, 'a', 'a', None]
+    assert detector.clusters == {'a': ['c', 'd'], 'b': []}
+    assert detector.get_duplicate_count() == 2
+
+
+def test_dissimilar_descriptions_are_kept():
+    rng = random.Random(2)
+    text = make_text(rng)
+    edited = edit_text(text, rng, 60)
+    assert get_jaccard(text, edited) < 0.5
+
+    kept = list(drop_near_duplicates(iter([make_job_detail('a', text), make_job_detail('b', edited)])))
+    assert [job_detail['jobInfo']['encryptId'] for job_detail in kept] == ['a', 'b']
+
+
+def test_signatures_grow_beyond_initial_capacity():
+    rng = random.Random(3)
+    texts = [make_text(rng, 60) for _ in range(1100)]
+    job_details = [make_job_detail(str(index), text) for index, text in enumerate(texts)]
+    job_details.append(make_job_detail('copy', texts[1050]))
+
+    kept = list(drop_near_duplicates(job_details))
+    assert len(kept) == 1100
+    assert kept[-1]['jobInfo']['encryptId'] == '1099'
@@ -0,0 +1,77 @@
+import asyncio
+import types
+
+import pytest
+
+import util.rate_limit
+from util.rate_limit import AdaptiveRateLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """可以手动调整的时间, 等待时直接推进时间, 不会真正等待"""
+    clock = types.SimpleNamespace(now=1000.0, slept=[])
+    clock.monotonic = lambda: clock.now
+
+    async def sleep(seconds):
+        clock.slept.append(seconds)
+        clock.now += seconds
+
+    monkeypatch.setattr(util.rate_limit, 'time', clock)
+    monkeypatch.setattr(util.rate_limit, 'asyncio', types.SimpleNamespace(Lock=asyncio.Lock, sleep=sleep))
+    return clock
+
+
+def acquire(limiter: AdaptiveRateLimiter, count: int):
+    async def main():
+        for _ in range(count):
+            await limiter.acquire()
+    asyncio.run(main())
+
+
+def test_acquire_paces_requests(clock):
+    limiter = AdaptiveRateLimiter(60, burst=2)
+    acquire(limiter, 5)
+
+    # 令牌桶中的 2 个令牌立即获取, 之后每秒 1 个
+    assert clock.now == pytest.approx(1003)
+    assert limiter.acquired == 5
+    assert limiter.wait_seconds == pytest.approx(3)
+
+
+def test_errors_slow_down_to_min_rate(clock):
+    limiter = AdaptiveRateLimiter(60, 12)
+    limiter.report(429)
+    assert limiter.rate == pytest.approx(0.5)
+    limiter.report(200, code=5002)
+    assert limiter.rate == pytest.approx(0.25)
+    for _ in range(5):
+        limiter.report(503)
+    assert limiter.rate == pytest.approx(0.2)
+
+    # 降速后清空已积累的令牌, 下一个请求按降低后的速率等待
+    clock.now += 100
+    limiter.report(500)
+    acquire(limiter, 1)
+    assert clock.slept == [pytest.approx(5)]
+
+
+def test_successful_responses_recover_to_max_rate(clock):
+    limiter = AdaptiveRateLimiter(60, backoff=0.5, recover=1.5)
+    limiter.report(500)
+    limiter.report(500)
+    assert limiter.rate == pytest.approx(0.25)
+
+    limiter.report(200)
+    assert limiter.rate == pytest.approx(0.375)
+    for _ in range(5):
+        limiter.report(200, code=0)
+    assert limiter.rate == pytest.approx(1)
+
+
+def test_default_min_rate_is_tenth_of_max(clock):
+    limiter = AdaptiveRateLimiter(30)
+    for _ in range(10):
+        limiter.slow_down()
+
+    assert limiter.rate * 60 == pytest.approx(3)
@@ -0,0 +1,89 @@
+import sqlite3
+
+import pytest
+
+from util.repository import JobRepository
+from util.skill_index import (SOURCE_DESCRIPTION, SOURCE_SHOW_SKILLS, SOURCE_SKILLS, SkillIndex,
+                              extract_description_terms, normalize_skill)
+
+
+def make_job_detail(encrypt_id: str, show_skills: list[str], description: str = ''):
+    return {'jobInfo': {'encryptId': encrypt_id, 'showSkills': show_skills, 'postDescription': description,
+                        'jobName': '', 'salaryDesc': '', 'degreeName': '', 'experienceName': ''}}
+
+
+@pytest.fixture
+def index():
+    connection = sqlite3.connect(':memory:')
+    yield SkillIndex(connection)
+    connection.close()
+
+
+@pytest.mark.parametrize('skill, expected', [
+    ('Python', 'python'),
+    ('  LangChain ', 'langchain'),
+    ('K8S', 'kubernetes'),
+    ('Golang', 'go'),
+    ('ＲＡＧ', 'rag'),
+    ('Large  Language   Model', 'llm'),
+    ('LLMs', 'llm'),
+    ('C++', 'c++'),
+])
+def test_normalize_skill_merges_case_width_and_aliases(skill, expected):
+    assert normalize_skill(skill) == expected
+
+
+def test_extract_description_terms():
+    terms = extract_description_terms('熟悉 C++、C# 和 Node.js, 了解 scikit-learn / GPT-4 and RAG, a team player')
+
+    assert terms == {'C++', 'C#', 'Node.js', 'scikit-learn', 'GPT-4', 'RAG', 'player'}
+
+
+def test_query_matches_aliases_from_all_sources(index):
+    index.add_job_list([{'encryptJobId': 'a', 'skills': ['Golang', 'K8s']}])
+    index.add_job_details([
+        make_job_detail('a', ['Python']),
+        make_job_detail('b', ['go'], '熟悉 Kubernetes 和 Redis'),
+        make_job_detail('c', ['Java'], '了解 LLMs 应用开发'),
+    ])
+
+    assert index.query(all_skills=['GO', 'k8s']) == {'a', 'b'}
+    assert index.query(all_skills=['go'], any_skills=['python', 'redis']) == {'a', 'b'}
+    assert index.query(any_skills=['large language model', 'java']) == {'c'}
+    assert index.query(all_skills=['go', 'java']) == set()
+    assert index.query() == set()
+
+
+def test_rewriting_a_job_replaces_only_its_sources(index):
+    index.add_job_list([{'encryptJobId': 'a', 'skills': ['Vue']}])
+    index.add_job_details([make_job_detail('a', ['React'], 'TypeScript')])
+    assert index.query(all_skills=['react']) == {'a'}
+
+    index.add_job_details([make_job_detail('a', ['Angular'])])
+
+    assert index.query(any_skills=['react', 'typescript']) == set()
+    assert index.query(all_skills=['angular', 'vue']) == {'a'}
+    sources = {source for source, in index.connection.execute('SELECT source FROM skill_index')}
+    assert sources == {SOURCE_SKILLS, SOURCE_SHOW_SKILLS}
+
+
+def test_count_uses_first_spelling(index):
+    index.add_job_details([
+        make_job_detail('a', ['PyTorch', 'Python']),
+        make_job_detail('b', ['pytorch'], 'Docker'),
+        make_job_detail('c', ['PYTORCH', 'Python']),
+    ])
+
+    assert index.count(2) == [('PyTorch', 3), ('Python', 2)]
+    assert index.count(sources=(SOURCE_DESCRIPTION,)) == [('Docker', 1)]
+
+
+def test_repository_filters_by_skills(tmp_path):
+    with JobRepository(str(tmp_path / 'jobs.db')) as repository:
+        repository.upsert_job_details([
+            make_job_detail('a', ['LangChain'], 'RAG 和 k8s 部署'),
+            make_job_detail('b', ['langchain']),
+        ])
+        user_input = {'degree': '本科', 'salary': '20-30K', 'experience': '3', 'skills': ['Kubernetes', 'LANGCHAIN']}
+
+        assert [job_detail['jobInfo']['encryptId'] for job_detail in repository.filter_job_details(user_input)] == ['a']
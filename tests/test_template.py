@@ -0,0 +1,80 @@
+import pytest
+
+from template import get_prompt, get_single_job_str, write_prompts, prompt_header_template
+from util.synthetic import make_jobs
+from util.tokens import estimate_tokens
+
+USER_INPUT = {
+    'degree': '本科', 'salary': '30-50K', 'experience': '3-5年', 'other_info': '熟悉 Python',
+    'job_names': ['ai agent'], 'max_size': 100, 'user_job_details': False,
+}
+
+
+@pytest.fixture(scope='module')
+def job_details():
+    _, job_details = make_jobs(30, seed=2)
+    return job_details
+
+
+def read_text(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def test_single_prompt_matches_get_prompt(tmp_path, job_details):
+    file_path = str(tmp_path / 'prompt.txt')
+
+    assert write_prompts(iter(job_details), USER_INPUT, file_path, 10 ** 9) == [file_path]
+    assert read_text(file_path) == get_prompt(job_details, USER_INPUT)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['prompt.txt']
+
+
+def test_empty_prompt_contains_header(tmp_path):
+    file_path = str(tmp_path / 'prompt.txt')
+
+    assert write_prompts([], USER_INPUT, file_path, 1000) == [file_path]
+    assert read_text(file_path) == get_prompt([], USER_INPUT)
+
+
+def test_prompts_are_split_by_token_budget(tmp_path, job_details):
+    file_path = str(tmp_path / 'prompt.txt')
+    job_tokens = [estimate_tokens(get_single_job_str(job_detail)) for job_detail in job_details]
+    header_tokens = estimate_tokens(prompt_header_template.render(user_input=USER_INPUT))
+    max_tokens = header_tokens + max(job_tokens) * 3
+
+    file_paths = write_prompts(job_details, USER_INPUT, file_path, max_tokens)
+
+    assert file_paths == [str(tmp_path / f'prompt_{part}.txt') for part in range(1, len(file_paths) + 1)]
+    assert len(file_paths) > 1
+    assert not (tmp_path / 'prompt.txt').exists()
+
+    # 每个提示词都包含完整的用户信息, 岗位重新编号, 合起来是所有岗位
+    start = 0
+    for path in file_paths:
+        text = read_text(path)
+        count = text.count('</岗位')
+        assert text == get_prompt(job_details[start:start + count], USER_INPUT)
+        assert estimate_tokens(text) <= max_tokens
+        start += count
+    assert start == len(job_details)
+
+
+def test_oversized_job_gets_its_own_prompt(tmp_path, job_details):
+    file_path = str(tmp_path / 'prompt.txt')
+
+    file_paths = write_prompts(job_details[:3], USER_INPUT, file_path, 1)
+
+    assert len(file_paths) == 3
+    for path, job_detail in zip(file_paths, job_details):
+        assert read_text(path) == get_prompt([job_detail], USER_INPUT)
+
+
+def test_previous_parts_are_deleted(tmp_path, job_details):
+    file_path = str(tmp_path / 'prompt.txt')
+    write_prompts(job_details[:5], USER_INPUT, file_path, 1)
+    (tmp_path / 'prompt_notes.txt').write_text('keep', encoding='utf-8')
+
+    assert write_prompts(job_details[:2], USER_INPUT, file_path, 1) == [
+        str(tmp_path / 'prompt_1.txt'), str(tmp_path / 'prompt_2.txt')]
+    assert write_prompts(job_details[:2], USER_INPUT, file_path, 10 ** 9) == [file_path]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['prompt.txt', 'prompt_notes.txt']